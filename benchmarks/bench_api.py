@@ -0,0 +1,52 @@
+"""
+Benchmark the latency of API requests against the synthetic dataset, through the ASGI app in process (no network). The
+clients are fixtures of conftest.py.
+"""
+
+from itertools import count
+
+ROUNDS = 200
+
+
+def bench_get_patient(benchmark, client, patient_ids):
+    """
+    Get a patient with every related record.
+    """
+    benchmark.group = 'api'
+    benchmark.pedantic(lambda: client.get(f'/patients/{next(patient_ids)}').raise_for_status(), rounds=ROUNDS)
+
+
+def bench_list_patients(benchmark, client, patient_ids):
+    """
+    List a page of 50 patients with every field.
+    """
+    benchmark.group = 'api'
+    benchmark.pedantic(lambda: client.get('/patients', params={'after_id': next(patient_ids), 'limit': 50})
+                       .raise_for_status(), rounds=ROUNDS)
+
+
+def bench_list_patient_names(benchmark, client, patient_ids):
+    """
+    List a page of 50 patients with only their names.
+    """
+    benchmark.group = 'api'
+    benchmark.pedantic(lambda: client.get('/patients', params={'after_id': next(patient_ids), 'limit': 50,
+                                                               'fields': 'first_name,last_name'})
+                       .raise_for_status(), rounds=ROUNDS)
+
+
+def bench_create_patient(benchmark, empty_client):
+    """
+    Create a patient with every related record.
+    """
+    benchmark.group = 'api'
+    indexes = count()
+    benchmark.pedantic(lambda: empty_client.post('/patients', json={
+        'first_name': f'Benchmark {next(indexes)}',
+        'last_name': 'Patient',
+        'gender': 'M',
+        'date_of_birth': '1980-02-03',
+        'address': [{'address': 'Some Street', 'province': 'Province 1', 'district': 'District 1'}],
+        'occupation': [{'description': 'Works', 'company': 'Company 1'}],
+        'contact_details': [{'email': 'benchmark@example.com', 'phone_number': '9800000000'}],
+    }).raise_for_status(), rounds=ROUNDS)
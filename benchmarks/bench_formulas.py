@@ -0,0 +1,49 @@
+"""
+Benchmark evaluating the vitals formulas one patient at a time (vitals.py) against whole cohorts at once (batch.py and
+panel.py). Each group times the same formula both ways over --patients patients.
+"""
+
+import pytest
+
+from zen_cdss.formulas import batch, vitals
+from zen_cdss.formulas.panel import PANEL_INPUTS, evaluate_panel_frame, get_vitals_panel
+
+
+@pytest.mark.parametrize('name', list(batch.FORMULAS))
+def bench_scalar_formula(benchmark, cohort, name):
+    """
+    Evaluate a formula with the scalar function, once per patient.
+    """
+    benchmark.group = f'formula: {name}'
+    formula = getattr(vitals, batch.FORMULAS[name].__name__)
+    inputs = list(batch.get_formula_inputs(batch.FORMULAS[name]))
+    rows = list(cohort[inputs].itertuples(index=False, name=None))
+    benchmark(lambda: [formula(*row) for row in rows])
+
+
+@pytest.mark.parametrize('name', list(batch.FORMULAS))
+def bench_batch_formula(benchmark, cohort, name):
+    """
+    Evaluate a formula with the vectorized function, once for every patient.
+    """
+    benchmark.group = f'formula: {name}'
+    formula = batch.FORMULAS[name]
+    arrays = [cohort[argument].to_numpy() for argument in batch.get_formula_inputs(formula)]
+    benchmark(formula, *arrays)
+
+
+def bench_scalar_panel(benchmark, cohort):
+    """
+    Evaluate the whole vitals panel one patient at a time.
+    """
+    benchmark.group = 'panel'
+    rows = cohort[list(PANEL_INPUTS)].to_dict(orient='records')
+    benchmark(lambda: [get_vitals_panel(**row) for row in rows])
+
+
+def bench_batch_panel(benchmark, cohort):
+    """
+    Evaluate the whole vitals panel for every patient at once.
+    """
+    benchmark.group = 'panel'
+    benchmark(evaluate_panel_frame, cohort[list(PANEL_INPUTS)])
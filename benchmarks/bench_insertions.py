@@ -0,0 +1,109 @@
+"""
+Benchmark adding patients one at a time with the add_* functions of insertions.py against bulk_add_patients(), and
+getting lookup table values with create_entry() from the lookup cache against the upsert it runs on cache misses.
+"""
+
+from itertools import count
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from zen_cdss.database.bulk import bulk_add_patients
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.insertions import (add_address, add_contact_details, add_diagnosis, add_measurement,
+                                          add_occupation, add_patient, create_entry)
+from zen_cdss.database.models import Province
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tools.generate_patients import generate_patients
+
+PATIENTS_PER_ROUND = 100
+ROUNDS = 5
+LOOKUPS = 200
+
+ROUND_SEEDS = count(1)  # Every round adds new patients.
+
+
+def add_patients_per_row(patient_dicts: List[Dict[str, Any]], session_object: sessionmaker):
+    """
+    Add every patient with the related records it has (like bulk_add_patients()), one transaction per patient.
+    :param patient_dicts: Patient dictionaries.
+    :param session_object: Session object to instantiate.
+    """
+    for patient_dict in patient_dicts:
+        with session_scope(session_object) as session:
+            patient = add_patient(patient_dict, existing_session=session)
+            add_address(patient_dict, patient, existing_session=session)
+            if 'occupation_description' in patient_dict:
+                add_occupation(patient_dict, patient, existing_session=session)
+            add_contact_details(patient_dict, patient, existing_session=session)
+            if 'diagnosis' in patient_dict:
+                add_diagnosis(patient_dict, patient, existing_session=session)
+            if 'measured_on' in patient_dict:
+                add_measurement(patient_dict, patient, existing_session=session)
+
+
+def get_round_patients():
+    """
+    Setup of a round, returning the arguments of the patients to add.
+    """
+    return (list(generate_patients(PATIENTS_PER_ROUND, next(ROUND_SEEDS))),), {}
+
+
+def bench_add_patients_per_row(benchmark, empty_dataset):
+    """
+    Add patients one transaction and one add_* call per record at a time.
+    """
+    benchmark.group = f'insert {PATIENTS_PER_ROUND} patients'
+    benchmark.pedantic(lambda patient_dicts: add_patients_per_row(patient_dicts, empty_dataset.session_object),
+                       setup=get_round_patients, rounds=ROUNDS)
+
+
+def bench_bulk_add_patients(benchmark, empty_dataset):
+    """
+    Add patients with bulk_add_patients().
+    """
+    benchmark.group = f'insert {PATIENTS_PER_ROUND} patients'
+    benchmark.pedantic(lambda patient_dicts: bulk_add_patients(patient_dicts,
+                                                               session_object=empty_dataset.session_object),
+                       setup=get_round_patients, rounds=ROUNDS)
+
+
+@pytest.fixture(scope='module', name='province')
+def province_fixture(dataset) -> str:
+    """
+    Province of the shared dataset, so looking it up never writes a row to the dataset.
+    """
+    with session_scope(dataset.session_object) as session:
+        return session.execute(select(Province.province).order_by(Province.id).limit(1)).scalar_one()
+
+
+def look_up_province(session_object: sessionmaker, province: str):
+    """
+    Get an existing province in its own session, like the add_* functions do for every record.
+    :param session_object: Session object to instantiate.
+    :param province: Province to get.
+    """
+    with session_scope(session_object) as session:
+        create_entry(Province, 'province', province, session)
+
+
+def bench_create_entry_cached(benchmark, dataset, province):
+    """
+    Get a province that is in the lookup cache.
+    """
+    benchmark.group = 'create_entry'
+    look_up_province(dataset.session_object, province)
+    benchmark.pedantic(look_up_province, args=(dataset.session_object, province), rounds=LOOKUPS)
+
+
+def bench_create_entry_upsert(benchmark, dataset, province):
+    """
+    Get a province after clearing the lookup cache, so create_entry() upserts it like on any cache miss (see
+    insertions.get_or_create_ids()). The province exists, so the upsert writes no row.
+    """
+    benchmark.group = 'create_entry'
+    benchmark.pedantic(look_up_province,
+                       setup=lambda: LOOKUP_CACHE.clear() or ((dataset.session_object, province), {}),
+                       rounds=LOOKUPS)
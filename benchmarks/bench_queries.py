@@ -0,0 +1,88 @@
+"""
+Benchmark reading a page of patients with every related record: ORM objects loaded lazily (a query per patient per
+record type), eagerly with get_patient_graph_options(), and Core selects like the API does.
+"""
+
+from typing import Iterable, List
+
+from sqlalchemy import select
+
+from zen_cdss.database.models import Patient
+from zen_cdss.database.queries import (RECORD_COLUMNS, get_patient_page_select, get_record_select, load_patient_graphs,
+                                       split_fields)
+from zen_cdss.database.utils import session_scope
+
+PAGE_SIZE = 100
+ROUNDS = 20
+
+
+def touch_patient_graphs(patients: Iterable[Patient]) -> int:
+    """
+    Access every related record of the patients provided and their lookup values.
+    :param patients: Patients.
+    :return: Amount of records accessed.
+    """
+    records = 0
+    for patient in patients:
+        for address in patient.address:
+            records += bool(address.province) + bool(address.district) + bool(address.municipality)
+        for occupation in patient.occupation:
+            records += bool(occupation.company) + bool(occupation.occupation_title)
+        records += len(patient.contact_details) + len(patient.diagnosis) + len(patient.measurement)
+
+    return records
+
+
+def get_page_ids(dataset) -> List[int]:
+    """
+    Returns the IDs of the patients in the middle page of the dataset.
+    """
+    with session_scope(dataset.session_object) as session:
+        ids = session.execute(select(Patient.id).order_by(Patient.id)).scalars().all()
+
+    middle = max(len(ids) // 2 - PAGE_SIZE // 2, 0)
+    return ids[middle:middle + PAGE_SIZE]
+
+
+def bench_lazy_patient_graphs(benchmark, dataset):
+    """
+    Load a page of patients and lazily load their related records.
+    """
+    benchmark.group = f'read {PAGE_SIZE} patient graphs'
+    ids = get_page_ids(dataset)
+
+    def load():
+        with session_scope(dataset.session_object) as session:
+            return touch_patient_graphs(session.execute(select(Patient).where(Patient.id.in_(ids))).scalars())
+
+    benchmark.pedantic(load, rounds=ROUNDS)
+
+
+def bench_eager_patient_graphs(benchmark, dataset):
+    """
+    Load a page of patients with load_patient_graphs().
+    """
+    benchmark.group = f'read {PAGE_SIZE} patient graphs'
+    ids = get_page_ids(dataset)
+
+    def load():
+        with session_scope(dataset.session_object) as session:
+            return touch_patient_graphs(load_patient_graphs(session, ids))
+
+    benchmark.pedantic(load, rounds=ROUNDS)
+
+
+def bench_core_patient_page(benchmark, dataset):
+    """
+    Read a page of patients and their related records with the Core selects of queries.py.
+    """
+    benchmark.group = f'read {PAGE_SIZE} patient graphs'
+    after_id = get_page_ids(dataset)[0] - 1
+    fields = split_fields()
+
+    def load():
+        with session_scope(dataset.session_object) as session:
+            patient_ids = session.execute(get_patient_page_select(fields, after_id, PAGE_SIZE)).scalars().all()
+            return sum(len(session.execute(get_record_select(record, patient_ids)).all()) for record in RECORD_COLUMNS)
+
+    benchmark.pedantic(load, rounds=ROUNDS)
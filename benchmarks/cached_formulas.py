@@ -0,0 +1,102 @@
+"""
+Benchmark memoizing each vitals formula against the plain scalar formulas of vitals.py, to choose which formulas
+formulas/cached.py memoizes (marked with a *). The others are memoized here with the same cache size for comparison.
+
+Calls are made one patient at a time, like the API does, with inputs drawn from realistic ranges at the precision they
+are recorded with (integer blood pressures and ages, creatinine to two decimals, etc.), so inputs repeat the way they do
+in practice. The caches are warmed first (see warm_caches()), so the hit rates reported include the precomputed values.
+
+Run with: python -m benchmarks.cached_formulas --calls 200000
+"""
+
+import argparse
+import random
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from zen_cdss.formulas import cached, vitals
+from zen_cdss.formulas.batch import FORMULAS, get_formula_inputs
+
+
+def get_inputs(count: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Returns the inputs of random patients.
+    :param count: Amount of patients.
+    :param seed: Random seed.
+    :return: List of dictionaries of input names to values.
+    """
+    rng = random.Random(seed)
+    patients = []
+    for _ in range(count):
+        weight, height = round(rng.uniform(40, 120), 1), rng.randint(140, 200)
+        patients.append({
+            'gender': rng.choice('MF'),
+            'age': rng.randint(18, 90),
+            'weight': weight,
+            'height': height,
+            'bmi': vitals.get_bmi(weight, height),
+            'waist': rng.randint(60, 140),
+            'systolic_bp': rng.randint(80, 200),
+            'diastolic_bp': rng.randint(50, 120),
+            'maximum_heart_rate': rng.randint(130, 202),
+            'insulin': round(rng.uniform(2, 40), 1),
+            'glucose': rng.randint(70, 250),
+            'tg': rng.randint(50, 400),
+            'hdl': rng.randint(25, 90),
+            'ggt': rng.randint(10, 200),
+            'alt': rng.randint(10, 120),
+            'ast': rng.randint(10, 120),
+            'creatinine': round(rng.uniform(0.5, 2.5), 2),
+            'hba1c': round(rng.uniform(4.5, 12), 1),
+        })
+
+    return patients
+
+
+def time_calls(formula: Callable, arguments: List[Tuple[Any, ...]]) -> float:
+    """
+    Call a formula once per set of arguments.
+    :param formula: Formula to call.
+    :param arguments: Positional arguments of each call, in the order of the formula's parameters.
+    :return: Calls per second.
+    """
+    start_time = time.perf_counter()
+    for positional_arguments in arguments:
+        formula(*positional_arguments)
+
+    return len(arguments) / (time.perf_counter() - start_time)
+
+
+def main():
+    """
+    Run the benchmark for every formula and print a table of results.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('--calls', type=int, default=200_000, help='Amount of calls per formula.')
+    arguments.add_argument('--seed', type=int, default=0, help='Random seed.')
+    arguments = arguments.parse_args()
+
+    patients = get_inputs(arguments.calls, arguments.seed)
+    cached.clear_caches()
+    cached.warm_caches()
+
+    print(f'{"formula":<30}{"plain (calls/s)":>18}{"cached (calls/s)":>18}{"speedup":>10}{"hit rate":>10}')
+    for name, batch_formula in FORMULAS.items():
+        inputs = get_formula_inputs(batch_formula)
+        calls = [tuple(patient[argument] for argument in inputs) for patient in patients]
+
+        scalar_formula = getattr(vitals, batch_formula.__name__)
+        cached_formula = cached.CACHED_FORMULAS.get(name) or lru_cache(maxsize=cached.CACHE_SIZE,
+                                                                       typed=True)(scalar_formula)
+
+        plain = time_calls(scalar_formula, calls)
+        memoized = time_calls(cached_formula, calls)
+        info = cached_formula.cache_info()
+        label = f'{name} *' if name in cached.CACHED_FORMULAS else name
+        print(f'{label:<30}{plain:>18,.0f}{memoized:>18,.0f}{memoized / plain:>9.1f}x'
+              f'{info.hits / (info.hits + info.misses):>10.1%}')
+
+
+if __name__ == '__main__':
+    main()
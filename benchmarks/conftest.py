@@ -0,0 +1,119 @@
+"""
+Benchmark suite for the formulas, insertions, queries and API, run with pytest-benchmark.
+
+Benchmarks run against a synthetic SQLite database of --patients patients (1,000 by default), created once per run in a
+temporary directory. Results are saved under .benchmarks/ with the commit they ran on, so runs can be compared between
+commits:
+
+    pytest benchmarks --patients 10000
+    pytest benchmarks --benchmark-compare                   # Compare with the latest saved run.
+    pytest benchmarks --benchmark-compare=0001 --benchmark-compare-fail=mean:10%
+    pytest-benchmark compare 0001 0002 --group-by=group     # Compare saved runs without running anything.
+
+Run from the repository root, so every run is saved to the same place.
+"""
+
+from contextlib import contextmanager
+from functools import partial
+from itertools import cycle
+from typing import Iterator
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from benchmarks.datasets import Dataset, create_dataset, get_cohort
+from zen_cdss.database.async_base import async_session_scope
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.migrations import migrate
+from zen_cdss.database.models import Patient
+from zen_cdss.database.utils import session_scope
+from zen_cdss.main import app, get_session
+
+
+def pytest_addoption(parser):
+    """
+    Add the options of the benchmark suite.
+    :param parser: Pytest option parser.
+    """
+    parser.addoption('--patients', type=int, default=1_000, help='Amount of patients in the synthetic dataset.')
+
+
+@pytest.fixture(scope='session', name='dataset')
+def dataset_fixture(request, tmp_path_factory) -> Iterator[Dataset]:
+    """
+    Synthetic database of --patients patients, shared by every benchmark that only reads.
+    """
+    LOOKUP_CACHE.clear()
+    database = create_dataset(str(tmp_path_factory.mktemp('dataset') / 'benchmark.db'),
+                              request.config.getoption('--patients'))
+    yield database
+    database.engine.dispose()
+
+
+@pytest.fixture(scope='module', name='empty_dataset')
+def empty_dataset_fixture(tmp_path_factory) -> Iterator[Dataset]:
+    """
+    Empty database for benchmarks that write, so they do not change the size of the shared dataset.
+    """
+    LOOKUP_CACHE.clear()
+    database = create_dataset(str(tmp_path_factory.mktemp('empty') / 'benchmark.db'), 0)
+    yield database
+    database.engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def cohort(request) -> pd.DataFrame:
+    """
+    Inputs of every formula for --patients patients.
+    """
+    return get_cohort(request.config.getoption('--patients'))
+
+
+@contextmanager
+def create_client(database: Dataset) -> Iterator[TestClient]:
+    """
+    Create a client of the app using the dataset provided.
+    :param database: Dataset the app should use.
+    :return: Yield client.
+    """
+    async def get_dataset_session():
+        async with async_session_scope(database.async_session_object) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_dataset_session
+    try:
+        # The app migrates its database on startup: the dataset, rather than the configured database.
+        with patch('zen_cdss.main.migrate', partial(migrate, database.engine)), TestClient(app) as test_client:
+            yield test_client  # One event loop for every request, like a running server.
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(dataset) -> Iterator[TestClient]:
+    """
+    Client of the app reading from the synthetic dataset.
+    """
+    with create_client(dataset) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def empty_client(empty_dataset) -> Iterator[TestClient]:
+    """
+    Client of the app writing to an empty database, so the synthetic dataset is left as is.
+    """
+    with create_client(empty_dataset) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope='module')
+def patient_ids(dataset) -> Iterator[int]:
+    """
+    Endless iterator of the IDs of every patient of the dataset.
+    """
+    with session_scope(dataset.session_object) as session:
+        return cycle(session.execute(select(Patient.id).order_by(Patient.id)).scalars().all())
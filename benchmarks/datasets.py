@@ -0,0 +1,77 @@
+"""
+Synthetic data for the benchmark suite (see conftest.py). Patients come from tools/generate_patients.py.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from zen_cdss.database.async_base import get_async_url
+from zen_cdss.database.base import Base, create_db_engine
+from zen_cdss.database.bulk import bulk_add_patients
+from zen_cdss.tools.generate_patients import generate_patients
+
+SEED = 0
+
+
+class Dataset(NamedTuple):
+    """
+    Synthetic database to benchmark against.
+    """
+    patients: int
+    engine: Engine
+    session_object: sessionmaker
+    async_session_object: sessionmaker
+
+
+def create_dataset(path: str, patients: int) -> Dataset:
+    """
+    Create a SQLite database holding the amount of synthetic patients provided.
+    :param path: Path of the database file.
+    :param patients: Amount of patients to add.
+    :return: Dataset.
+    """
+    engine = create_db_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    session_object = sessionmaker(bind=engine)
+    bulk_add_patients(generate_patients(patients, SEED), session_object=session_object)
+
+    async_engine = create_async_engine(get_async_url(f'sqlite:///{path}'))
+    async_session_object = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    return Dataset(patients=patients, engine=engine, session_object=session_object,
+                   async_session_object=async_session_object)
+
+
+def get_cohort(size: int, seed: int = SEED) -> pd.DataFrame:
+    """
+    Returns the inputs of every formula for random patients.
+    :param size: Amount of patients.
+    :param seed: Random seed.
+    :return: Dataframe whose column names match the formula argument names.
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'gender': rng.choice(['M', 'F'], size=size),
+        'age': rng.integers(18, 95, size=size),
+        'weight': rng.uniform(35, 160, size=size).round(1),
+        'height': rng.integers(135, 205, size=size),
+        'waist': rng.integers(60, 150, size=size),
+        'systolic_bp': rng.integers(70, 220, size=size),
+        'diastolic_bp': rng.integers(40, 130, size=size),
+        'insulin': rng.uniform(2, 60, size=size).round(1),
+        'glucose': rng.integers(60, 300, size=size),
+        'tg': rng.integers(40, 600, size=size),
+        'hdl': rng.integers(20, 100, size=size),
+        'ggt': rng.integers(5, 300, size=size),
+        'alt': rng.integers(5, 200, size=size),
+        'ast': rng.integers(5, 200, size=size),
+        'creatinine': rng.uniform(0.3, 4, size=size).round(2),
+        'hba1c': rng.uniform(4, 14, size=size).round(1),
+    })
+    frame['bmi'] = (frame.weight / frame.height / frame.height * 10_000).round(1)
+    frame['maximum_heart_rate'] = 220 - frame.age
+    return frame
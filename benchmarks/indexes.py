@@ -0,0 +1,149 @@
+"""
+Benchmark query latency on patient-linked tables before and after the declared indexes are created.
+
+Generates a SQLite database with the indexes dropped (like a database created before they were declared), times the
+common patient queries, runs zen_cdss.database.migrations.migrate(), and times the same queries again.
+
+Run with: python -m benchmarks.indexes --patients 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from zen_cdss.database.base import Base
+from zen_cdss.database.migrations import migrate
+from zen_cdss.database.models import Address, ContactDetails, Diagnosis, Occupation, Patient
+
+FIRST_NAMES = ['Aarav', 'Sita', 'Ram', 'Gita', 'Hari', 'Maya', 'Bikash', 'Anita', 'Suman', 'Kamala']
+LAST_NAMES = [f'Surname{index}' for index in range(20_000)]
+INSERT_BATCH_SIZE = 50_000
+
+
+def generate_database(engine: Engine, patients: int, seed: int):
+    """
+    Create the tables without the declared indexes and fill them with random patients and child rows.
+    :param engine: Engine of the database to fill.
+    :param patients: Amount of patients to generate.
+    :param seed: Random seed.
+    """
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f'DROP INDEX {index.name}'))
+
+        for start in range(1, patients + 1, INSERT_BATCH_SIZE):
+            ids = range(start, min(start + INSERT_BATCH_SIZE, patients + 1))
+            connection.execute(insert(Patient), [{
+                'id': patient_id,
+                'first_name': rng.choice(FIRST_NAMES),
+                'last_name': rng.choice(LAST_NAMES),
+                'gender': rng.choice('MF'),
+                'date_of_birth': date(1930, 1, 1) + timedelta(days=rng.randrange(30_000)),
+                'registration_date': date(2010, 1, 1) + timedelta(days=rng.randrange(4_000)),
+            } for patient_id in ids])
+
+            for table, values in ((Address, {'address': 'Some Street'}), (Occupation, {'description': 'Works'}),
+                                  (ContactDetails, {'email': 'patient@gmail.com'}), (Diagnosis, {'diagnosis': 'T2DM'})):
+                connection.execute(insert(table), [{'patient_id': patient_id, **values} for patient_id in ids])
+
+
+def get_queries(patients: int, rng: random.Random) -> Dict[str, Callable[[Connection], List]]:
+    """
+    Returns the queries to time, each picking random arguments.
+    :param patients: Amount of patients in the database.
+    :param rng: Random number generator.
+    :return: Dictionary of query names to functions running them.
+    """
+    def patient_record(connection: Connection) -> List:
+        patient_id = rng.randint(1, patients)
+        return [connection.execute(select(table).where(table.patient_id == patient_id)).all()
+                for table in (Address, Occupation, ContactDetails, Diagnosis)]
+
+    def by_last_name(connection: Connection) -> List:
+        return connection.execute(select(Patient).where(Patient.last_name == rng.choice(LAST_NAMES))).all()
+
+    def by_full_name(connection: Connection) -> List:
+        return connection.execute(select(Patient).where(Patient.last_name == rng.choice(LAST_NAMES),
+                                                        Patient.first_name == rng.choice(FIRST_NAMES))).all()
+
+    def by_date_of_birth(connection: Connection) -> List:
+        date_of_birth = date(1930, 1, 1) + timedelta(days=rng.randrange(30_000))
+        return connection.execute(select(Patient).where(Patient.date_of_birth == date_of_birth)).all()
+
+    def by_registration_date(connection: Connection) -> List:
+        registration_date = date(2010, 1, 1) + timedelta(days=rng.randrange(4_000))
+        return connection.execute(select(Patient).where(Patient.registration_date == registration_date)).all()
+
+    return {
+        'patient record (4 child tables)': patient_record,
+        'patients by last name': by_last_name,
+        'patients by full name': by_full_name,
+        'patients by date of birth': by_date_of_birth,
+        'patients by registration date': by_registration_date,
+    }
+
+
+def time_queries(engine: Engine, patients: int, repeats: int, seed: int) -> Dict[str, float]:
+    """
+    Time every query.
+    :param engine: Engine of the database to query.
+    :param patients: Amount of patients in the database.
+    :param repeats: Amount of times to run each query.
+    :param seed: Random seed, so runs before and after the migration use the same arguments.
+    :return: Dictionary of query names to their mean latency in milliseconds.
+    """
+    latencies = {}
+    with engine.connect() as connection:
+        for name, query in get_queries(patients, random.Random(seed)).items():
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                query(connection)
+            latencies[name] = (time.perf_counter() - start_time) / repeats * 1_000
+
+    return latencies
+
+
+def main():
+    """
+    Run the benchmark and print a table of latencies before and after the migration.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument('--patients', type=int, default=1_000_000, help='Amount of patients to generate.')
+    arguments.add_argument('--repeats', type=int, default=20, help='Amount of times to run each query.')
+    arguments.add_argument('--seed', type=int, default=0, help='Random seed.')
+    arguments = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{os.path.join(directory, "benchmark.db")}')
+
+        start_time = time.perf_counter()
+        generate_database(engine, arguments.patients, arguments.seed)
+        print(f'Generated {arguments.patients:,} patients in {time.perf_counter() - start_time:.1f}s.')
+
+        before = time_queries(engine, arguments.patients, arguments.repeats, arguments.seed)
+
+        start_time = time.perf_counter()
+        created = migrate(engine)
+        print(f'Created {len(created)} indexes in {time.perf_counter() - start_time:.1f}s.\n')
+
+        after = time_queries(engine, arguments.patients, arguments.repeats, arguments.seed)
+        engine.dispose()
+
+    print(f'{"query":<35}{"before (ms)":>15}{"after (ms)":>15}{"speedup":>10}')
+    for name, latency in before.items():
+        print(f'{name:<35}{latency:>15.3f}{after[name]:>15.3f}{latency / after[name]:>9.0f}x')
+
+
+if __name__ == '__main__':
+    main()
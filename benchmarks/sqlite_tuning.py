@@ -0,0 +1,134 @@
+"""
+Benchmark insert and read throughput of SQLite with and without the tuned profile (see database/base.py).
+
+For each profile, a fresh database is filled with bulk ingestion, then single-row transactions are timed (where the
+journal and sync settings matter most), then random patient reads are timed both on their own and while a writer is
+ingesting on another thread.
+
+Run with: python -m benchmarks.sqlite_tuning --patients 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from zen_cdss.database.base import Base, create_db_engine
+from zen_cdss.database.bulk import bulk_add_patients
+from zen_cdss.database.insertions import add_patient
+from zen_cdss.database.models import Patient
+from zen_cdss.database.utils import session_scope
+
+
+def get_patient_dicts(count: int, seed: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yield simple patient dictionaries.
+    :param count: Amount of patients to yield.
+    :param seed: Random seed.
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        yield {
+            'first_name': f'First {index}',
+            'last_name': f'Last {rng.randrange(10_000)}',
+            'gender': rng.choice('MF'),
+            'date_of_birth': f'{rng.randint(1930, 2010)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}',
+            'address': f'{index} Some Street',
+            'province': f'Province {rng.randrange(7)}',
+            'district': f'District {rng.randrange(77)}',
+        }
+
+
+def time_reads(engine: Engine, patients: int, seconds: float, seed: int) -> int:
+    """
+    Read random patients for the amount of seconds provided.
+    :param engine: Engine to read with.
+    :param patients: Amount of patients in the database.
+    :param seconds: How long to keep reading for.
+    :param seed: Random seed.
+    :return: Amount of reads completed.
+    """
+    rng = random.Random(seed)
+    reads = 0
+    deadline = time.perf_counter() + seconds
+    with engine.connect() as connection:
+        while time.perf_counter() < deadline:
+            try:
+                connection.execute(select(Patient).where(Patient.id == rng.randint(1, patients))).all()
+                reads += 1
+            except OperationalError:  # "database is locked" in rollback journal mode while the writer commits.
+                pass
+
+    return reads
+
+
+def run_profile(path: str, sqlite_tuned: bool, arguments: argparse.Namespace) -> Dict[str, float]:
+    """
+    Run every measurement against a fresh database.
+    :param path: Path of the database file.
+    :param sqlite_tuned: Whether to use the tuned SQLite profile.
+    :param arguments: Parsed command line arguments.
+    :return: Dictionary of measurement names to results.
+    """
+    engine = create_db_engine(f'sqlite:///{path}', sqlite_tuned=sqlite_tuned)
+    session_object = sessionmaker(bind=engine)
+    Base.metadata.create_all(engine)
+    results = {}
+
+    start_time = time.perf_counter()
+    bulk_add_patients(get_patient_dicts(arguments.patients, arguments.seed), session_object=session_object)
+    results['bulk inserts (patients/s)'] = arguments.patients / (time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    for patient_dict in get_patient_dicts(arguments.transactions, arguments.seed):
+        with session_scope(session_object) as session:
+            add_patient(patient_dict, existing_session=session)
+    results['single-row transactions (tx/s)'] = arguments.transactions / (time.perf_counter() - start_time)
+
+    results['reads, idle (reads/s)'] = time_reads(engine, arguments.patients, arguments.seconds,
+                                                  arguments.seed) / arguments.seconds
+
+    writer = threading.Thread(target=bulk_add_patients, kwargs={
+        'patient_dicts': get_patient_dicts(arguments.patients, arguments.seed + 1),
+        'chunk_size': 100,
+        'session_object': session_object,
+    })
+    writer.start()
+    results['reads, during ingest (reads/s)'] = time_reads(engine, arguments.patients, arguments.seconds,
+                                                           arguments.seed) / arguments.seconds
+    writer.join()
+
+    engine.dispose()
+    return results
+
+
+def main():
+    """
+    Run the benchmark for both profiles and print a table of results.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument('--patients', type=int, default=100_000, help='Amount of patients to bulk insert.')
+    arguments.add_argument('--transactions', type=int, default=1_000, help='Amount of single-row transactions.')
+    arguments.add_argument('--seconds', type=float, default=3, help='How long to time reads for.')
+    arguments.add_argument('--seed', type=int, default=0, help='Random seed.')
+    arguments = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        default = run_profile(os.path.join(directory, 'default.db'), False, arguments)
+        tuned = run_profile(os.path.join(directory, 'tuned.db'), True, arguments)
+
+    print(f'{"measurement":<35}{"default":>12}{"tuned":>12}{"speedup":>10}')
+    for name, result in default.items():
+        print(f'{name:<35}{result:>12,.0f}{tuned[name]:>12,.0f}{tuned[name] / result:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Types and helpers shared by the VigiAccess scrapers (see vigiaccess/) and the ADR knowledge base (see
+database/adrs.py), so neither depends on the other.
+"""
+
+from typing import Dict, List
+
+AdrData = Dict[str, List[str]]  # ADR categories to their disorders.
+
+
+def normalize_drug(drug: str) -> str:
+    """
+    Normalize a drug name for lookups (no surrounding spaces, lower case).
+    :param drug: Drug name.
+    :return: Normalized drug name.
+    """
+    return drug.strip().lower()
+
+
+def normalize_reaction(reaction: str) -> str:
+    """
+    Normalize a reaction name for lookups (no surrounding spaces, lower case), so reactions match whatever their case.
+    :param reaction: Reaction name, e.g. "Rash".
+    :return: Normalized reaction name.
+    """
+    return reaction.strip().lower()
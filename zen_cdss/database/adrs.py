@@ -0,0 +1,105 @@
+"""
+Adverse drug reaction knowledge base: loading the ADRs scraped from VigiAccess (see vigiaccess/) into the drug,
+system organ class, reaction, and drug reaction tables, and reading them back.
+
+The scraped ADRs are {system organ class (count): [reaction (count), ...]} per drug. The counts are split out of the
+names, and drugs and reactions are normalized like their lookups (see adr_types.py), so reactions are shared across
+drugs and looked up through indexes whatever the case they are asked for in: the reactions of a drug with the unique
+constraint of DrugReaction, and the drugs of a reaction with its reaction index.
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from zen_cdss.adr_types import AdrData, normalize_drug, normalize_reaction
+from zen_cdss.database.insertions import LOOKUP_BATCH_SIZE, get_or_create_ids
+from zen_cdss.database.models import Drug, DrugReaction, Reaction, SystemOrganClass
+
+COUNT_PATTERN = re.compile(r'^(.*?)\s*\((\d+)\)$')  # E.g. "Rash (2)".
+
+
+def split_count(name: str) -> Tuple[str, Optional[int]]:
+    """
+    Split the report count out of a system organ class or reaction as VigiAccess lists them.
+    :param name: Name followed by its report count in parentheses, e.g. "Rash (2)".
+    :return: Name and report count, or None if there is no count.
+    """
+    match = COUNT_PATTERN.match(name.strip())
+    return (match.group(1), int(match.group(2))) if match else (name.strip(), None)
+
+
+def split_adrs(adrs: Mapping[str, AdrData]) -> Dict[Tuple[str, str, str], Optional[int]]:
+    """
+    Flatten the ADRs of drugs into their drug reactions.
+    :param adrs: Dictionary of drugs to their ADRs, as scraped (see vigiaccess/pool.py).
+    :return: Dictionary of (normalized drug, system organ class, normalized reaction) to report counts.
+    """
+    reactions = {}
+    for drug, data in adrs.items():
+        for category, category_reactions in data.items():
+            system_organ_class, _ = split_count(category)
+            for category_reaction in category_reactions:
+                reaction, report_count = split_count(category_reaction)
+                reactions[normalize_drug(drug), system_organ_class, normalize_reaction(reaction)] = report_count
+
+    return reactions
+
+
+def load_adrs(session: Session, adrs: Mapping[str, AdrData]) -> int:
+    """
+    Load the ADRs of drugs, replacing the ADRs previously loaded for these drugs.
+    :param session: Session to leverage. Nothing is committed.
+    :param adrs: Dictionary of drugs to their ADRs, as scraped (see vigiaccess/pool.py).
+    :return: Amount of drug reactions loaded.
+    """
+    reactions = split_adrs(adrs)
+    drug_ids = get_or_create_ids(session, Drug, 'drug', [normalize_drug(drug) for drug in adrs])
+    system_organ_class_ids = get_or_create_ids(session, SystemOrganClass, 'system_organ_class',
+                                               [system_organ_class for _, system_organ_class, _ in reactions])
+    reaction_ids = get_or_create_ids(session, Reaction, 'reaction', [reaction for _, _, reaction in reactions])
+
+    ids = list(drug_ids.values())
+    for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+        session.execute(delete(DrugReaction).where(DrugReaction.drug_id.in_(ids[start:start + LOOKUP_BATCH_SIZE])))
+
+    rows: List[Dict[str, Any]] = [{
+        'drug_id': drug_ids[drug],
+        'system_organ_class_id': system_organ_class_ids[system_organ_class],
+        'reaction_id': reaction_ids[reaction],
+        'report_count': report_count,
+    } for (drug, system_organ_class, reaction), report_count in reactions.items()]
+    if rows:
+        session.execute(insert(DrugReaction), rows)
+
+    return len(rows)
+
+
+def get_drug_reactions_select(drug: str) -> Select:
+    """
+    Returns a select of the reactions reported for a drug, most reported first.
+    :param drug: Drug name.
+    :return: Select of system organ classes, reactions, and report counts.
+    """
+    return (select(SystemOrganClass.system_organ_class, Reaction.reaction, DrugReaction.report_count)
+            .join(DrugReaction.drug)
+            .join(DrugReaction.system_organ_class)
+            .join(DrugReaction.reaction)
+            .where(Drug.drug == normalize_drug(drug))
+            .order_by(DrugReaction.report_count.desc(), Reaction.reaction))
+
+
+def get_reaction_drugs_select(reaction: str) -> Select:
+    """
+    Returns a select of the drugs a reaction is reported for, most reported first.
+    :param reaction: Reaction name, in any case.
+    :return: Select of drugs and report counts.
+    """
+    return (select(Drug.drug, DrugReaction.report_count)
+            .join(DrugReaction.drug)
+            .join(DrugReaction.reaction)
+            .where(Reaction.reaction == normalize_reaction(reaction))
+            .order_by(DrugReaction.report_count.desc(), Drug.drug))
@@ -0,0 +1,89 @@
+"""
+File that will create the async DB engine and session for the FastAPI app.
+
+The async engine uses the same database URL and pool settings as base.py, swapping the driver for its asyncio
+counterpart (aiosqlite for SQLite and asyncpg for PostgreSQL).
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Type
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from zen_cdss import DB_SQLITE_TUNED, DB_URL
+from zen_cdss.database.base import get_engine_options, tune_sqlite
+
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+}
+
+
+def get_async_url(url: str) -> str:
+    """
+    Returns the database URL provided with its driver swapped for the asyncio driver of its backend.
+    :param url: Database URL.
+    :return: Database URL for the async engine.
+    """
+    parsed_url = make_url(url)
+    backend = parsed_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver is configured for "{backend}" databases.')
+
+    return parsed_url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}').render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str = DB_URL, sqlite_tuned: Optional[bool] = None, **kwargs: Any) -> AsyncEngine:
+    """
+    Create an async engine for the database URL provided with the configured pool options.
+    :param url: Database URL. Sync drivers are swapped for their async counterparts.
+    :param sqlite_tuned: Whether to apply the tuned SQLite profile to SQLite databases. Defaults to DB_SQLITE_TUNED.
+    :param kwargs: Keyword arguments overriding the configured options.
+    :return: Async engine object.
+    """
+    async_engine = create_async_engine(get_async_url(url), **{**get_engine_options(url), **kwargs})
+
+    sqlite_tuned = DB_SQLITE_TUNED if sqlite_tuned is None else sqlite_tuned
+    if async_engine.sync_engine.dialect.name == 'sqlite' and sqlite_tuned:
+        tune_sqlite(async_engine.sync_engine)
+
+    return async_engine
+
+
+engine = create_async_db_engine()
+
+# Objects must not expire on commit, as refreshing them would need IO outside of an await.
+AsyncSession = sessionmaker(bind=engine, class_=SQLAlchemyAsyncSession, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def async_yield_helper(to_yield: Any) -> AsyncIterator[Any]:
+    """
+    Async context manager to yield object provided.
+    :param to_yield: Object to yield.
+    :return: Yield object that was passed as an argument.
+    """
+    yield to_yield
+
+
+@asynccontextmanager
+async def async_session_scope(
+        session_object: Type[SQLAlchemyAsyncSession] = AsyncSession
+) -> AsyncIterator[SQLAlchemyAsyncSession]:
+    """
+    Provide a transactional scope around a series of async operations.
+    :param session_object: Async session object to instantiate.
+    """
+    session = session_object()
+    try:
+        yield session
+        await session.commit()
+    except Exception:  # pylint: disable=broad-except
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
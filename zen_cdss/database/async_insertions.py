@@ -0,0 +1,179 @@
+"""
+Async counterparts of the functions in insertions.py, for use from the FastAPI app without blocking the event loop.
+
+They take the same patient dictionaries and behave the same way, except that they await an AsyncSession (see
+async_base.py) instead of using a synchronous one. Async sessions do not cascade new objects into the session through
+backrefs, so every object created is added to the session explicitly.
+"""
+
+from typing import Any, AsyncContextManager, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from zen_cdss.database.async_base import async_session_scope, async_yield_helper
+from zen_cdss.database.base import Base
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.insertions import get_or_create_ids
+from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Measurement, Municipality,
+                                      Occupation, OccupationTitle, Patient, Province, Village)
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+
+
+def session_context(existing_session: Optional[AsyncSession]) -> AsyncContextManager[AsyncSession]:
+    """
+    Returns a context manager yielding the existing session provided or a new transactional scope if there is none.
+    :param existing_session: Preexisting session to leverage (if provided).
+    :return: Async context manager yielding a session.
+    """
+    return async_session_scope() if existing_session is None else async_yield_helper(existing_session)
+
+
+async def create_entry(table: Base, accessor: str, value: Optional[str],
+                       existing_session: AsyncSession = None) -> Optional[Base]:
+    """
+    Async version of insertions.create_entry().
+    :param table: Table to create an entry in.
+    :param accessor: Accessor to filter table with.
+    :param value: Value to populate the new entry with.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    """
+    if value is None:  # If the value we are filtering against is None, then just return None as the DB will hold null.
+        return None
+
+    async with session_context(existing_session) as session:
+        # Cache lookups and attaching objects never do IO, so the sync session can be used directly.
+        cached = LOOKUP_CACHE.get_object(session.sync_session, table, value)
+        if cached is not None:
+            return cached
+
+        ids = await session.run_sync(lambda sync_session: get_or_create_ids(sync_session, table, accessor, [value]))
+        LOOKUP_CACHE.stage(session.sync_session, table, value, ids[value])
+        return LOOKUP_CACHE.attach(session.sync_session, table, value, ids[value])
+
+
+async def add_occupation(patient_dict: Dict[str, Any], patient: Patient, existing_session=None) -> Occupation:
+    """
+    Async version of insertions.add_occupation().
+    :param patient_dict: Patient dictionary with occupation details.
+    :param patient: Patient object to link occupation to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    :return: Occupation object.
+    """
+    async with session_context(existing_session) as session:
+        occupation = Occupation(
+            patient=patient,
+            description=patient_dict['occupation_description'],
+            company=await create_entry(Company, 'company', patient_dict.get('company'), session),
+            occupation_title=await create_entry(OccupationTitle, 'occupation_title',
+                                                patient_dict.get('occupation_title'), session)
+        )
+
+        session.add(occupation)
+
+        return occupation
+
+
+async def add_patient(patient_dict: Dict[str, Any], existing_session: AsyncSession = None) -> Patient:
+    """
+    Async version of insertions.add_patient().
+    :param patient_dict: Dictionary containing patient information.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    """
+    async with session_context(existing_session) as session:
+        patient = Patient(
+            first_name=patient_dict['first_name'],
+            last_name=patient_dict['last_name'],
+            gender=patient_dict['gender'],
+            date_of_birth=patient_dict['date_of_birth'],
+            registration_date=patient_dict.get('registration_date'),
+            referred_by=patient_dict.get('referred_by'),
+            accompanied_by=patient_dict.get('accompanied_by'),
+            family_diabetics=patient_dict.get('family_diabetics')
+        )
+
+        session.add(patient)
+        return patient
+
+
+async def add_contact_details(patient_dict: Dict[str, Any], patient: Patient,
+                              existing_session=None) -> ContactDetails:
+    """
+    Async version of insertions.add_contact_details().
+    :param patient_dict: Patient dictionary with contact details.
+    :param patient: Patient object to link contact details to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    :return: Contact details object.
+    """
+    async with session_context(existing_session) as session:
+        contact_details = ContactDetails(
+            email=patient_dict.get('email'),
+            phone_number=patient_dict.get('phone'),
+            patient=patient
+        )
+
+        session.add(contact_details)
+
+        return contact_details
+
+
+async def add_diagnosis(patient_dict: Dict[str, Any], patient: Patient,
+                        existing_session: AsyncSession = None) -> Diagnosis:
+    """
+    Async version of insertions.add_diagnosis().
+    :param patient_dict: Patient dictionary with diagnosis data.
+    :param patient: Patient object to link diagnosis details to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    :return: Diagnosis object.
+    """
+    async with session_context(existing_session) as session:
+        diagnosis = Diagnosis(
+            diagnosis=patient_dict['diagnosis'],
+            advent=patient_dict.get('diagnosis_advent'),
+            patient=patient
+        )
+
+        session.add(diagnosis)
+
+        return diagnosis
+
+
+async def add_measurement(patient_dict: Dict[str, Any], patient: Patient,
+                          existing_session: AsyncSession = None) -> Measurement:
+    """
+    Async version of insertions.add_measurement().
+    :param patient_dict: Patient dictionary with the raw measurement inputs.
+    :param patient: Patient object to link measurement to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    :return: Measurement object.
+    """
+    async with session_context(existing_session) as session:
+        measurement = Measurement(
+            patient=patient,
+            measured_on=patient_dict.get('measured_on'),
+            **{name: patient_dict.get(name) for name in MEASUREMENT_INPUTS}
+        )
+
+        session.add(measurement)
+        return measurement
+
+
+async def add_address(patient_dict: Dict[str, Any], patient: Patient, existing_session=None) -> Address:
+    """
+    Async version of insertions.add_address().
+    :param patient_dict: Dictionary containing patient information.
+    :param patient: Patient object to link address to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    """
+    async with session_context(existing_session) as session:
+        address = Address(
+            address=patient_dict['address'],
+            province=await create_entry(Province, 'province', patient_dict.get('province'), session),
+            district=await create_entry(District, 'district', patient_dict.get('district'), session),
+            municipality=await create_entry(Municipality, 'municipality', patient_dict.get('municipality'), session),
+            village=await create_entry(Village, 'village', patient_dict.get('village'), session),
+            patient=patient
+        )
+
+        session.add(address)
+
+        return address
@@ -2,13 +2,78 @@
 File that will create the DB engine and session.
 """
 
-from sqlalchemy import create_engine
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from zen_cdss import DB_PATH
+from zen_cdss import DB_MAX_OVERFLOW, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_SQLITE_TUNED, DB_URL
+
+# Pragmas of the tuned SQLite profile. WAL lets readers proceed while a writer is active, and synchronous=NORMAL is
+# safe with WAL (a power loss can only lose the last commits, never corrupt the database).
+SQLITE_PRAGMAS: Dict[str, Union[int, str]] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # Bytes.
+    'cache_size': -64 * 1024,  # Negative values are in KiB, so this is 64 MiB.
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5_000,  # Milliseconds to wait for a lock before raising "database is locked".
+}
+
+
+def get_engine_options(url: str) -> Dict[str, Any]:
+    """
+    Returns the pool options to create an engine for the database URL provided with.
+    :param url: Database URL.
+    :return: Dictionary of keyword arguments for create_engine().
+    """
+    options: Dict[str, Any] = {
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+    # SQLite does not use a queue pool, so it does not accept sizing arguments.
+    if make_url(url).get_backend_name() != 'sqlite':
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+
+    return options
+
+
+def tune_sqlite(sqlite_engine: Engine, pragmas: Optional[Dict[str, Union[int, str]]] = None):
+    """
+    Set the pragmas provided on every connection the SQLite engine provided opens.
+    :param sqlite_engine: SQLite engine to tune.
+    :param pragmas: Pragmas to set. Defaults to SQLITE_PRAGMAS.
+    """
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(sqlite_engine, 'connect')
+    def set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+
+def create_db_engine(url: str = DB_URL, sqlite_tuned: Optional[bool] = None, **kwargs: Any) -> Engine:
+    """
+    Create an engine for the database URL provided with the configured pool options.
+    :param url: Database URL.
+    :param sqlite_tuned: Whether to apply the tuned SQLite profile to SQLite databases. Defaults to DB_SQLITE_TUNED.
+    :param kwargs: Keyword arguments overriding the configured options.
+    :return: Engine object.
+    """
+    db_engine = create_engine(url, **{**get_engine_options(url), **kwargs})
+
+    if db_engine.dialect.name == 'sqlite' and (DB_SQLITE_TUNED if sqlite_tuned is None else sqlite_tuned):
+        tune_sqlite(db_engine)
+
+    return db_engine
+
 
-engine = create_engine(f'sqlite:///{DB_PATH}')
+engine = create_db_engine()
 Session = sessionmaker(bind=engine)
 
 Base = declarative_base()
@@ -0,0 +1,290 @@
+"""
+Bulk ingestion of patients and all their child rows.
+
+Instead of building ORM objects one at a time like the add_* functions in insertions.py, patients are consumed in
+chunks and each chunk is written with one executemany statement per table inside its own transaction.
+"""
+
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Type
+
+import pandas as pd
+from sqlalchemy import Integer, func, insert, select
+from sqlalchemy.orm import Session
+
+from zen_cdss.database import base
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.insertions import get_or_create_ids
+from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Measurement, Municipality,
+                                      Occupation, OccupationTitle, Patient, Province, Village)
+from zen_cdss.database.models.measurement import INTEGER_INPUTS, MEASUREMENT_INPUTS
+from zen_cdss.database.utils import get_age, parse_date, session_scope
+from zen_cdss.formulas.panel import VitalsPanel, evaluate_partial_panel_frame, get_panel_version
+
+DEFAULT_CHUNK_SIZE = 1_000
+
+# Lookup tables referenced by child rows: (table, accessor, key in the patient dictionary).
+ADDRESS_LOOKUPS = ((Village, 'village', 'village'), (Municipality, 'municipality', 'municipality'),
+                   (District, 'district', 'district'), (Province, 'province', 'province'))
+OCCUPATION_LOOKUPS = ((OccupationTitle, 'occupation_title', 'occupation_title'), (Company, 'company', 'company'))
+
+
+class ChunkReport(NamedTuple):
+    """
+    Throughput report of a single chunk written by bulk_add_patients().
+    """
+    chunk: int
+    patients: int
+    rows: int
+    seconds: float
+
+    @property
+    def patients_per_second(self) -> float:
+        """
+        Patients written per second in this chunk.
+        """
+        return self.patients / self.seconds if self.seconds else float('inf')
+
+
+def chunked(iterable: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Lazily split an iterable into lists of chunk size items. The last chunk may be smaller.
+    :param iterable: Iterable to split.
+    :param chunk_size: Maximum amount of items per chunk.
+    :return: Iterator of chunks.
+    """
+    if chunk_size < 1:
+        raise ValueError(f'Expected chunk size to be a positive integer. Got: {chunk_size}')
+
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def normalize_patient(patient_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the patient table values for the patient dictionary provided, parsed the same way the Patient model does.
+    :param patient_dict: Dictionary containing patient information.
+    :return: Dictionary of patient column values.
+    """
+    return {
+        'first_name': patient_dict['first_name'],
+        'last_name': patient_dict['last_name'],
+        'gender': Patient.parse_gender(patient_dict['gender']),
+        'date_of_birth': parse_date(patient_dict['date_of_birth']),
+        'registration_date': parse_date(patient_dict.get('registration_date'), null_ok=True),
+        'referred_by': patient_dict.get('referred_by'),
+        'accompanied_by': patient_dict.get('accompanied_by'),
+        'family_diabetics': patient_dict.get('family_diabetics'),
+    }
+
+
+def allocate_ids(session: Session, table: Type[base.Base], count: int) -> Sequence[int]:
+    """
+    Reserve primary keys for rows that are about to be inserted in the session's transaction.
+
+    On PostgreSQL the IDs are drawn from the table's sequence, so concurrent writers never collide. Elsewhere, the IDs
+    following the current maximum are used, which relies on the database serializing writers (like SQLite does).
+    :param session: Session whose transaction the rows will be inserted in.
+    :param table: Table to allocate IDs for.
+    :param count: Amount of IDs to allocate.
+    :return: IDs allocated.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        sequence = func.pg_get_serial_sequence(table.__tablename__, 'id')
+        statement = select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+        return session.execute(statement).scalars().all()
+
+    last_id = session.execute(select(func.max(table.id))).scalar() or 0
+    return range(last_id + 1, last_id + 1 + count)
+
+
+def resolve_lookup_ids(session: Session, table: Type[base.Base], accessor: str,
+                       values: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    Get the IDs of every value provided in a one-column lookup table, creating the values that do not exist yet.
+    Values already in LOOKUP_CACHE are not queried, the rest go through get_or_create_ids().
+    :param session: Session to leverage.
+    :param table: Lookup table (e.g. Province, Company, etc.).
+    :param accessor: Column of the table holding the value.
+    :param values: Values to resolve. None values are ignored.
+    :return: Dictionary of values to their IDs.
+    """
+    ids = {}
+    uncached = []
+    for value in {value for value in values if value is not None}:
+        row_id = LOOKUP_CACHE.get_id(session, table, value)
+        if row_id is None:
+            uncached.append(value)
+        else:
+            ids[value] = row_id
+
+    found = get_or_create_ids(session, table, accessor, uncached)
+    for value, row_id in found.items():
+        LOOKUP_CACHE.stage(session, table, value, row_id)
+
+    ids.update(found)
+    return ids
+
+
+def get_child_rows(patients: Sequence[Dict[str, Any]], patient_ids: Sequence[int],
+                   lookup_ids: Dict[str, Dict[str, int]]) -> Dict[Type[base.Base], List[Dict[str, Any]]]:
+    """
+    Build the address, occupation, contact details, and diagnosis rows of the patients provided. The keys each row
+    requires mirror the add_* functions in insertions.py.
+    :param patients: Patient dictionaries.
+    :param patient_ids: IDs allocated to the patients, in the same order.
+    :param lookup_ids: Lookup IDs keyed by patient dictionary key and then value, from resolve_lookup_ids().
+    :return: Dictionary of tables to the rows to insert into them.
+    """
+    def lookup(key: str, patient_dict: Dict[str, Any]) -> Optional[int]:
+        value = patient_dict.get(key)
+        return None if value is None else lookup_ids[key][value]
+
+    rows: Dict[Type[base.Base], List[Dict[str, Any]]] = {Address: [], Occupation: [], ContactDetails: [],
+                                                         Diagnosis: []}
+    for patient_id, patient_dict in zip(patient_ids, patients):
+        if 'address' in patient_dict:
+            rows[Address].append({
+                'patient_id': patient_id,
+                'address': patient_dict['address'],
+                **{f'{key}_id': lookup(key, patient_dict) for _, _, key in ADDRESS_LOOKUPS}
+            })
+
+        if 'occupation_description' in patient_dict:
+            rows[Occupation].append({
+                'patient_id': patient_id,
+                'description': patient_dict['occupation_description'],
+                **{f'{key}_id': lookup(key, patient_dict) for _, _, key in OCCUPATION_LOOKUPS}
+            })
+
+        if 'email' in patient_dict or 'phone' in patient_dict:
+            rows[ContactDetails].append({
+                'patient_id': patient_id,
+                'email': patient_dict.get('email'),
+                'phone_number': patient_dict.get('phone'),
+            })
+
+        if 'diagnosis' in patient_dict:
+            advent = patient_dict.get('diagnosis_advent')
+            rows[Diagnosis].append({
+                'patient_id': patient_id,
+                'diagnosis': patient_dict['diagnosis'],
+                'advent': None if advent is None else parse_date(advent),
+            })
+
+    return rows
+
+
+def get_measurement_rows(patients: Sequence[Dict[str, Any]],
+                         patient_rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the measurement rows of the patients provided, evaluating the derived vitals of the whole chunk at once.
+    :param patients: Patient dictionaries.
+    :param patient_rows: Normalized patient rows with their IDs, in the same order.
+    :return: Measurement rows to insert.
+    """
+    measurements = []
+    for patient_dict, patient_row in zip(patients, patient_rows):
+        if any(name in patient_dict for name in MEASUREMENT_INPUTS):
+            measured_on = parse_date(patient_dict.get('measured_on'), null_ok=True)
+            measurements.append({
+                'patient_id': patient_row['id'],
+                'measured_on': measured_on,
+                'gender': patient_row['gender'],
+                'age': get_age(patient_row['date_of_birth'], measured_on),
+                **{name: patient_dict.get(name) for name in MEASUREMENT_INPUTS}
+            })
+
+    return evaluate_measurements(measurements)
+
+
+def evaluate_measurements(measurements: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Evaluate the derived vitals of measurement rows in one pass (see formulas/panel.py) instead of once per measurement
+    like the Measurement model does.
+    :param measurements: Measurement rows holding the gender of the patient, the age, and the raw inputs.
+    :return: Measurement rows without the gender, with the derived vitals and the version of the formulas used.
+    """
+    if not measurements:
+        return []
+
+    frame = pd.DataFrame(measurements)
+    frame = frame.astype({name: float for name in MEASUREMENT_INPUTS})
+    frame[list(INTEGER_INPUTS)] = frame[list(INTEGER_INPUTS)].round()  # Grade the inputs as they are stored.
+    vitals = evaluate_partial_panel_frame(frame).reindex(columns=VitalsPanel._fields)  # Null when never evaluated.
+    frame = pd.concat([frame.drop(columns='gender'), vitals], axis=1)
+    for column in Measurement.__table__.columns:
+        if isinstance(column.type, Integer) and column.name in frame.columns:
+            frame[column.name] = frame[column.name].round().astype('Int64')
+
+    frame['vitals_version'] = get_panel_version()
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+
+
+def write_chunk(session: Session, patients: Sequence[Dict[str, Any]]) -> int:
+    """
+    Write a chunk of patients and all their child rows in the session provided.
+    :param session: Session to leverage.
+    :param patients: Patient dictionaries to write.
+    :return: Amount of rows written across every table.
+    """
+    patient_rows = [normalize_patient(patient_dict) for patient_dict in patients]  # Validate before writing anything.
+    patient_ids = allocate_ids(session, Patient, len(patient_rows))
+    for patient_id, patient_row in zip(patient_ids, patient_rows):
+        patient_row['id'] = patient_id
+
+    session.execute(insert(Patient), patient_rows)
+
+    lookup_ids = {
+        key: resolve_lookup_ids(session, table, accessor, (patient_dict.get(key) for patient_dict in patients))
+        for table, accessor, key in ADDRESS_LOOKUPS + OCCUPATION_LOOKUPS
+    }
+
+    child_rows = get_child_rows(patients, patient_ids, lookup_ids)
+    child_rows[Measurement] = get_measurement_rows(patients, patient_rows)
+
+    rows_written = len(patient_rows)
+    for table, rows in child_rows.items():
+        if rows:
+            session.execute(insert(table), rows)
+            rows_written += len(rows)
+
+    return rows_written
+
+
+def bulk_add_patients(
+        patient_dicts: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        session_object: Type[Session] = base.Session,
+        on_chunk: Optional[Callable[[ChunkReport], None]] = None
+) -> List[ChunkReport]:
+    """
+    Add patients along with their address, occupation, contact details, diagnosis, and measurement in bulk. Patient
+    dictionaries have the same shape the add_* functions in insertions.py expect.
+
+    Each chunk is written in its own transaction, so if a chunk fails, only that chunk is rolled back and the error is
+    raised. The iterable is consumed lazily, so generators can be used to ingest data that does not fit in memory.
+    :param patient_dicts: Iterable of patient dictionaries.
+    :param chunk_size: Amount of patients to write per transaction.
+    :param session_object: Session object to instantiate for each chunk.
+    :param on_chunk: Optional callback called with the report of each chunk after it is committed.
+    :return: List of reports, one per chunk.
+    """
+    reports = []
+    for chunk_number, patients in enumerate(chunked(patient_dicts, chunk_size), start=1):
+        start_time = time.perf_counter()
+        with session_scope(session_object) as session:
+            rows_written = write_chunk(session, patients)
+
+        report = ChunkReport(chunk=chunk_number, patients=len(patients), rows=rows_written,
+                             seconds=time.perf_counter() - start_time)
+        reports.append(report)
+
+        if on_chunk is not None:
+            on_chunk(report)
+
+    return reports
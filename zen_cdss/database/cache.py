@@ -0,0 +1,227 @@
+"""
+Process-wide cache of value to ID lookups for the small one-column tables (provinces, companies, etc.).
+
+Values found or created inside a session are staged on that session and only published to the cache once its
+transaction commits, so rows that get rolled back never end up in the cache. Staged values are served to later lookups
+in the same session, which keeps repeated lookups consistent before anything is committed.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple, Type, Union
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, SessionTransaction, make_transient_to_detached
+
+from zen_cdss.database import base
+from zen_cdss.database.models import Company, District, Municipality, OccupationTitle, Province, Village
+
+DEFAULT_MAX_SIZE = 100_000
+STAGED_KEY = 'zen_cdss_staged_lookups'
+
+# Tables that can be cached along with the accessor of their value column.
+LOOKUP_ACCESSORS: Dict[Type[base.Base], str] = {
+    Province: 'province',
+    District: 'district',
+    Municipality: 'municipality',
+    Village: 'village',
+    Company: 'company',
+    OccupationTitle: 'occupation_title',
+}
+
+CacheKey = Tuple[str, str, str]
+
+
+class CacheStats(NamedTuple):
+    """
+    Statistics of a lookup cache.
+    """
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Ratio of lookups that were served by the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LookupCache:
+    """
+    Size-bounded, least recently used cache of lookup table values to IDs. Entries are keyed by database URL as well,
+    so sessions bound to different databases never share IDs.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[CacheKey, int]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(session: Session, table: Type[base.Base], value: str) -> CacheKey:
+        """
+        Returns the cache key of the value provided.
+        :param session: Session the lookup is made with.
+        :param table: Lookup table.
+        :param value: Value to look up.
+        :return: Cache key.
+        """
+        return str(session.get_bind().url), table.__tablename__, value
+
+    @staticmethod
+    def get_staged(session: Session) -> Dict[CacheKey, Union[int, base.Base]]:
+        """
+        Returns the lookups staged on the session provided that have not been committed yet.
+        :param session: Session to get staged lookups of.
+        :return: Dictionary of cache keys to IDs or objects that have not been flushed yet.
+        """
+        return session.info.setdefault(STAGED_KEY, {})
+
+    def get_id(self, session: Session, table: Type[base.Base], value: str) -> Optional[int]:
+        """
+        Get the ID of the value provided, if it is cached or staged with an ID on the session.
+        :param session: Session the lookup is made with.
+        :param table: Lookup table.
+        :param value: Value to look up.
+        :return: ID of the value, or None on a cache miss.
+        """
+        key = self.get_key(session, table, value)
+        staged = self.get_staged(session).get(key)
+        if staged is not None:
+            identity = staged if isinstance(staged, int) else inspect(staged).identity
+            if identity is not None:
+                self.hits += 1
+                return identity if isinstance(identity, int) else identity[0]
+
+        with self._lock:
+            row_id = self._entries.get(key)
+            if row_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        return row_id
+
+    def get_object(self, session: Session, table: Type[base.Base], value: str) -> Optional[base.Base]:
+        """
+        Get the object of the value provided attached to the session without querying the database.
+        :param session: Session the lookup is made with.
+        :param table: Lookup table.
+        :param value: Value to look up.
+        :return: Object holding the value, or None on a cache miss.
+        """
+        staged = self.get_staged(session).get(self.get_key(session, table, value))
+        if staged is not None and not isinstance(staged, int):
+            self.hits += 1
+            return staged
+
+        row_id = self.get_id(session, table, value)
+        if row_id is None:
+            return None
+
+        return self.attach(session, table, value, row_id)
+
+    @staticmethod
+    def attach(session: Session, table: Type[base.Base], value: str, row_id: int) -> base.Base:
+        """
+        Returns the object of a row whose ID and value are known, attached to the session without querying.
+        :param session: Session to attach the object to.
+        :param table: Lookup table.
+        :param value: Value of the row.
+        :param row_id: ID of the row.
+        :return: Persistent object of the row.
+        """
+        instance = table(value)
+        instance.id = row_id
+        make_transient_to_detached(instance)
+        return session.merge(instance, load=False)
+
+    def stage(self, session: Session, table: Type[base.Base], value: str, entry: Union[int, base.Base]):
+        """
+        Stage a value found or created in the session. It is published to the cache once the session commits.
+        :param session: Session the value was found or created in.
+        :param table: Lookup table.
+        :param value: Value found or created.
+        :param entry: ID of the value, or the object holding the value if it may not have an ID yet.
+        """
+        self.get_staged(session)[self.get_key(session, table, value)] = entry
+
+    def put(self, key: CacheKey, row_id: int):
+        """
+        Cache the ID of the key provided, evicting the least recently used entry if the cache is full.
+        :param key: Cache key from get_key().
+        :param row_id: ID of the row holding the value.
+        """
+        with self._lock:
+            self._entries[key] = row_id
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def warm(self, session: Session, tables: Iterable[Type[base.Base]] = tuple(LOOKUP_ACCESSORS)) -> int:
+        """
+        Load lookup values from the database into the cache.
+        :param session: Session to load values with.
+        :param tables: Lookup tables to load.
+        :return: Amount of values loaded.
+        """
+        loaded = 0
+        for table in tables:
+            column = getattr(table, LOOKUP_ACCESSORS[table])
+            for value, row_id in session.execute(select(column, table.id).where(column.isnot(None))):
+                self.put(self.get_key(session, table, value), row_id)
+                loaded += 1
+
+        return loaded
+
+    def clear(self):
+        """
+        Clear every cached entry and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Returns the statistics of the cache.
+        """
+        return CacheStats(hits=self.hits, misses=self.misses, size=len(self._entries), max_size=self.max_size)
+
+
+LOOKUP_CACHE = LookupCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def publish_staged_lookups(session: Session):
+    """
+    Publish the lookups staged on a session once its transaction commits.
+    :param session: Session that committed.
+    """
+    for key, entry in session.info.pop(STAGED_KEY, {}).items():
+        identity = entry if isinstance(entry, int) else inspect(entry).identity
+        if identity is not None:
+            LOOKUP_CACHE.put(key, identity if isinstance(identity, int) else identity[0])
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def discard_staged_lookups(session: Session, transaction: SessionTransaction):
+    """
+    Discard lookups staged on a session whose transaction ended without committing (rollbacks, closes, etc.).
+    :param session: Session whose transaction ended.
+    :param transaction: Transaction that ended.
+    """
+    if transaction.parent is None:
+        session.info.pop(STAGED_KEY, None)
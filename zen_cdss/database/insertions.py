@@ -2,15 +2,75 @@
 Miscellaneous functions to leverage to insert to the database.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
 
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from zen_cdss.database.base import Base
-from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Municipality, Occupation,
-                                      OccupationTitle, Patient, Province, Village)
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Measurement, Municipality,
+                                      Occupation, OccupationTitle, Patient, Province, Village)
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
 from zen_cdss.database.utils import session_scope, yield_helper
 
+LOOKUP_BATCH_SIZE = 500
+
+# Dialects that support INSERT ... ON CONFLICT DO NOTHING, mapped to their insert constructs.
+UPSERT_DIALECTS: Dict[str, Callable] = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def get_or_create_ids(session: Session, table: Type[Base], accessor: str, values: Iterable[str]) -> Dict[str, int]:
+    """
+    Get the IDs of the values provided in a one-column table with a unique index on its value column, creating the
+    values that do not exist yet.
+
+    On SQLite and PostgreSQL this is an atomic INSERT ... ON CONFLICT DO NOTHING followed by an indexed lookup, so
+    parallel writers can never create duplicates. Other dialects fall back to selecting first and inserting what is
+    missing.
+    :param session: Session to leverage.
+    :param table: Table to get or create values in.
+    :param accessor: Column of the table holding the value.
+    :param values: Values to get or create.
+    :return: Dictionary of values to their IDs.
+    """
+    column = getattr(table, accessor)
+    wanted = sorted(set(values))
+
+    def select_ids(to_select: List[str]) -> Dict[str, int]:
+        selected = {}
+        for start in range(0, len(to_select), LOOKUP_BATCH_SIZE):  # Stay below SQLite's bound parameter limit.
+            batch = to_select[start:start + LOOKUP_BATCH_SIZE]
+            selected.update(session.execute(select(column, table.id).where(column.in_(batch))).all())
+        return selected
+
+    if not wanted:
+        return {}
+
+    dialect_insert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(table).on_conflict_do_nothing(index_elements=[accessor])
+        if len(wanted) == 1 and session.get_bind().dialect.implicit_returning:
+            row_id = session.execute(statement.values({accessor: wanted[0]}).returning(table.id)).scalar()
+            if row_id is not None:
+                return {wanted[0]: row_id}
+        else:
+            session.execute(statement, [{accessor: value} for value in wanted])
+
+        return select_ids(wanted)
+
+    ids = select_ids(wanted)
+    missing = [value for value in wanted if value not in ids]
+    if missing:
+        session.execute(insert(table), [{accessor: value} for value in missing])
+        ids.update(select_ids(missing))
+
+    return ids
+
 
 def create_entry(table: Base, accessor: str, value: Optional[str], existing_session: Session = None) -> Optional[Base]:
     """
@@ -20,6 +80,9 @@ def create_entry(table: Base, accessor: str, value: Optional[str], existing_sess
     Note that this only works with tables that take in one argument and should only be used with one-column tables
     that should not have duplicates like companies, occupation titles, provinces, etc.
 
+    Lookups go through the process-wide LOOKUP_CACHE, so values that were already seen are returned without querying
+    the database. Otherwise, the value is upserted with get_or_create_ids() in the session's transaction.
+
     :param table: Table to create an entry in.
     :param accessor: Accessor to filter table with.
     :param value: Value to populate the new entry with.
@@ -30,12 +93,13 @@ def create_entry(table: Base, accessor: str, value: Optional[str], existing_sess
 
     context_manager = session_scope if existing_session is None else lambda: yield_helper(existing_session)
     with context_manager() as session:
-        result = session.query(table).filter(getattr(table, accessor) == value).all()
+        cached = LOOKUP_CACHE.get_object(session, table, value)
+        if cached is not None:  # Served from the cache (or created earlier in this session) without a round trip.
+            return cached
 
-        if not result:  # If the resulting list is empty, then just create the table with the value provided.
-            return table(value)
-
-        return result.pop()  # Only one object should exist, so pop it off and return it.
+        row_id = get_or_create_ids(session, table, accessor, [value])[value]
+        LOOKUP_CACHE.stage(session, table, value, row_id)
+        return LOOKUP_CACHE.attach(session, table, value, row_id)
 
 
 def add_occupation(patient_dict: Dict[str, Any], patient: Patient, existing_session=None) -> Occupation:
@@ -139,6 +203,30 @@ def add_diagnosis(patient_dict: Dict[str, Any], patient: Patient, existing_sessi
         return diagnosis
 
 
+def add_measurement(patient_dict: Dict[str, Any], patient: Patient,
+                    existing_session: Session = None) -> Measurement:
+    """
+    Add measurement, computing its derived vitals.
+    :param patient_dict: Patient dictionary with the raw measurement inputs (see MEASUREMENT_INPUTS) and optionally the
+     date they were measured on (measured_on).
+    :param patient: Patient object to link measurement to.
+    :param existing_session: Preexisting session to leverage to avoid creating new sessions (if provided).
+    :return: Measurement object.
+    """
+    context_manager = session_scope if existing_session is None else lambda: yield_helper(existing_session)
+    with context_manager() as session:
+        measurement = Measurement(
+            patient=patient,
+            measured_on=patient_dict.get('measured_on'),
+            **{name: patient_dict.get(name) for name in MEASUREMENT_INPUTS}
+        )
+
+        if existing_session is None:  # Only add the object if we just created the session object.
+            session.add(measurement)
+
+        return measurement
+
+
 def add_address(patient_dict: Dict[str, Any], patient: Patient, existing_session=None) -> Address:
     """
     Add address with the patient dictionary provided.
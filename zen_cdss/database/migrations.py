@@ -0,0 +1,151 @@
+"""
+Migrations to bring existing databases up to date with the declared models.
+
+Base.metadata.create_all() only creates tables that do not exist yet, so columns and indexes declared on the models
+after a database was created never make it into that database. migrate() creates missing tables, nullable columns and
+indexes, merging duplicate lookup values first so the unique indexes can be created, and drops the indexes that were
+superseded since.
+
+Run with: python -m zen_cdss.database.migrations
+"""
+
+from typing import List, Tuple, Type
+
+from sqlalchemy import Column, Table, delete, func, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from zen_cdss.database import base
+from zen_cdss.database.cache import LOOKUP_ACCESSORS
+
+# Indexes once declared on the models and since superseded, by table.
+OBSOLETE_INDEXES = {
+    'measurement': ('ix_measurement_patient_id',),  # Superseded by ix_measurement_patient_id_measured_on.
+}
+
+
+def get_references(table: Table) -> List[Tuple[Table, Column]]:
+    """
+    Returns every foreign key column that references the table provided.
+    :param table: Referenced table.
+    :return: List of tables and their columns referencing the table provided.
+    """
+    return [(referencing_table, foreign_key.parent)
+            for referencing_table in base.Base.metadata.sorted_tables
+            for foreign_key in referencing_table.foreign_keys
+            if foreign_key.column.table is table]
+
+
+def merge_duplicate_lookups(connection: Connection, lookup_table: Type[base.Base], accessor: str) -> int:
+    """
+    Merge rows of a lookup table that hold the same value into the row with the lowest ID, repointing every foreign
+    key that referenced the removed rows.
+    :param connection: Connection to leverage.
+    :param lookup_table: Lookup table (e.g. Province, Company, etc.).
+    :param accessor: Column of the table holding the value.
+    :return: Amount of duplicate rows removed.
+    """
+    table = lookup_table.__table__
+    column = table.c[accessor]
+    duplicates = connection.execute(
+        select(column, func.min(table.c.id)).group_by(column).having(func.count() > 1)
+    ).all()
+
+    removed = 0
+    for value, kept_id in duplicates:
+        duplicate_ids = select(table.c.id).where(column == value, table.c.id != kept_id)
+        for referencing_table, foreign_key_column in get_references(table):
+            connection.execute(update(referencing_table)
+                               .where(foreign_key_column.in_(duplicate_ids))
+                               .values({foreign_key_column.name: kept_id}))
+
+        removed += connection.execute(delete(table).where(column == value, table.c.id != kept_id)).rowcount
+
+    return removed
+
+
+def add_missing_columns(connection: Connection) -> List[str]:
+    """
+    Add every nullable column declared on the models that does not exist in the database yet. Existing rows hold nulls
+    in the columns added.
+    :param connection: Connection to leverage.
+    :return: Names of the columns added, qualified with their table names.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in base.Base.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(f'ALTER TABLE {preparer.format_table(table)} '
+                                        f'ADD COLUMN {preparer.format_column(column)} {column_type}'))
+                added.append(f'{table.name}.{column.name}')
+
+    return added
+
+
+def create_missing_indexes(connection: Connection) -> List[str]:
+    """
+    Create every index declared on the models that does not exist in the database yet.
+    :param connection: Connection to leverage.
+    :return: Names of the indexes created.
+    """
+    inspector = inspect(connection)
+    created = []
+    for table in base.Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda table_index: table_index.name):
+            if index.name not in existing:
+                index.create(connection)
+                created.append(index.name)
+
+    return created
+
+
+def drop_obsolete_indexes(connection: Connection) -> List[str]:
+    """
+    Drop every obsolete index (see OBSOLETE_INDEXES) that still exists in the database.
+    :param connection: Connection to leverage.
+    :return: Names of the indexes dropped.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    dropped = []
+    for table in base.Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index_name in OBSOLETE_INDEXES.get(table.name, ()):
+            if index_name in existing:
+                connection.execute(text(f'DROP INDEX {preparer.quote(index_name)}'))
+                dropped.append(index_name)
+
+    return dropped
+
+
+def migrate(engine: Engine = base.engine) -> List[str]:
+    """
+    Bring the database up to date with the declared models in a single transaction.
+    :param engine: Engine of the database to migrate.
+    :return: Names of the indexes created.
+    """
+    with engine.begin() as connection:
+        base.Base.metadata.create_all(connection)
+        add_missing_columns(connection)
+
+        for lookup_table, accessor in LOOKUP_ACCESSORS.items():
+            merge_duplicate_lookups(connection, lookup_table, accessor)
+
+        drop_obsolete_indexes(connection)
+        return create_missing_indexes(connection)
+
+
+def main():
+    """
+    Migrate the configured database.
+    """
+    created = migrate()
+    print(f'Created {len(created)} indexes: {", ".join(created)}' if created else 'Database is up to date.')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,12 +7,18 @@ from zen_cdss.database.models.company import Company
 from zen_cdss.database.models.contact_details import ContactDetails
 from zen_cdss.database.models.diagnosis import Diagnosis
 from zen_cdss.database.models.district import District
+from zen_cdss.database.models.drug import Drug
+from zen_cdss.database.models.drug_reaction import DrugReaction
+from zen_cdss.database.models.measurement import Measurement
 from zen_cdss.database.models.municipality import Municipality
 from zen_cdss.database.models.occupation import Occupation
 from zen_cdss.database.models.occupation_title import OccupationTitle
 from zen_cdss.database.models.patient import Patient
 from zen_cdss.database.models.province import Province
+from zen_cdss.database.models.reaction import Reaction
+from zen_cdss.database.models.system_organ_class import SystemOrganClass
 from zen_cdss.database.models.village import Village
 
-__all__ = ['Address', 'Company', 'ContactDetails', 'Diagnosis', 'District', 'Municipality', 'Occupation',
-           'OccupationTitle', 'Patient', 'Province', 'Village']
+__all__ = ['Address', 'Company', 'ContactDetails', 'Diagnosis', 'District', 'Drug', 'DrugReaction', 'Measurement',
+           'Municipality', 'Occupation', 'OccupationTitle', 'Patient', 'Province', 'Reaction', 'SystemOrganClass',
+           'Village']
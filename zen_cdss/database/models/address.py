@@ -24,19 +24,21 @@ class Address(Base):  # pylint: disable=too-few-public-methods
     id = Column(Integer, primary_key=True)
     address = Column(String)
 
+    # Lookup rows are usually persistent already (see create_entry), so assigning them should not cascade addresses
+    # into their session through the backrefs.
     village_id = Column(Integer, ForeignKey('village.id'))
-    village = relationship("Village", backref=backref("address"))
+    village = relationship("Village", backref=backref("address", cascade_backrefs=False))
 
     municipality_id = Column(Integer, ForeignKey('municipality.id'))
-    municipality = relationship("Municipality", backref=backref("address"))
+    municipality = relationship("Municipality", backref=backref("address", cascade_backrefs=False))
 
     district_id = Column(Integer, ForeignKey('district.id'))
-    district = relationship("District", backref=backref("address"))
+    district = relationship("District", backref=backref("address", cascade_backrefs=False))
 
     province_id = Column(Integer, ForeignKey('province.id'))
-    province = relationship("Province", backref=backref("address"))
+    province = relationship("Province", backref=backref("address", cascade_backrefs=False))
 
-    patient_id = Column(Integer, ForeignKey('patient.id'))
+    patient_id = Column(Integer, ForeignKey('patient.id'), index=True)
     patient = relationship("Patient", backref="address")
 
     def __init__(
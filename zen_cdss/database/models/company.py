@@ -14,7 +14,7 @@ class Company(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "company"
 
     id = Column(Integer, primary_key=True)
-    company = Column(String)
+    company = Column(String, index=True, unique=True)
 
     def __init__(self, company: str):
         self.company = company
@@ -20,7 +20,7 @@ class ContactDetails(Base):  # pylint: disable=too-few-public-methods
     phone_number = Column(String)
     email = Column(String)
 
-    patient_id = Column(Integer, ForeignKey("patient.id"))
+    patient_id = Column(Integer, ForeignKey("patient.id"), index=True)
     patient = relationship("Patient", backref="contact_details")
 
     def __init__(
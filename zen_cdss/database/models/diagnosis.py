@@ -3,7 +3,7 @@ Diagnosis model.
 """
 
 from datetime import date
-from typing import Union
+from typing import Optional, Union
 
 from sqlalchemy import Column, Date, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
@@ -23,12 +23,12 @@ class Diagnosis(Base):  # pylint: disable=too-few-public-methods
     diagnosis = Column(String)
     advent = Column(Date)
 
-    patient_id = Column(Integer, ForeignKey("patient.id"))
+    patient_id = Column(Integer, ForeignKey("patient.id"), index=True)
     patient = relationship("Patient", backref="diagnosis")
 
-    def __init__(self, diagnosis: str, advent: Union[str, date], patient: Patient):
+    def __init__(self, diagnosis: str, advent: Optional[Union[str, date]], patient: Patient):
         self.diagnosis = diagnosis
-        self.advent = parse_date(advent)
+        self.advent = None if advent is None else parse_date(advent)
         self.patient = patient
 
     def __repr__(self):
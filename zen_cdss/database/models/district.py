@@ -14,7 +14,7 @@ class District(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "district"
 
     id = Column(Integer, primary_key=True)
-    district = Column(String(50))
+    district = Column(String(50), index=True, unique=True)
 
     def __init__(self, district: str):
         self.district = district
@@ -0,0 +1,23 @@
+"""
+Drug model.
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from zen_cdss.database.base import Base
+
+
+class Drug(Base):  # pylint: disable=too-few-public-methods
+    """
+    Drug table, holding the drugs whose adverse reactions are known (see DrugReaction).
+    """
+    __tablename__ = "drug"
+
+    id = Column(Integer, primary_key=True)
+    drug = Column(String, index=True, unique=True)
+
+    def __init__(self, drug: str):
+        self.drug = drug
+
+    def __repr__(self):
+        return f'Drug(drug="{self.drug}")'
@@ -0,0 +1,51 @@
+"""
+Drug reaction model.
+"""
+
+from typing import Optional
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.orm import backref, relationship
+
+from zen_cdss.database.base import Base
+from zen_cdss.database.models.drug import Drug
+from zen_cdss.database.models.reaction import Reaction
+from zen_cdss.database.models.system_organ_class import SystemOrganClass
+
+
+class DrugReaction(Base):  # pylint: disable=too-few-public-methods
+    """
+    Drug reaction table, holding how many reports of an adverse reaction VigiAccess has for a drug. The unique
+    constraint leads with the drug and the index with the reaction, so both the reactions of a drug and the drugs of a
+    reaction are indexed lookups.
+    """
+    __tablename__ = "drug_reaction"
+    __table_args__ = (
+        UniqueConstraint('drug_id', 'system_organ_class_id', 'reaction_id'),
+        Index('ix_drug_reaction_reaction_id_drug_id', 'reaction_id', 'drug_id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    report_count = Column(Integer)
+
+    # Lookup rows are usually persistent already, so assigning them should not cascade drug reactions into their
+    # session through the backrefs.
+    drug_id = Column(Integer, ForeignKey('drug.id'), nullable=False)
+    drug = relationship("Drug", backref=backref("drug_reaction", cascade_backrefs=False))
+
+    system_organ_class_id = Column(Integer, ForeignKey('system_organ_class.id'), nullable=False)
+    system_organ_class = relationship("SystemOrganClass", backref=backref("drug_reaction", cascade_backrefs=False))
+
+    reaction_id = Column(Integer, ForeignKey('reaction.id'), nullable=False)
+    reaction = relationship("Reaction", backref=backref("drug_reaction", cascade_backrefs=False))
+
+    def __init__(self, drug: Drug, system_organ_class: SystemOrganClass, reaction: Reaction,
+                 report_count: Optional[int] = None):
+        self.drug = drug
+        self.system_organ_class = system_organ_class
+        self.reaction = reaction
+        self.report_count = report_count
+
+    def __repr__(self):
+        return f'DrugReaction(drug={self.drug}, system_organ_class={self.system_organ_class}, ' \
+               f'reaction={self.reaction}, report_count={self.report_count})'
@@ -0,0 +1,110 @@
+"""
+Measurement model.
+"""
+
+from datetime import date
+from typing import Dict, Optional, Union
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from zen_cdss.database.base import Base
+from zen_cdss.database.models.patient import Patient
+from zen_cdss.database.utils import get_age, parse_date
+from zen_cdss.formulas.panel import get_panel_version, get_vitals_panel
+
+# Raw inputs of the vitals panel recorded at each measurement. Gender and age come from the patient.
+MEASUREMENT_INPUTS = ('weight', 'height', 'waist', 'systolic_bp', 'diastolic_bp', 'insulin', 'glucose', 'tg', 'hdl',
+                      'ggt', 'alt', 'ast', 'creatinine', 'hba1c')
+INTEGER_INPUTS = ('systolic_bp', 'diastolic_bp')  # Raw inputs stored in integer columns.
+
+
+class Measurement(Base):  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Measurement table, holding the raw vitals of a patient at a visit along with every vital derived from them. The
+    derived vitals are computed once when the measurement is written (see formulas/panel.py), so reads and cohort
+    queries filter on indexed columns instead of evaluating formulas.
+    """
+    __tablename__ = "measurement"
+    __table_args__ = (
+        Index('ix_measurement_patient_id_measured_on', 'patient_id', 'measured_on'),  # Latest measurement of patients.
+    )
+
+    id = Column(Integer, primary_key=True)
+    measured_on = Column(Date, index=True)
+    age = Column(Integer)  # Age of the patient when measured.
+
+    # Raw inputs.
+    weight = Column(Float)  # kg
+    height = Column(Float)  # cm
+    waist = Column(Float)  # cm
+    systolic_bp = Column(Integer)  # mmHg
+    diastolic_bp = Column(Integer)  # mmHg
+    insulin = Column(Float)  # µIU/mL
+    glucose = Column(Float)  # mg/dL
+    tg = Column(Float)  # mg/dL
+    hdl = Column(Float)  # mg/dL
+    ggt = Column(Float)  # U/L
+    alt = Column(Float)  # U/L
+    ast = Column(Float)  # U/L
+    creatinine = Column(Float)  # mg/dL
+    hba1c = Column(Float)  # %
+
+    # Derived vitals, null when their inputs were not measured. The ones cohorts are usually selected by are indexed.
+    bmi = Column(Float, index=True)
+    blood_pressure = Column(String(20), index=True)
+    maximum_heart_rate = Column(Integer)
+    target_heart_rate = Column(String(20))
+    homa_ir = Column(Float, index=True)
+    tg_hdl_ratio = Column(Float)
+    triglyceride_glucose_index = Column(Float)
+    atherogenic_index_of_plasma = Column(Float)
+    body_adiposity_index = Column(Float)
+    visceral_adiposity_index = Column(Float, index=True)
+    lipid_accumulation_product = Column(Float, index=True)
+    fatty_liver_index = Column(Float, index=True)
+    waist_height_ratio = Column(Float)
+    alt_ast_ratio = Column(Float)
+    egfr = Column(Float, index=True)
+    estimated_average_glucose = Column(Float)
+    vitals_version = Column(String(16), index=True)  # Formulas the vitals were computed with (see get_panel_version()).
+
+    patient_id = Column(Integer, ForeignKey("patient.id"))  # Leads ix_measurement_patient_id_measured_on.
+    patient = relationship("Patient", backref="measurement")
+
+    def __init__(self, patient: Patient, measured_on: Optional[Union[str, date]] = None,
+                 **inputs: Optional[float]):
+        unknown_inputs = set(inputs) - set(MEASUREMENT_INPUTS)
+        if unknown_inputs:
+            raise TypeError(f'Unknown measurement inputs provided: {sorted(unknown_inputs)}')
+
+        self.patient = patient
+        self.measured_on = parse_date(measured_on, null_ok=True)
+        self.age = get_age(patient.date_of_birth, self.measured_on)
+        for name in MEASUREMENT_INPUTS:
+            value = inputs.get(name)
+            # Vitals are graded from the values as stored, so integer inputs are rounded like their columns store them.
+            setattr(self, name, round(value) if name in INTEGER_INPUTS and value is not None else value)
+
+        self.update_vitals()
+
+    def __repr__(self):
+        inputs = ', '.join(f'{name}={getattr(self, name)}' for name in MEASUREMENT_INPUTS)
+        return f'Measurement(patient={self.patient}, measured_on="{self.measured_on}", {inputs})'
+
+    def get_inputs(self) -> Dict[str, Optional[Union[float, str]]]:
+        """
+        Returns the inputs of the vitals panel for this measurement.
+        :return: Dictionary of panel input names to values.
+        """
+        return {'gender': self.patient.gender, 'age': self.age,
+                **{name: getattr(self, name) for name in MEASUREMENT_INPUTS}}
+
+    def update_vitals(self):
+        """
+        Compute the derived vitals from the raw inputs and store them. Call again after changing raw inputs.
+        """
+        for name, value in get_vitals_panel(**self.get_inputs())._asdict().items():
+            setattr(self, name, value)
+
+        self.vitals_version = get_panel_version()
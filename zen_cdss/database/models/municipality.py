@@ -14,7 +14,7 @@ class Municipality(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "municipality"
 
     id = Column(Integer, primary_key=True)
-    municipality = Column(String(50))
+    municipality = Column(String(50), index=True, unique=True)
 
     def __init__(self, municipality: str):
         self.municipality = municipality
@@ -3,7 +3,7 @@ Occupation model.
 """
 
 from sqlalchemy import Column, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from zen_cdss.database.base import Base
 from zen_cdss.database.models.company import Company
@@ -20,13 +20,15 @@ class Occupation(Base):  # pylint: disable=too-few-public-methods
     id = Column(Integer, primary_key=True)
     description = Column(String)
 
+    # Lookup rows are usually persistent already (see create_entry), so assigning them should not cascade occupations
+    # into their session through the backrefs.
     occupation_title_id = Column(Integer, ForeignKey("occupation_title.id"))
-    occupation_title = relationship("OccupationTitle", backref="occupation")
+    occupation_title = relationship("OccupationTitle", backref=backref("occupation", cascade_backrefs=False))
 
     company_id = Column(Integer, ForeignKey("company.id"))
-    company = relationship("Company", backref="occupation")
+    company = relationship("Company", backref=backref("occupation", cascade_backrefs=False))
 
-    patient_id = Column(Integer, ForeignKey("patient.id"))
+    patient_id = Column(Integer, ForeignKey("patient.id"), index=True)
     patient = relationship("Patient", backref="occupation")
 
     def __init__(self, patient: Patient, description: str, occupation_title: OccupationTitle, company: Company):
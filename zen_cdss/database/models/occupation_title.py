@@ -14,7 +14,7 @@ class OccupationTitle(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "occupation_title"
 
     id = Column(Integer, primary_key=True)
-    occupation_title = Column(String)
+    occupation_title = Column(String, index=True, unique=True)
 
     def __init__(self, occupation_title: str):
         self.occupation_title = occupation_title
@@ -5,7 +5,7 @@ Patient and other related models.
 from datetime import date
 from typing import Optional, Union
 
-from sqlalchemy import Column, Date, Integer, String
+from sqlalchemy import Column, Date, Index, Integer, String
 
 from zen_cdss.database.base import Base
 from zen_cdss.database.utils import parse_date, repr_helper
@@ -16,14 +16,17 @@ class Patient(Base):  # pylint: disable=too-few-public-methods
     Patient table.
     """
     __tablename__ = "patient"
+    __table_args__ = (
+        Index('ix_patient_last_name_first_name', 'last_name', 'first_name'),  # Name searches (also last name only).
+    )
 
     id = Column(Integer, primary_key=True)
 
     first_name = Column(String(50))
     last_name = Column(String(50))
     gender = Column(String(1))
-    date_of_birth = Column(Date)
-    registration_date = Column(Date)
+    date_of_birth = Column(Date, index=True)
+    registration_date = Column(Date, index=True)
     referred_by = Column(String)
     accompanied_by = Column(String)
     family_diabetics = Column(String)
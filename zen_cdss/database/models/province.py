@@ -14,7 +14,7 @@ class Province(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "province"
 
     id = Column(Integer, primary_key=True)
-    province = Column(String(50))
+    province = Column(String(50), index=True, unique=True)
 
     def __init__(self, province: str):
         self.province = province
@@ -0,0 +1,23 @@
+"""
+Reaction model.
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from zen_cdss.database.base import Base
+
+
+class Reaction(Base):  # pylint: disable=too-few-public-methods
+    """
+    Reaction table, holding the adverse reactions reported for drugs (e.g. "Rash").
+    """
+    __tablename__ = "reaction"
+
+    id = Column(Integer, primary_key=True)
+    reaction = Column(String, index=True, unique=True)
+
+    def __init__(self, reaction: str):
+        self.reaction = reaction
+
+    def __repr__(self):
+        return f'Reaction(reaction="{self.reaction}")'
@@ -0,0 +1,24 @@
+"""
+System organ class model.
+"""
+
+from sqlalchemy import Column, Integer, String
+
+from zen_cdss.database.base import Base
+
+
+class SystemOrganClass(Base):  # pylint: disable=too-few-public-methods
+    """
+    System organ class table, holding the categories adverse reactions are reported under (e.g. "Hepatobiliary
+    disorders").
+    """
+    __tablename__ = "system_organ_class"
+
+    id = Column(Integer, primary_key=True)
+    system_organ_class = Column(String, index=True, unique=True)
+
+    def __init__(self, system_organ_class: str):
+        self.system_organ_class = system_organ_class
+
+    def __repr__(self):
+        return f'SystemOrganClass(system_organ_class="{self.system_organ_class}")'
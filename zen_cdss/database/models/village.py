@@ -14,7 +14,7 @@ class Village(Base):  # pylint: disable=too-few-public-methods
     __tablename__ = "village"
 
     id = Column(Integer, primary_key=True)
-    village = Column(String(50))
+    village = Column(String(50), index=True, unique=True)
 
     def __init__(self, village: str):
         self.village = village
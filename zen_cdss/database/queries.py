@@ -0,0 +1,138 @@
+"""
+Read queries for patient records.
+
+Records are read with Core selects of only the columns needed, one query for the patient page and one per related
+record type, instead of loading ORM objects and their relationships. Pages are keyset paginated on the patient ID, so
+every page costs the same index range scan no matter how deep into the table it is (unlike OFFSET, which scans and
+discards every preceding row).
+
+Where ORM objects are needed, get_patient_graph_options() eager loads a patient's whole graph. The backrefs of Patient
+are lazy loaded by default, which fires a query per patient per record type and another per lookup value.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, select
+from sqlalchemy.orm import Load, Session, joinedload, selectinload
+from sqlalchemy.sql import Select
+
+from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Municipality, Occupation,
+                                      OccupationTitle, Patient, Province, Village)
+
+PATIENT_COLUMNS: Dict[str, Column] = {column.name: column for column in Patient.__table__.columns}
+
+# Columns of every record type related to a patient, keyed by the name they are returned under.
+RECORD_COLUMNS: Dict[str, Sequence[Column]] = {
+    'address': (Address.address, Province.province, District.district, Municipality.municipality, Village.village),
+    'occupation': (Occupation.description, Company.company, OccupationTitle.occupation_title),
+    'contact_details': (ContactDetails.email, ContactDetails.phone_number),
+    'diagnosis': (Diagnosis.diagnosis, Diagnosis.advent),
+}
+RECORD_TABLES = {
+    'address': Address,
+    'occupation': Occupation,
+    'contact_details': ContactDetails,
+    'diagnosis': Diagnosis,
+}
+
+FIELDS = (*PATIENT_COLUMNS, *RECORD_COLUMNS)
+
+
+def split_fields(fields: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Validate the fields requested, defaulting to every field.
+    :param fields: Patient column and record names to return. The patient ID is always returned.
+    :return: Fields to return in a consistent order.
+    """
+    if fields is None:
+        return list(FIELDS)
+
+    fields = set(fields)
+    unknown = fields.difference(FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}. Expected any of: {", ".join(FIELDS)}')
+
+    return [field for field in FIELDS if field in fields or field == 'id']
+
+
+def get_patient_select(fields: Sequence[str]) -> Select:
+    """
+    Returns a select of the patient columns among the fields provided.
+    :param fields: Fields to return (see split_fields()).
+    :return: Select statement.
+    """
+    return select(*(PATIENT_COLUMNS[field] for field in fields if field in PATIENT_COLUMNS))
+
+
+def get_patient_page_select(fields: Sequence[str], after_id: Optional[int] = None, limit: int = 50) -> Select:
+    """
+    Returns a select of a page of patients ordered by ID.
+    :param fields: Fields to return (see split_fields()).
+    :param after_id: ID of the last patient of the previous page, if any.
+    :param limit: Maximum amount of patients on the page.
+    :return: Select statement.
+    """
+    statement = get_patient_select(fields)
+    if after_id is not None:
+        statement = statement.where(Patient.id > after_id)
+
+    return statement.order_by(Patient.id).limit(limit)
+
+
+def get_records_select(record: str) -> Select:
+    """
+    Returns a select of every record of the type provided, joined with its lookup values.
+    :param record: Record name (a key of RECORD_COLUMNS).
+    :return: Select statement, with the patient ID as the first column.
+    """
+    table = RECORD_TABLES[record]
+    statement = select(table.patient_id, *RECORD_COLUMNS[record]).select_from(table)
+
+    if record == 'address':
+        statement = statement.outerjoin(Province).outerjoin(District).outerjoin(Municipality).outerjoin(Village)
+    elif record == 'occupation':
+        statement = statement.outerjoin(Company).outerjoin(OccupationTitle)
+
+    return statement.order_by(table.id)
+
+
+def get_record_select(record: str, patient_ids: Sequence[int]) -> Select:
+    """
+    Returns a select of every record of the type provided belonging to the patients provided.
+    :param record: Record name (a key of RECORD_COLUMNS).
+    :param patient_ids: IDs of the patients to select records of.
+    :return: Select statement, with the patient ID as the first column.
+    """
+    return get_records_select(record).where(RECORD_TABLES[record].patient_id.in_(patient_ids))
+
+
+def get_patient_graph_options() -> Tuple[Load, ...]:
+    """
+    Returns loader options that load patients with every related record and their lookup values in a fixed amount of
+    queries: one for the patients and one per related record type, each joining its lookup tables.
+    :return: Loader options to pass to Query.options() or Select.options().
+    """
+    # The Patient backrefs only exist once the mappers are configured, so the options are built on demand.
+    return (
+        selectinload(Patient.address).options(joinedload(Address.province), joinedload(Address.district),
+                                              joinedload(Address.municipality), joinedload(Address.village)),
+        selectinload(Patient.occupation).options(joinedload(Occupation.company),
+                                                 joinedload(Occupation.occupation_title)),
+        selectinload(Patient.contact_details),
+        selectinload(Patient.diagnosis),
+        selectinload(Patient.measurement),
+    )
+
+
+def load_patient_graphs(session: Session, patient_ids: Optional[Iterable[int]] = None) -> List[Patient]:
+    """
+    Load patients with every related record eagerly (see get_patient_graph_options()).
+    :param session: Session to leverage.
+    :param patient_ids: IDs of the patients to load. Defaults to every patient.
+    :return: List of patients ordered by ID.
+    """
+    statement = select(Patient).options(*get_patient_graph_options()).order_by(Patient.id)
+    if patient_ids is not None:
+        statement = statement.where(Patient.id.in_(list(patient_ids)))
+
+    return session.execute(statement).scalars().all()
@@ -2,16 +2,25 @@
 File containing utilities for database operations.
 """
 
+import re
 from contextlib import contextmanager
 from datetime import date
+from functools import lru_cache
 from typing import Any, Optional, Type, Union
 
+import pandas as pd
 from dateutil import parser
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from zen_cdss.database import base
 
+# Date formats parsed without dateutil, in the order they are tried: ISO dates and the day-first dates the clinics use.
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+CLINIC_DATE_PATTERN = re.compile(r'(\d{2})-(\d{2})-(\d{4})')
+FAST_DATE_FORMATS = ((ISO_DATE_PATTERN, '%Y-%m-%d'), (CLINIC_DATE_PATTERN, '%d-%m-%Y'))  # Pattern and pandas format.
+DATE_CACHE_SIZE = 4096
+
 
 def get_latest_row(session: Session, object_class: Type) -> base.Base:
     """
@@ -74,4 +83,62 @@ def parse_date(date_object: Union[str, date], null_ok: bool = False) -> date:
     if date_object is None and null_ok:
         return date.today()
 
-    return parser.parse(date_object).date()
+    return parse_date_string(date_object)
+
+
+def get_age(date_of_birth: date, on_date: date) -> int:
+    """
+    Returns the age in whole years of someone born on the date provided.
+    :param date_of_birth: Date of birth.
+    :param on_date: Date to get the age on.
+    :return: Age in years.
+    """
+    return on_date.year - date_of_birth.year - ((on_date.month, on_date.day) < (date_of_birth.month, date_of_birth.day))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_string(date_string: str) -> date:
+    """
+    Parse a date string, with fast paths for YYYY-MM-DD and DD-MM-YYYY dates and dateutil for anything else. Results
+    are cached, as imports repeat the same dates (e.g. registration dates) many times.
+    :param date_string: Date string to parse.
+    :return: Parsed date object.
+    """
+    date_string = date_string.strip()
+    if ISO_DATE_PATTERN.fullmatch(date_string):
+        return date.fromisoformat(date_string)
+
+    match = CLINIC_DATE_PATTERN.fullmatch(date_string)
+    if match:
+        day, month, year = match.groups()
+        return date(int(year), int(month), int(day))
+
+    return parser.parse(date_string).date()
+
+
+def parse_date_series(dates: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_date() for a whole column of dates. Every fast format is parsed by pandas in one pass each, only
+    for the strings matching its pattern like parse_date_string() does (pandas formats also accept unpadded days and
+    months), and the remaining unique values go through parse_date_string().
+    :param dates: Series of date strings or date objects. Missing values stay missing.
+    :return: Series of datetime64 values with the same index.
+    """
+    strings = dates.astype('string').str.strip()
+    parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+
+    for pattern, date_format in FAST_DATE_FORMATS:
+        remaining = parsed.isna() & strings.notna()
+        if not remaining.any():
+            return parsed
+
+        remaining &= strings.str.fullmatch(pattern.pattern).fillna(False).astype(bool)
+
+        parsed[remaining] = pd.to_datetime(strings[remaining], format=date_format, errors='coerce')
+
+    remaining = parsed.isna() & strings.notna()
+    if remaining.any():
+        unique_dates = {string: parse_date_string(string) for string in strings[remaining].unique()}
+        parsed[remaining] = pd.to_datetime(strings[remaining].map(unique_dates))
+
+    return parsed
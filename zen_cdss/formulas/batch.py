@@ -0,0 +1,416 @@
+"""
+Vectorized versions of the formulas in vitals.py that evaluate whole cohorts at once.
+
+Every function here mirrors the scalar function of the same name in vitals.py, but takes NumPy arrays (or anything
+array-like such as pandas series or lists) and returns NumPy arrays. The arithmetic is written in the same order as
+the scalar versions and rounding goes through round_like_scalar(), so each element is identical to what the scalar
+function would have returned for that row.
+"""
+
+import inspect
+import math
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from zen_cdss.formulas.vitals import GENDER_ERROR_MESSAGE
+
+ArrayLike = Union[np.ndarray, pd.Series, Sequence[float], float]
+
+# Blood pressure grades by code (see get_blood_pressure_codes()), and the thresholds of vitals.get_blood_pressure() that
+# bucket each pressure. A pressure equal to a threshold falls in the bucket above it.
+BLOOD_PRESSURE_GRADES = ('Low', 'Ideal', 'Normal', 'Grade 1', 'Grade 2', 'Grade 3')
+BLOOD_PRESSURE_LABELS = np.array(BLOOD_PRESSURE_GRADES)
+NORMAL_BLOOD_PRESSURE = BLOOD_PRESSURE_GRADES.index('Normal')
+SYSTOLIC_BP_EDGES = np.array([90, 121, 140, 160, 180])
+DIASTOLIC_BP_EDGES = np.array([60, 81, 90, 100, 110])
+
+# Grade code of each systolic bucket (rows) and diastolic bucket (columns). The highest grade of either pressure wins,
+# then either pressure being low, then both being ideal.
+BLOOD_PRESSURE_GRID = np.array([
+    # <60 <81 <90 <100 <110 >=110
+    [0, 0, 0, 3, 4, 5],  # < 90
+    [0, 1, 2, 3, 4, 5],  # < 121
+    [0, 2, 2, 3, 4, 5],  # < 140
+    [3, 3, 3, 3, 4, 5],  # < 160
+    [4, 4, 4, 4, 4, 5],  # < 180
+    [5, 5, 5, 5, 5, 5],  # >= 180
+], dtype=np.int8)
+
+
+def round_like_scalar(values: ArrayLike, round_digits: int) -> np.ndarray:
+    """
+    Round values the same way Python's built-in round() does.
+
+    NumPy rounds by scaling, rounding, and scaling back, which can disagree with round() when the scaled value lands
+    on (or within floating point error of) a half. Those elements are rare, so they are detected and rounded with the
+    built-in round() one by one while everything else stays vectorized.
+    :param values: Values to round.
+    :param round_digits: Amount of digits to round by.
+    :return: Rounded values as a float array.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, round_digits)
+
+    scaled = values * 10.0 ** round_digits
+    with np.errstate(invalid='ignore'):
+        ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+
+    if ambiguous.any():
+        rounded = np.array(rounded)  # Make sure we own a writable array, even for 0-d inputs.
+        rounded[ambiguous] = [round(float(value), round_digits) for value in values[ambiguous]]
+
+    return rounded
+
+
+def get_gender_masks(gender: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns boolean masks for male and female rows.
+    :param gender: Genders of the patients. Valid genders are M and F.
+    :return: Tuple of male mask and female mask.
+    """
+    gender = np.asarray(gender)
+    male = gender == 'M'
+    female = gender == 'F'
+
+    if not np.all(male | female):
+        raise ValueError(GENDER_ERROR_MESSAGE)
+
+    return male, female
+
+
+def get_visceral_adiposity_term(male: np.ndarray, waist: ArrayLike, tg: ArrayLike, hdl: ArrayLike,
+                                bmi: ArrayLike) -> np.ndarray:
+    """
+    Unrounded visceral adiposity index for gender masks that were already computed.
+    :param male: Boolean mask of male patients. Every other patient is treated as female.
+    :param waist: Waists of the patients in centimeters.
+    :param tg: TG (mg/dL) of the patients.
+    :param hdl: HDL (mg/dL) of the patients.
+    :param bmi: BMI (kg/sqm) of the patients.
+    :return: Unrounded visceral adiposity indexes.
+    """
+    waist_divisor = np.where(male, 39.68, 36.58)
+    bmi_factor = np.where(male, 1.88, 1.89)
+    tg_divisor = np.where(male, 1.03, 0.81)
+    hdl_factor = np.where(male, 1.31, 1.52)
+
+    return np.asarray(waist) / waist_divisor + (bmi_factor * np.asarray(bmi)) * \
+        (np.asarray(tg) / 88.57 / tg_divisor) * (hdl_factor / np.asarray(hdl) / 38.67)
+
+
+def get_lipid_accumulation_term(male: np.ndarray, waist: ArrayLike, tg: ArrayLike) -> np.ndarray:
+    """
+    Unrounded lipid accumulation product for gender masks that were already computed.
+    :param male: Boolean mask of male patients. Every other patient is treated as female.
+    :param waist: Waists (cm) of the patients.
+    :param tg: TG (mg/dL) of the patients.
+    :return: Unrounded lipid accumulation products.
+    """
+    return (np.asarray(waist) - np.where(male, 65, 58)) * (np.asarray(tg) / 88.57)
+
+
+def get_fatty_liver_exponential(log_tg: ArrayLike, log_ggt: ArrayLike, waist: ArrayLike,
+                                bmi: ArrayLike) -> np.ndarray:
+    """
+    Exponential term of the fatty liver index, computed from the natural logs of TG and GGT.
+    :param log_tg: Natural log of TG (mg/dL) of the patients.
+    :param log_ggt: Natural log of GGT (U/L) of the patients.
+    :param waist: Waists of the patients in centimeters.
+    :param bmi: BMI (kg/sqm) of the patients.
+    :return: EXP(0.953*LN(TG) + 0.139*BMI + 0.718*LN(GGT) + 0.053*waist - 15.745)
+    """
+    return np.power(math.e, 0.953 * np.asarray(log_tg) + 0.139 * np.asarray(bmi) + (0.718 * np.asarray(log_ggt)) +
+                    (0.053 * np.asarray(waist)) - 15.745)
+
+
+def get_egfr_term(male: np.ndarray, creatinine: ArrayLike, age: ArrayLike) -> np.ndarray:
+    """
+    Unrounded eGFR (CKD-EPI) for gender masks that were already computed.
+    :param male: Boolean mask of male patients. Every other patient is treated as female.
+    :param creatinine: Creatinine (mg/dl) of the patients.
+    :param age: Ages of the patients.
+    :return: Unrounded eGFR of the patients.
+    """
+    ratio = np.asarray(creatinine) * 88.42 / np.where(male, 80, 62)
+    minimum_exponent = np.where(male, -.411, -.329)
+    gender_factor = np.where(male, 1.0, 1.018)
+
+    return 141 * np.minimum(ratio, 1) ** minimum_exponent * np.maximum(ratio, 1) ** -1.209 * \
+        .993 ** np.asarray(age) * gender_factor
+
+
+def get_homa_ir(insulin: ArrayLike, glucose: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_homa_ir().
+    :param insulin: Insulin (µIU/mL) of the patients.
+    :param glucose: Glucose (mg/dl) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: HOMA-IR (Insulin Resistance) of the patients.
+    """
+    return round_like_scalar(np.asarray(insulin) * np.asarray(glucose) / 405, round_digits)
+
+
+def get_bmi(weight: ArrayLike, height: ArrayLike, round_digits: int = 1) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_bmi().
+    :param weight: Weights of the patients in kilograms.
+    :param height: Heights of the patients in centimeters.
+    :param round_digits: Amount of digits to round by, by default, it'll be 1.
+    :return: BMI of the patients.
+    """
+    height = np.asarray(height)
+    return round_like_scalar(np.asarray(weight) / height / height * 10_000, round_digits)
+
+
+def get_blood_pressure_codes(systolic_bp: ArrayLike, diastolic_bp: ArrayLike) -> np.ndarray:
+    """
+    Grade blood pressures as integer codes, indexes of BLOOD_PRESSURE_GRADES. Each pressure is bucketed by the
+    thresholds of vitals.get_blood_pressure() with a binary search, and the grade of each pair of buckets is looked up
+    in BLOOD_PRESSURE_GRID, instead of evaluating every condition over every row.
+    :param systolic_bp: Systolic blood pressures of the patients.
+    :param diastolic_bp: Diastolic blood pressures of the patients.
+    :return: Array of int8 grade codes, -1 where either pressure is missing (NaN).
+    """
+    systolic_bp = np.asarray(systolic_bp)
+    diastolic_bp = np.asarray(diastolic_bp)
+    codes = BLOOD_PRESSURE_GRID[np.searchsorted(SYSTOLIC_BP_EDGES, systolic_bp, side='right'),
+                                np.searchsorted(DIASTOLIC_BP_EDGES, diastolic_bp, side='right')]
+
+    missing = [np.isnan(values) for values in (systolic_bp, diastolic_bp) if values.dtype.kind == 'f']
+    if missing:
+        codes = np.where(np.logical_or.reduce(missing), np.int8(-1), codes)
+
+    return codes
+
+
+def get_blood_pressure_categorical(systolic_bp: ArrayLike, diastolic_bp: ArrayLike) -> pd.Categorical:
+    """
+    Grade blood pressures as a categorical, ordered like BLOOD_PRESSURE_GRADES (e.g. grades >= 'Grade 1' are
+    hypertensive), which stores one byte per row instead of a string.
+    :param systolic_bp: Systolic blood pressures of the patients.
+    :param diastolic_bp: Diastolic blood pressures of the patients.
+    :return: Categorical of blood pressure grades, missing where either pressure is missing (NaN).
+    """
+    return pd.Categorical.from_codes(get_blood_pressure_codes(systolic_bp, diastolic_bp),
+                                     categories=BLOOD_PRESSURE_GRADES, ordered=True)
+
+
+def get_blood_pressure(systolic_bp: ArrayLike, diastolic_bp: ArrayLike) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_blood_pressure(). Prefer get_blood_pressure_codes() or
+    get_blood_pressure_categorical() for large arrays, which avoid building an array of strings.
+    :param systolic_bp: Systolic blood pressures of the patients.
+    :param diastolic_bp: Diastolic blood pressures of the patients.
+    :return: Array of blood pressure grades.
+    """
+    codes = get_blood_pressure_codes(systolic_bp, diastolic_bp)
+    return BLOOD_PRESSURE_LABELS[np.where(codes < 0, NORMAL_BLOOD_PRESSURE, codes)]  # vitals.py grades NaN as Normal.
+
+
+def get_maximum_heart_rate(age: ArrayLike) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_maximum_heart_rate().
+    :param age: Ages of the patients.
+    :return: Maximum heart rates appropriate for the ages provided.
+    """
+    return 220 - np.asarray(age)
+
+
+def get_target_heart_rate(maximum_heart_rate: ArrayLike) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_target_heart_rate().
+    :param maximum_heart_rate: Maximum heart rates during exercise of the patients.
+    :return: Array of target heart rate strings.
+    """
+    maximum_heart_rate = np.asarray(maximum_heart_rate)
+    lower = (maximum_heart_rate * 0.5).astype(str)
+    upper = np.floor(maximum_heart_rate * 0.85).astype(np.int64).astype(str)
+    return np.char.add(np.char.add(lower, ' - '), upper)
+
+
+def get_tg_hdl_ratio(tg: ArrayLike, hdl: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_tg_hdl_ratio().
+    :param tg: TG (mg/dL) of the patients.
+    :param hdl: HDL (mg/dL) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: TG / HDL ratios.
+    """
+    return round_like_scalar(np.asarray(tg) / np.asarray(hdl), round_digits)
+
+
+def get_triglyceride_glucose_index(tg: ArrayLike, glucose: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_triglyceride_glucose_index().
+    :param tg: TG (mg/dL) of the patients.
+    :param glucose: Glucose (mg/dl) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Triglyceride glucose indexes (TyG).
+    """
+    return round_like_scalar(np.log(np.asarray(tg) * np.asarray(glucose)) / 2, round_digits)
+
+
+def get_atherogenic_index_of_plasma(tg: ArrayLike, hdl: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_atherogenic_index_of_plasma().
+    :param tg: TG (mg/dL) of the patients.
+    :param hdl: HDL (mg/dL) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Atherogenic indexes of plasma.
+    """
+    return round_like_scalar(np.log10((np.asarray(tg) / 88.57) / (np.asarray(hdl) / 38.67)), round_digits)
+
+
+def get_body_adiposity_index(waist: ArrayLike, height: ArrayLike, round_digits: int = 0) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_body_adiposity_index().
+    :param waist: Waists (cm) of the patients.
+    :param height: Heights (cm) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 0.
+    :return: Body adiposity indexes.
+    """
+    return round_like_scalar(np.asarray(waist) / (np.asarray(height) / 100) ** 1.5 - 18, round_digits)
+
+
+def get_visceral_adiposity_index(gender: ArrayLike, waist: ArrayLike, tg: ArrayLike, hdl: ArrayLike, bmi: ArrayLike,
+                                 round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_visceral_adiposity_index(). Gender specific coefficients are picked with masks.
+    :param gender: Genders of the patients.
+    :param waist: Waists of the patients in centimeters.
+    :param tg: TG (mg/dL) of the patients.
+    :param hdl: HDL (mg/dL) of the patients.
+    :param bmi: BMI (kg/sqm) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Visceral adiposity indexes.
+    """
+    male, _ = get_gender_masks(gender)
+    return round_like_scalar(get_visceral_adiposity_term(male, waist, tg, hdl, bmi), round_digits)
+
+
+def get_lipid_accumulation_product(gender: ArrayLike, waist: ArrayLike, tg: ArrayLike,
+                                   round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_lipid_accumulation_product(). Gender specific offsets are picked with masks.
+    :param gender: Genders of the patients.
+    :param waist: Waists (cm) of the patients.
+    :param tg: TG (mg/dL) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Lipid accumulation products.
+    """
+    male, _ = get_gender_masks(gender)
+    return round_like_scalar(get_lipid_accumulation_term(male, waist, tg), round_digits)
+
+
+def get_fatty_liver_index(tg: ArrayLike, ggt: ArrayLike, waist: ArrayLike, bmi: ArrayLike,
+                          round_digits: int = 0) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_fatty_liver_index().
+    :param tg: TG (mg/dL) of the patients.
+    :param ggt: GGT (U/L) of the patients.
+    :param waist: Waists of the patients in centimeters.
+    :param bmi: BMI (kg/sqm) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 0.
+    :return: Fatty liver indexes.
+    """
+    exponential = get_fatty_liver_exponential(np.log(tg), np.log(ggt), waist, bmi)
+    return round_like_scalar(exponential / (1 + exponential) * 100, round_digits)
+
+
+def get_waist_height_ratio(waist: ArrayLike, height: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_waist_height_ratio().
+    :param waist: Waists of the patients.
+    :param height: Heights of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Waist/height ratios.
+    """
+    return round_like_scalar(np.asarray(waist) / np.asarray(height), round_digits)
+
+
+def get_alt_ast_ratio(alt: ArrayLike, ast: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_alt_ast_ratio().
+    :param alt: ALT (SGPT) (U/L) of the patients.
+    :param ast: AST (SGOT) (U/L) of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: ALT/AST ratios.
+    """
+    return round_like_scalar(np.asarray(alt) / np.asarray(ast), round_digits)
+
+
+def get_egfr(creatinine: ArrayLike, gender: ArrayLike, age: ArrayLike, round_digits: int = 0) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_egfr(). Gender specific coefficients are picked with masks.
+    :param creatinine: Creatinine (mg/dl) of the patients.
+    :param gender: Genders of the patients.
+    :param age: Ages of the patients.
+    :param round_digits: Amount of digits to round by, by default, it'll be 0.
+    :return: eGFR (CKD-EPI) of the patients.
+    """
+    male, _ = get_gender_masks(gender)
+    return round_like_scalar(get_egfr_term(male, creatinine, age), round_digits)
+
+
+def get_estimated_average_glucose(hba1c: ArrayLike, round_digits: int = 2) -> np.ndarray:
+    """
+    Vectorized version of vitals.get_estimated_average_glucose().
+    :param hba1c: HbA1c percentages.
+    :param round_digits: Amount of digits to round by, by default, it'll be 2.
+    :return: Estimated average glucose values.
+    """
+    return round_like_scalar(28.7 * np.asarray(hba1c) - 46.7, round_digits)
+
+
+FORMULAS: Dict[str, Callable[..., np.ndarray]] = {
+    'homa_ir': get_homa_ir,
+    'bmi': get_bmi,
+    'blood_pressure': get_blood_pressure,
+    'maximum_heart_rate': get_maximum_heart_rate,
+    'target_heart_rate': get_target_heart_rate,
+    'tg_hdl_ratio': get_tg_hdl_ratio,
+    'triglyceride_glucose_index': get_triglyceride_glucose_index,
+    'atherogenic_index_of_plasma': get_atherogenic_index_of_plasma,
+    'body_adiposity_index': get_body_adiposity_index,
+    'visceral_adiposity_index': get_visceral_adiposity_index,
+    'lipid_accumulation_product': get_lipid_accumulation_product,
+    'fatty_liver_index': get_fatty_liver_index,
+    'waist_height_ratio': get_waist_height_ratio,
+    'alt_ast_ratio': get_alt_ast_ratio,
+    'egfr': get_egfr,
+    'estimated_average_glucose': get_estimated_average_glucose,
+}
+
+
+def get_formula_inputs(formula: Callable[..., np.ndarray]) -> Tuple[str, ...]:
+    """
+    Returns the names of the inputs a formula needs, excluding optional arguments like round_digits.
+    :param formula: Formula to inspect.
+    :return: Tuple of input names.
+    """
+    parameters = inspect.signature(formula).parameters.values()
+    return tuple(parameter.name for parameter in parameters if parameter.default is inspect.Parameter.empty)
+
+
+def evaluate_frame(frame: pd.DataFrame, formulas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Evaluate formulas over a dataframe whose column names match the formula argument names (e.g. weight, height,
+    gender, tg, etc.).
+    :param frame: Dataframe containing the inputs of the formulas.
+    :param formulas: Names of the formulas to evaluate (keys of FORMULAS). If not provided, every formula whose inputs
+     are all present in the dataframe is evaluated.
+    :return: Dataframe with one column per formula evaluated, sharing the index of the dataframe provided.
+    """
+    if formulas is None:
+        formulas = [name for name, formula in FORMULAS.items()
+                    if all(argument in frame.columns for argument in get_formula_inputs(formula))]
+
+    results = {}
+    for name in formulas:
+        formula = FORMULAS[name]
+        arguments = {argument: frame[argument].to_numpy() for argument in get_formula_inputs(formula)}
+        results[name] = formula(**arguments)
+
+    return pd.DataFrame(results, index=frame.index)
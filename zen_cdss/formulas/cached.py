@@ -0,0 +1,104 @@
+"""
+Memoized versions of the scalar vitals formulas, for hot paths that evaluate one patient at a time (e.g. the API).
+
+Formulas that do real work per call (float powers, string formatting) and whose inputs repeat are wrapped in bounded
+LRU caches, so repeated inputs are answered with a dictionary lookup instead of recomputing the formula. Measured inputs
+repeat a lot: ages are integers and lab values are recorded to one or two decimals. The formulas with small domains
+(target heart rate, estimated average glucose) can also be precomputed over every realistic input with warm_caches(),
+which turns their caches into lookup tables.
+
+The other formulas are a comparison or a division and a round(), which is faster than hashing their arguments, so they
+are the plain functions of vitals.py (see benchmarks/cached_formulas.py). Every formula of vitals.py can be imported
+from here either way. Results are the same as vitals.py. Inputs are cached by type as well as value, so e.g.
+get_target_heart_rate(180.0) is cached apart from get_target_heart_rate(180).
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional
+
+from zen_cdss.formulas import vitals
+
+CACHE_SIZE = 4096  # Per formula.
+EGFR_CACHE_SIZE = 65_536  # Creatinine to two decimals, for both genders and every age.
+
+# Input domains precomputed by warm_caches().
+AGES = range(0, 121)
+HBA1C_PERCENTAGES = tuple(tenths / 10 for tenths in range(30, 201))  # 3.0% to 20.0%, as recorded to one decimal.
+
+get_body_adiposity_index = lru_cache(maxsize=CACHE_SIZE, typed=True)(vitals.get_body_adiposity_index)
+get_egfr = lru_cache(maxsize=EGFR_CACHE_SIZE, typed=True)(vitals.get_egfr)
+get_estimated_average_glucose = lru_cache(maxsize=CACHE_SIZE, typed=True)(vitals.get_estimated_average_glucose)
+get_target_heart_rate = lru_cache(maxsize=CACHE_SIZE, typed=True)(vitals.get_target_heart_rate)
+get_waist_height_ratio = lru_cache(maxsize=CACHE_SIZE, typed=True)(vitals.get_waist_height_ratio)
+
+# Cheaper to compute than to look up.
+get_alt_ast_ratio = vitals.get_alt_ast_ratio
+get_atherogenic_index_of_plasma = vitals.get_atherogenic_index_of_plasma
+get_blood_pressure = vitals.get_blood_pressure
+get_bmi = vitals.get_bmi
+get_fatty_liver_index = vitals.get_fatty_liver_index
+get_homa_ir = vitals.get_homa_ir
+get_lipid_accumulation_product = vitals.get_lipid_accumulation_product
+get_maximum_heart_rate = vitals.get_maximum_heart_rate
+get_tg_hdl_ratio = vitals.get_tg_hdl_ratio
+get_triglyceride_glucose_index = vitals.get_triglyceride_glucose_index
+get_visceral_adiposity_index = vitals.get_visceral_adiposity_index
+
+CACHED_FORMULAS: Dict[str, Callable] = {
+    'target_heart_rate': get_target_heart_rate,
+    'body_adiposity_index': get_body_adiposity_index,
+    'waist_height_ratio': get_waist_height_ratio,
+    'egfr': get_egfr,
+    'estimated_average_glucose': get_estimated_average_glucose,
+}
+
+
+class CacheStats(NamedTuple):
+    """
+    Statistics of the cache of a formula.
+    """
+    hits: int
+    misses: int
+    size: int
+    max_size: Optional[int]
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of calls answered from the cache, between 0 and 1.
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def get_cache_stats() -> Dict[str, CacheStats]:
+    """
+    Returns the statistics of the cache of every memoized formula.
+    :return: Dictionary of vital names (see CACHED_FORMULAS) to cache statistics.
+    """
+    stats = {}
+    for name, formula in CACHED_FORMULAS.items():
+        info = formula.cache_info()
+        stats[name] = CacheStats(hits=info.hits, misses=info.misses, size=info.currsize, max_size=info.maxsize)
+
+    return stats
+
+
+def clear_caches():
+    """
+    Empty the cache of every memoized formula and reset their statistics.
+    """
+    for formula in CACHED_FORMULAS.values():
+        formula.cache_clear()
+
+
+def warm_caches():
+    """
+    Precompute the formulas with small domains over every value of AGES and HBA1C_PERCENTAGES, so those inputs are
+    always answered from the cache. Precomputed values count as misses in the cache statistics.
+    """
+    for age in AGES:
+        get_target_heart_rate(get_maximum_heart_rate(age))
+
+    for hba1c in HBA1C_PERCENTAGES:
+        get_estimated_average_glucose(hba1c)
@@ -0,0 +1,160 @@
+"""
+Full vitals panel evaluator.
+
+Computes every derived vital for one patient or a batch of patients in a single dependency-ordered pass. Terms that
+several vitals share (gender masks, BMI, the maximum heart rate, and the fatty liver index exponential) are computed
+once and reused instead of being recomputed by each formula. Every value is identical to what the corresponding
+function in vitals.py returns.
+"""
+
+import hashlib
+from typing import Dict, Mapping, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from zen_cdss.formulas import batch
+from zen_cdss.formulas.batch import ArrayLike
+from zen_cdss.formulas.vitals import FORMULA_VERSIONS
+
+PANEL_INPUTS = ('gender', 'age', 'weight', 'height', 'waist', 'systolic_bp', 'diastolic_bp', 'insulin', 'glucose',
+                'tg', 'hdl', 'ggt', 'alt', 'ast', 'creatinine', 'hba1c')
+
+
+class VitalsPanel(NamedTuple):
+    """
+    Derived vitals of a single patient. Vitals whose inputs were not provided are None.
+    """
+    bmi: Optional[float] = None
+    blood_pressure: Optional[str] = None
+    maximum_heart_rate: Optional[int] = None
+    target_heart_rate: Optional[str] = None
+    homa_ir: Optional[float] = None
+    tg_hdl_ratio: Optional[float] = None
+    triglyceride_glucose_index: Optional[float] = None
+    atherogenic_index_of_plasma: Optional[float] = None
+    body_adiposity_index: Optional[float] = None
+    visceral_adiposity_index: Optional[float] = None
+    lipid_accumulation_product: Optional[float] = None
+    fatty_liver_index: Optional[float] = None
+    waist_height_ratio: Optional[float] = None
+    alt_ast_ratio: Optional[float] = None
+    egfr: Optional[float] = None
+    estimated_average_glucose: Optional[float] = None
+
+
+def get_panel_version(versions: Optional[Mapping[str, int]] = None) -> str:
+    """
+    Returns a signature of the versions of every formula of the panel. It changes whenever any formula's version is
+    bumped or a vital is added, so results stored with another signature are stale.
+    :param versions: Version of each formula, keyed by vital name. Defaults to FORMULA_VERSIONS.
+    :return: 16 character signature.
+    """
+    versions = FORMULA_VERSIONS if versions is None else versions
+    signature = ','.join(f'{name}:{versions[name]}' for name in VitalsPanel._fields)
+    return hashlib.sha1(signature.encode()).hexdigest()[:16]
+
+
+def evaluate_panel(inputs: Mapping[str, Optional[ArrayLike]]) -> Dict[str, np.ndarray]:
+    """
+    Evaluate every vital whose inputs are available in one pass.
+    :param inputs: Mapping of input names (see PANEL_INPUTS) to arrays of values. Missing or None inputs are skipped
+     along with every vital that depends on them.
+    :return: Dictionary of vital names to arrays, ordered like the fields of VitalsPanel.
+    """
+    # pylint: disable=too-many-branches
+    values = {name: np.asarray(inputs[name]) for name in PANEL_INPUTS if inputs.get(name) is not None}
+
+    def available(*names: str) -> bool:
+        return all(name in values for name in names)
+
+    results = {}
+
+    # Shared terms are computed first so every dependent vital below reuses them.
+    male = batch.get_gender_masks(values['gender'])[0] if available('gender') else None
+    if available('weight', 'height'):
+        results['bmi'] = batch.get_bmi(values['weight'], values['height'])
+    if available('age'):
+        results['maximum_heart_rate'] = batch.get_maximum_heart_rate(values['age'])
+
+    if available('systolic_bp', 'diastolic_bp'):
+        results['blood_pressure'] = batch.get_blood_pressure(values['systolic_bp'], values['diastolic_bp'])
+    if 'maximum_heart_rate' in results:
+        results['target_heart_rate'] = batch.get_target_heart_rate(results['maximum_heart_rate'])
+    if available('insulin', 'glucose'):
+        results['homa_ir'] = batch.get_homa_ir(values['insulin'], values['glucose'])
+    if available('tg', 'hdl'):
+        results['tg_hdl_ratio'] = batch.get_tg_hdl_ratio(values['tg'], values['hdl'])
+        results['atherogenic_index_of_plasma'] = batch.get_atherogenic_index_of_plasma(values['tg'], values['hdl'])
+    if available('tg', 'glucose'):
+        results['triglyceride_glucose_index'] = batch.get_triglyceride_glucose_index(values['tg'], values['glucose'])
+    if available('waist', 'height'):
+        results['body_adiposity_index'] = batch.get_body_adiposity_index(values['waist'], values['height'])
+        results['waist_height_ratio'] = batch.get_waist_height_ratio(values['waist'], values['height'])
+
+    if male is not None and available('waist', 'tg', 'hdl') and 'bmi' in results:
+        vai = batch.get_visceral_adiposity_term(male, values['waist'], values['tg'], values['hdl'], results['bmi'])
+        results['visceral_adiposity_index'] = batch.round_like_scalar(vai, 2)
+    if male is not None and available('waist', 'tg'):
+        lap = batch.get_lipid_accumulation_term(male, values['waist'], values['tg'])
+        results['lipid_accumulation_product'] = batch.round_like_scalar(lap, 2)
+
+    if available('tg', 'ggt', 'waist') and 'bmi' in results:
+        exponential = batch.get_fatty_liver_exponential(np.log(values['tg']), np.log(values['ggt']), values['waist'],
+                                                        results['bmi'])
+        results['fatty_liver_index'] = batch.round_like_scalar(exponential / (1 + exponential) * 100, 0)
+
+    if available('alt', 'ast'):
+        results['alt_ast_ratio'] = batch.get_alt_ast_ratio(values['alt'], values['ast'])
+    if male is not None and available('creatinine', 'age'):
+        results['egfr'] = batch.round_like_scalar(batch.get_egfr_term(male, values['creatinine'], values['age']), 0)
+    if available('hba1c'):
+        results['estimated_average_glucose'] = batch.get_estimated_average_glucose(values['hba1c'])
+
+    return {name: results[name] for name in VitalsPanel._fields if name in results}
+
+
+def evaluate_panel_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Evaluate the vitals panel over a dataframe whose column names match PANEL_INPUTS.
+    :param frame: Dataframe containing the inputs of the panel.
+    :return: Dataframe with one column per vital evaluated, sharing the index of the dataframe provided.
+    """
+    inputs = {name: frame[name].to_numpy() for name in PANEL_INPUTS if name in frame.columns}
+    return pd.DataFrame(evaluate_panel(inputs), index=frame.index)
+
+
+def evaluate_partial_panel_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Evaluate the vitals panel over a dataframe whose inputs may be missing for some rows (e.g. patients without a
+    measurement). Rows are grouped by which inputs they have and each group is evaluated in one pass, so every vital is
+    only evaluated for the rows that have all of its inputs, and is missing for the others.
+    :param frame: Dataframe containing the inputs of the panel, with missing values as None or NaN.
+    :return: Dataframe with one column per vital evaluated for any row, sharing the index of the dataframe provided.
+    """
+    names = [name for name in PANEL_INPUTS if name in frame.columns]
+    present = frame[names].notna().to_numpy()
+    patterns = present @ (1 << np.arange(len(names)))  # Bit mask of the inputs each row has.
+
+    groups = []
+    for pattern in np.unique(patterns):
+        rows = patterns == pattern
+        inputs = {name: frame[name].to_numpy()[rows] for position, name in enumerate(names) if pattern >> position & 1}
+        groups.append(pd.DataFrame(evaluate_panel(inputs), index=frame.index[rows]))
+
+    results = pd.concat(groups) if groups else pd.DataFrame(index=frame.index)
+    return results.reindex(index=frame.index, columns=[name for name in VitalsPanel._fields if name in results])
+
+
+def get_vitals_panel(**inputs: Optional[Union[float, str]]) -> VitalsPanel:
+    """
+    Evaluate the vitals panel for a single patient.
+    :param inputs: Scalar inputs of the patient keyed by the names in PANEL_INPUTS. Inputs that are None are skipped.
+    :return: Vitals panel of the patient.
+    """
+    unknown_inputs = set(inputs) - set(PANEL_INPUTS)
+    if unknown_inputs:
+        raise TypeError(f'Unknown panel inputs provided: {sorted(unknown_inputs)}')
+
+    results = evaluate_panel({name: np.atleast_1d(value) for name, value in inputs.items() if value is not None})
+    return VitalsPanel(**{name: value[0].item() for name, value in results.items()})
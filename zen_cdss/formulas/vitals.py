@@ -6,6 +6,27 @@ import math
 
 GENDER_ERROR_MESSAGE = "Unknown type of gender provided. Valid genders are M and F for male and female respectively."
 
+# Version of each formula below (and of its counterpart in batch.py). Bump the version of a formula whenever its result
+# changes (e.g. a coefficient is fixed), so stored results are recomputed (see tools/recompute_vitals.py).
+FORMULA_VERSIONS = {
+    'bmi': 1,
+    'blood_pressure': 1,
+    'maximum_heart_rate': 1,
+    'target_heart_rate': 1,
+    'homa_ir': 1,
+    'tg_hdl_ratio': 1,
+    'triglyceride_glucose_index': 1,
+    'atherogenic_index_of_plasma': 1,
+    'body_adiposity_index': 1,
+    'visceral_adiposity_index': 1,
+    'lipid_accumulation_product': 1,
+    'fatty_liver_index': 1,
+    'waist_height_ratio': 1,
+    'alt_ast_ratio': 1,
+    'egfr': 1,
+    'estimated_average_glucose': 1,
+}
+
 
 def get_homa_ir(insulin: float, glucose: float, round_digits: int = 2) -> float:
     """
@@ -248,11 +269,8 @@ def get_fatty_liver_index(tg: float, ggt: float, waist: float, bmi: float, round
         =EXP(SUM((0.953*LN(C19))+(0.139*K9)+(0.718*LN(C26))+(0.053*C12)-15.745))
         / (1+EXP(SUM((0.953*LN(C19)) + (0.139*K9)+(0.718*LN(C26))+(0.053*C12)-15.745))) * 100
     """
-    initial_calculation = math.e ** (0.953 * math.log(tg) + 0.139 * bmi + (0.718 * math.log(ggt)) +
-                                     (0.053 * waist) - 15.745)
-    second_calculation = 1 + math.e ** (0.953 * math.log(tg) + (0.139 * bmi) + (0.718 * math.log(ggt)) + (0.053 * waist)
-                                        - 15.745)
-    return round(initial_calculation / second_calculation * 100, round_digits)
+    exponential = math.e ** (0.953 * math.log(tg) + 0.139 * bmi + (0.718 * math.log(ggt)) + (0.053 * waist) - 15.745)
+    return round(exponential / (1 + exponential) * 100, round_digits)
 
 
 def get_waist_height_ratio(waist: int, height: int, round_digits: int = 2) -> float:
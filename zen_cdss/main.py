@@ -1,13 +1,69 @@
 """
 Main file for FastAPI.
 """
-from typing import Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from zen_cdss.database.adrs import get_drug_reactions_select, get_reaction_drugs_select
+from zen_cdss.database.async_base import async_session_scope
+from zen_cdss.database.async_insertions import (add_address, add_contact_details, add_diagnosis, add_occupation,
+                                                add_patient)
+from zen_cdss.database.migrations import migrate
+from zen_cdss.database.models import Patient
+from zen_cdss.database.queries import (FIELDS, RECORD_COLUMNS, get_patient_page_select, get_patient_select,
+                                       get_record_select, split_fields)
+from zen_cdss.schemas import DrugReactionRecord, PatientCreate, PatientPage, PatientRecord, ReactionDrugRecord, to_dict
+
+MAX_PAGE_SIZE = 500
 
 app = FastAPI()
 
 
+@app.on_event("startup")
+def migrate_database():
+    """
+    Bring the configured database up to date with the declared models before serving requests, as lookup upserts rely
+    on the unique indexes of the lookup tables (see migrations.py).
+    """
+    migrate()
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency providing a transactional async session to an endpoint.
+    :return: Yield async session object.
+    """
+    async with async_session_scope() as session:
+        yield session
+
+
+async def get_patients(session: AsyncSession, statement: Select, fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Read patients, with one query for the patients and one per related record type requested.
+    :param session: Async session to leverage.
+    :param statement: Select of the patients (see queries.py).
+    :param fields: Fields to return (see split_fields()).
+    :return: List of patient dictionaries.
+    """
+    result = await session.execute(statement)
+    patients = {row.id: dict(row._mapping) for row in result}  # pylint: disable=protected-access
+
+    for record in (field for field in fields if field in RECORD_COLUMNS):
+        for patient in patients.values():
+            patient[record] = []
+
+        if patients:
+            result = await session.execute(get_record_select(record, list(patients)))
+            for patient_id, *values in result:
+                patients[patient_id][record].append({column.name: value for column, value in
+                                                     zip(RECORD_COLUMNS[record], values)})
+
+    return list(patients.values())
+
+
 @app.get("/")
 async def root() -> Dict[str, str]:
     """
@@ -15,3 +71,98 @@ async def root() -> Dict[str, str]:
     :return: JSON dictionary.
     """
     return {"message": "Hello World"}
+
+
+@app.post("/patients", response_model=PatientRecord, status_code=201)
+async def create_patient(patient_create: PatientCreate, session: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
+    """
+    Create a patient with their related records.
+    :param patient_create: Patient to create.
+    :param session: Async session to leverage.
+    :return: Created patient record.
+    """
+    patient_dict = to_dict(patient_create)
+    try:
+        patient = await add_patient(patient_dict, session)
+    except ValueError as error:  # Invalid gender.
+        raise HTTPException(status_code=422, detail=str(error)) from error
+
+    for address in patient_dict['address']:
+        await add_address(address, patient, session)
+    for occupation in patient_dict['occupation']:
+        await add_occupation({**occupation, 'occupation_description': occupation['description']}, patient, session)
+    for contact_details in patient_dict['contact_details']:
+        await add_contact_details({**contact_details, 'phone': contact_details['phone_number']}, patient, session)
+    for diagnosis in patient_dict['diagnosis']:
+        await add_diagnosis({**diagnosis, 'diagnosis_advent': diagnosis['advent']}, patient, session)
+
+    await session.commit()
+    return await get_patient(patient.id, session)
+
+
+@app.get("/patients/{patient_id}", response_model=PatientRecord)
+async def get_patient(patient_id: int, session: AsyncSession = Depends(get_session)) -> Dict[str, Any]:
+    """
+    Get a patient with every related record.
+    :param patient_id: ID of the patient.
+    :param session: Async session to leverage.
+    :return: Patient record.
+    """
+    fields = split_fields()
+    patients = await get_patients(session, get_patient_select(fields).where(Patient.id == patient_id), fields)
+    if not patients:
+        raise HTTPException(status_code=404, detail=f'Patient {patient_id} not found.')
+
+    return patients[0]
+
+
+@app.get("/patients", response_model=PatientPage)
+async def list_patients(
+        after_id: Optional[int] = Query(None, description='ID of the last patient of the previous page.'),
+        limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+        fields: Optional[str] = Query(None, description='Comma separated fields to return, e.g. first_name,address. '
+                                                        f'Any of: {", ".join(FIELDS)}.'),
+        session: AsyncSession = Depends(get_session)
+) -> Dict[str, Any]:
+    """
+    List patients ordered by ID, a page at a time.
+    :param after_id: ID of the last patient of the previous page (next_after_id of the previous response).
+    :param limit: Maximum amount of patients on the page.
+    :param fields: Comma separated fields to return. The patient ID is always returned. Defaults to every field.
+    :param session: Async session to leverage.
+    :return: Page of patients and the after_id of the next page (null on the last page).
+    """
+    try:
+        selected_fields = split_fields(None if fields is None else [field.strip() for field in fields.split(',')])
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+
+    patients = await get_patients(session, get_patient_page_select(selected_fields, after_id, limit), selected_fields)
+    return {
+        'patients': patients,
+        'next_after_id': patients[-1]['id'] if len(patients) == limit else None,
+    }
+
+
+@app.get("/drugs/{drug}/reactions", response_model=List[DrugReactionRecord])
+async def list_drug_reactions(drug: str, session: AsyncSession = Depends(get_session)) -> List[Dict[str, Any]]:
+    """
+    List the adverse reactions reported for a drug, most reported first.
+    :param drug: Drug name, in any case.
+    :param session: Async session to leverage.
+    :return: System organ classes, reactions, and report counts. Empty if no reactions were loaded for the drug.
+    """
+    result = await session.execute(get_drug_reactions_select(drug))
+    return [dict(row._mapping) for row in result]  # pylint: disable=protected-access
+
+
+@app.get("/reactions/{reaction}/drugs", response_model=List[ReactionDrugRecord])
+async def list_reaction_drugs(reaction: str, session: AsyncSession = Depends(get_session)) -> List[Dict[str, Any]]:
+    """
+    List the drugs an adverse reaction is reported for, most reported first.
+    :param reaction: Reaction name, e.g. Rash.
+    :param session: Async session to leverage.
+    :return: Drugs and report counts. Empty if the reaction was not loaded for any drug.
+    """
+    result = await session.execute(get_reaction_drugs_select(reaction))
+    return [dict(row._mapping) for row in result]  # pylint: disable=protected-access
@@ -0,0 +1,104 @@
+"""
+Request and response schemas of the FastAPI app.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel  # pylint: disable=no-name-in-module
+
+
+class AddressSchema(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Address of a patient.
+    """
+    address: str
+    province: Optional[str] = None
+    district: Optional[str] = None
+    municipality: Optional[str] = None
+    village: Optional[str] = None
+
+
+class OccupationSchema(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Occupation of a patient.
+    """
+    description: str
+    company: Optional[str] = None
+    occupation_title: Optional[str] = None
+
+
+class ContactDetailsSchema(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Contact details of a patient.
+    """
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+
+
+class DiagnosisSchema(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Diagnosis of a patient.
+    """
+    diagnosis: str
+    advent: Optional[date] = None
+
+
+class PatientCreate(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Patient to create, with their related records.
+    """
+    first_name: str
+    last_name: str
+    gender: str
+    date_of_birth: date
+    registration_date: Optional[date] = None
+    referred_by: Optional[str] = None
+    accompanied_by: Optional[str] = None
+    family_diabetics: Optional[str] = None
+    address: List[AddressSchema] = []
+    occupation: List[OccupationSchema] = []
+    contact_details: List[ContactDetailsSchema] = []
+    diagnosis: List[DiagnosisSchema] = []
+
+
+class PatientRecord(PatientCreate):  # pylint: disable=too-few-public-methods
+    """
+    Patient with every related record.
+    """
+    id: int
+    registration_date: date
+
+
+class PatientPage(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Page of patients holding only the fields requested. Pass next_after_id as after_id to get the next page.
+    """
+    patients: List[Dict[str, Any]]
+    next_after_id: Optional[int] = None
+
+
+def to_dict(model: BaseModel) -> Dict[str, Any]:
+    """
+    Returns the fields of the model provided as a dictionary, with both pydantic 1 and 2.
+    :param model: Model to convert.
+    :return: Dictionary of field names to values.
+    """
+    return model.model_dump() if hasattr(model, 'model_dump') else model.dict()
+
+
+class DrugReactionRecord(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Adverse reaction reported for a drug.
+    """
+    system_organ_class: str
+    reaction: str
+    report_count: Optional[int] = None
+
+
+class ReactionDrugRecord(BaseModel):  # pylint: disable=too-few-public-methods
+    """
+    Drug an adverse reaction is reported for.
+    """
+    drug: str
+    report_count: Optional[int] = None
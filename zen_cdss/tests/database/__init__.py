@@ -1,16 +1,76 @@
 """
 Database testing initialization.
+
+Tests run against the PostgreSQL database at ZEN_CDSS_TEST_DB_URL (a throwaway local database by default) if it is
+reachable, and fall back to a SQLite file otherwise.
 """
 
 import os
+from datetime import date
+from typing import Any, Callable, Dict
 
-from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from zen_cdss import ROOT_PATH
+from zen_cdss.database.async_base import get_async_url
+from zen_cdss.database.base import Base, create_db_engine
+from zen_cdss.database.bulk import bulk_add_patients
 
 TEST_DB_NAME = "zen_cdss_test.db"
 TEST_DB_PATH = os.path.join(ROOT_PATH, TEST_DB_NAME)
+TEST_DB_URL = os.getenv('ZEN_CDSS_TEST_DB_URL', 'postgresql://localhost/zen_cdss_test')
+
+
+def get_test_engine() -> Engine:
+    """
+    Returns an engine for the PostgreSQL test database if it is available, otherwise for a SQLite test database.
+    :return: Engine object.
+    """
+    try:
+        postgres_engine = create_db_engine(TEST_DB_URL, connect_args={'connect_timeout': 1})
+        with postgres_engine.connect():
+            return postgres_engine
+    except (ImportError, SQLAlchemyError):  # The driver is not installed or the server is not reachable.
+        return create_db_engine(f'sqlite:///{TEST_DB_PATH}')
+
+
+def drop_test_database():
+    """
+    Drop everything created in the test database.
+    """
+    if TEST_ENGINE.dialect.name == 'sqlite':
+        TEST_ENGINE.dispose()
+        os.remove(TEST_DB_PATH)
+    else:
+        Base.metadata.drop_all(TEST_ENGINE)
 
-TEST_ENGINE = create_engine(f'sqlite:///{TEST_DB_PATH}')
+
+TEST_ENGINE = get_test_engine()
 TEST_SESSION = sessionmaker(bind=TEST_ENGINE)
+
+# Async connections are bound to the event loop they were opened in and tests run each in their own loop, so they are
+# not pooled.
+ASYNC_TEST_ENGINE = create_async_engine(get_async_url(TEST_ENGINE.url.render_as_string(hide_password=False)),
+                                        poolclass=NullPool)
+ASYNC_TEST_SESSION = sessionmaker(bind=ASYNC_TEST_ENGINE, class_=AsyncSession, expire_on_commit=False)
+
+
+def add_test_patients(count: int, get_details: Callable[[int], Dict[str, Any]]):
+    """
+    Create the test tables and bulk add patients to them. Patient i is named "First i", is male if i is odd, and was
+    born on June 15th of 1950 + i.
+    :param count: Amount of patients to add.
+    :param get_details: Function returning the other details of patient i (address, measurement, etc.).
+    """
+    Base.metadata.create_all(TEST_ENGINE)
+    bulk_add_patients(({
+        'first_name': f'First {index}',
+        'last_name': 'Last',
+        'gender': 'M' if index % 2 else 'F',
+        'date_of_birth': date(1950 + index, 6, 15),
+        **get_details(index),
+    } for index in range(count)), session_object=TEST_SESSION)
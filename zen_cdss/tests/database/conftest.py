@@ -0,0 +1,23 @@
+"""
+Fixtures shared by the database tests.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from zen_cdss.tests.database import TEST_ENGINE
+
+
+@pytest.fixture(name='statements')
+def fixture_statements():
+    """
+    Yields a list that collects every statement executed against the test engine.
+    """
+    statements = []
+
+    def collect(*args):
+        statements.append(args[2])
+
+    event.listen(TEST_ENGINE, 'before_cursor_execute', collect)
+    yield statements
+    event.remove(TEST_ENGINE, 'before_cursor_execute', collect)
@@ -0,0 +1,91 @@
+"""
+Testing the ADR knowledge base.
+"""
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import func, select
+
+import zen_cdss.database.base as backend_base
+from zen_cdss import ROOT_PATH
+from zen_cdss.database.adrs import get_drug_reactions_select, get_reaction_drugs_select, load_adrs, split_count
+from zen_cdss.database.models import Drug, DrugReaction, Reaction
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    drop_test_database()
+
+
+@pytest.mark.parametrize(
+    'name, expected',
+    [
+        ('Rash (2)', ('Rash', 2)),
+        (' Gastric ulcer  (13) ', ('Gastric ulcer', 13)),
+        ('Hepatitis', ('Hepatitis', None)),
+        ('Drug use in (unknown) pregnancy', ('Drug use in (unknown) pregnancy', None)),
+    ]
+)
+def test_split_count(name, expected):
+    """
+    Test splitting report counts out of the names VigiAccess lists.
+    :param name: Name as listed.
+    :param expected: Expected name and report count.
+    """
+    assert split_count(name) == expected
+
+
+def test_import():
+    """
+    Test the ADR knowledge base does not depend on the VigiAccess scrapers.
+    """
+    code = 'import sys, zen_cdss.database.adrs; assert not [name for name in sys.modules if "vigiaccess" in name]'
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT_PATH, check=True)
+
+
+def test_load_adrs():
+    """
+    Test loading ADRs shares reactions across drugs and can be read back from both sides.
+    """
+    with session_scope(TEST_SESSION) as session:
+        assert load_adrs(session, {' Paracetamol': EXPECTED_ADRS['paracetamol'], **EXPECTED_ADRS}) == 9
+        session.commit()
+
+        assert session.execute(select(func.count()).select_from(Drug)).scalar() == 2
+        assert session.execute(select(func.count()).select_from(Reaction)).scalar() == 9
+        assert session.execute(get_drug_reactions_select('PARACETAMOL')).all()[:3] == [
+            ('Skin and subcutaneous tissue disorders', 'rash', 2),
+            ('Hepatobiliary disorders', 'hepatitis', 1),
+            ('Hepatobiliary disorders', 'hepatotoxicity', 1),
+        ]
+        assert session.execute(get_reaction_drugs_select('Dyspepsia')).all() == [('ibuprofen', 2)]
+        assert session.execute(get_reaction_drugs_select(' dyspePSIA')).all() == [('ibuprofen', 2)]
+        assert not session.execute(get_drug_reactions_select('aspirin')).all()
+
+
+def test_reload_adrs():
+    """
+    Test reloading the ADRs of a drug replaces its drug reactions only.
+    """
+    with session_scope(TEST_SESSION) as session:
+        load_adrs(session, EXPECTED_ADRS)
+        assert load_adrs(session, {'ibuprofen': {'Skin and subcutaneous tissue disorders (1)': ['RASH (1)']}}) == 1
+        assert not load_adrs(session, {})
+        session.commit()
+
+        assert session.execute(get_reaction_drugs_select('Rash')).all() == [('paracetamol', 2), ('ibuprofen', 1)]
+        assert not session.execute(get_reaction_drugs_select('Dyspepsia')).all()
+        assert session.execute(select(func.count()).select_from(DrugReaction)).scalar() == 6
@@ -0,0 +1,91 @@
+"""
+Testing async insertions.
+"""
+import asyncio
+
+from sqlalchemy import select
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.async_base import async_session_scope
+from zen_cdss.database.async_insertions import (add_address, add_contact_details, add_diagnosis, add_occupation,
+                                                add_patient, create_entry)
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Address, Patient, Village
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import ASYNC_TEST_SESSION, TEST_ENGINE, TEST_SESSION, drop_test_database
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def test_create_entry():
+    """
+    Test that the async create entry function only creates values once.
+    """
+    async def create_twice():
+        async with async_session_scope(ASYNC_TEST_SESSION) as session:
+            first = await create_entry(Village, 'village', 'async village', session)
+        async with async_session_scope(ASYNC_TEST_SESSION) as session:
+            second = await create_entry(Village, 'village', 'async village', session)
+            assert await create_entry(Village, 'village', None, session) is None
+            count = len((await session.execute(select(Village).where(Village.village == 'async village'))).all())
+
+        return first.id, second.id, count
+
+    first_id, second_id, count = asyncio.run(create_twice())
+    assert first_id == second_id
+    assert count == 1
+
+
+def test_add_patient():
+    """
+    Test adding a patient and every related record in a single async transaction.
+    """
+    patient_dict = {
+        'first_name': 'Async',
+        'last_name': 'Patient',
+        'gender': 'M',
+        'date_of_birth': '05-05-2005',
+        'address': 'Async Street',
+        'province': 'Async Province',
+        'village': 'Async Village',
+        'occupation_description': 'Async work',
+        'company': 'Async Company',
+        'email': 'async@gmail.com',
+        'diagnosis': 'Async diagnosis',
+        'diagnosis_advent': '2020-01-01',
+    }
+
+    async def add_all():
+        async with async_session_scope(ASYNC_TEST_SESSION) as session:
+            patient = await add_patient(patient_dict, session)
+            await add_address(patient_dict, patient, session)
+            await add_occupation(patient_dict, patient, session)
+            await add_contact_details(patient_dict, patient, session)
+            await add_diagnosis(patient_dict, patient, session)
+
+        return patient.id
+
+    patient_id = asyncio.run(add_all())
+
+    with session_scope(TEST_SESSION) as session:
+        patient = session.query(Patient).filter(Patient.id == patient_id).one()
+        assert patient.first_name == 'Async'
+        assert patient.address[0].province.province == 'Async Province'
+        assert patient.address[0].district is None
+        assert patient.occupation[0].company.company == 'Async Company'
+        assert patient.contact_details[0].email == 'async@gmail.com'
+        assert patient.diagnosis[0].diagnosis == 'Async diagnosis'
+        assert session.query(Address).filter(Address.address == 'Async Street').count() == 1
@@ -0,0 +1,55 @@
+"""
+Testing engine creation.
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from zen_cdss.database.base import SQLITE_PRAGMAS, create_db_engine, get_engine_options
+
+
+@pytest.mark.parametrize(
+    'url, pooled',
+    [
+        ('sqlite:///some.db', False),
+        ('postgresql://localhost/zen_cdss', True),
+    ]
+)
+def test_get_engine_options(url: str, pooled: bool):
+    """
+    Test that pool sizing options are only used for databases with a queue pool.
+    :param url: Database URL.
+    :param pooled: Whether pool sizing options are expected.
+    """
+    options = get_engine_options(url)
+
+    assert 'pool_recycle' in options
+    assert 'pool_pre_ping' in options
+    assert ('pool_size' in options) is pooled
+    assert ('max_overflow' in options) is pooled
+
+
+@pytest.mark.parametrize('sqlite_tuned', [True, False])
+def test_sqlite_tuned(tmp_path, sqlite_tuned: bool):
+    """
+    Test that the tuned SQLite profile sets its pragmas on every connection.
+    :param tmp_path: Temporary directory to create the database in.
+    :param sqlite_tuned: Whether to tune the engine.
+    """
+    engine = create_db_engine(f'sqlite:///{os.path.join(tmp_path, "tuned.db")}', sqlite_tuned=sqlite_tuned)
+
+    with engine.connect() as connection:
+        journal_mode = connection.execute(text('PRAGMA journal_mode')).scalar()
+        busy_timeout = connection.execute(text('PRAGMA busy_timeout')).scalar()
+        temp_store = connection.execute(text('PRAGMA temp_store')).scalar()
+
+    engine.dispose()
+
+    if sqlite_tuned:
+        assert journal_mode == 'wal'
+        assert busy_timeout == SQLITE_PRAGMAS['busy_timeout']
+        assert temp_store == 2  # MEMORY
+    else:
+        assert journal_mode == 'delete'
+        assert temp_store == 0  # DEFAULT
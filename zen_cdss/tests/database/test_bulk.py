@@ -0,0 +1,155 @@
+"""
+Testing bulk ingestion.
+"""
+from datetime import date
+
+import pytest
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.bulk import bulk_add_patients, chunked
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Address, Company, Diagnosis, Measurement, Occupation, Patient, Province
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def get_patient_dicts(count: int):
+    """
+    Yield dummy patient dictionaries in the shape the add_* functions expect.
+    :param count: Amount of patients to yield.
+    """
+    for index in range(count):
+        patient_dict = {
+            'first_name': f'First {index}',
+            'last_name': f'Last {index}',
+            'gender': 'male' if index % 2 else 'F',
+            'date_of_birth': '1990-01-05',
+            'address': f'{index} Some Street',
+            'province': f'Province {index % 3}',
+            'district': 'Kathmandu',
+            'municipality': None,
+            'village': None,
+            'occupation_description': 'Works',
+            'occupation_title': 'Farmer',
+            'company': f'Company {index % 4}',
+            'email': f'{index}@gmail.com',
+        }
+
+        if index % 5 == 0:
+            patient_dict.update({'diagnosis': 'diabetes', 'diagnosis_advent': 'Sep 5 2009'})
+        if index % 3 == 0:
+            patient_dict.update({'measured_on': '2020-01-05', 'weight': 60 + index, 'height': 170, 'waist': 90,
+                                 'tg': 150, 'ggt': 40, 'systolic_bp': 120 + index, 'diastolic_bp': 80})
+
+        yield patient_dict
+
+
+def test_chunked():
+    """
+    Test the chunked helper.
+    """
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert not list(chunked([], 2))
+
+    with pytest.raises(ValueError):
+        list(chunked(range(5), 0))
+
+
+def test_bulk_add_patients():
+    """
+    Test bulk adding patients along with their child rows.
+    """
+    with session_scope(TEST_SESSION) as session:
+        patient_count = session.query(Patient).count()
+
+    reported = []
+    reports = bulk_add_patients(get_patient_dicts(25), chunk_size=10, session_object=TEST_SESSION,
+                                on_chunk=reported.append)
+
+    assert reports == reported
+    assert [report.patients for report in reports] == [10, 10, 5]
+    assert sum(report.rows for report in reports) == 25 * 4 + 5 + 9
+    assert all(report.patients_per_second > 0 for report in reports)
+
+    with session_scope(TEST_SESSION) as session:
+        assert session.query(Patient).count() == patient_count + 25
+        assert session.query(Province).filter(Province.province.like('Province %')).count() == 3
+        assert session.query(Company).filter(Company.company.like('Company %')).count() == 4
+        assert session.query(Diagnosis).filter(Diagnosis.diagnosis == 'diabetes').count() == 5
+
+        patient = session.query(Patient).filter(Patient.first_name == 'First 7').one()
+        assert patient.gender == 'M'
+        assert patient.date_of_birth == date(1990, 1, 5)
+        assert patient.registration_date == date.today()
+        assert patient.address[0].address == '7 Some Street'
+        assert patient.address[0].province.province == 'Province 1'
+        assert patient.address[0].village is None
+        assert patient.occupation[0].company.company == 'Company 3'
+        assert patient.contact_details[0].email == '7@gmail.com'
+        assert not patient.diagnosis
+        assert not patient.measurement
+
+        # Vitals evaluated in batch should match the ones the model computes.
+        for measurement in session.query(Measurement).join(Patient).filter(Patient.first_name.like('First %')):
+            expected = Measurement(patient=measurement.patient, measured_on=measurement.measured_on,
+                                   **{name: getattr(measurement, name) for name in MEASUREMENT_INPUTS})
+            session.expunge(expected)
+            for column in Measurement.__table__.columns:
+                if column.name not in ('id', 'patient_id'):
+                    assert getattr(measurement, column.name) == getattr(expected, column.name), column.name
+
+
+def test_bulk_add_patients_rounds_integer_inputs():
+    """
+    Test that vitals are graded from integer inputs as they are stored, like the model grades them.
+    """
+    bulk_add_patients([{'first_name': 'Rounded', 'last_name': 'BP', 'gender': 'F', 'date_of_birth': '1970-03-02',
+                        'measured_on': '2020-01-05', 'systolic_bp': 179.6, 'diastolic_bp': 80.4}],
+                      session_object=TEST_SESSION)
+
+    with session_scope(TEST_SESSION) as session:
+        measurement = session.query(Measurement).join(Patient).filter(Patient.first_name == 'Rounded').one()
+        assert (measurement.systolic_bp, measurement.diastolic_bp) == (180, 80)
+        assert measurement.blood_pressure == 'Grade 3'
+
+        expected = Measurement(patient=measurement.patient, measured_on='2020-01-05', systolic_bp=179.6,
+                               diastolic_bp=80.4)
+        session.expunge(expected)
+        assert (expected.systolic_bp, expected.diastolic_bp, expected.blood_pressure) == (180, 80, 'Grade 3')
+
+
+def test_bulk_add_patients_rolls_back_chunk():
+    """
+    Test that a chunk with an invalid patient is not written while previous chunks are kept.
+    """
+    patient_dicts = list(get_patient_dicts(4))
+    patient_dicts[3]['gender'] = 'unknown'
+
+    with session_scope(TEST_SESSION) as session:
+        patient_count = session.query(Patient).count()
+        address_count = session.query(Address).count()
+        occupation_count = session.query(Occupation).count()
+
+    with pytest.raises(ValueError):
+        bulk_add_patients(patient_dicts, chunk_size=2, session_object=TEST_SESSION)
+
+    with session_scope(TEST_SESSION) as session:
+        assert session.query(Patient).count() == patient_count + 2
+        assert session.query(Address).count() == address_count + 2
+        assert session.query(Occupation).count() == occupation_count + 2
@@ -0,0 +1,101 @@
+"""
+Testing the lookup cache.
+"""
+
+import pytest
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.cache import LOOKUP_CACHE, LookupCache
+from zen_cdss.database.insertions import create_entry
+from zen_cdss.database.models import Company, Province
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def test_create_entry_is_cached(statements):
+    """
+    Test that a value is queried once, then served from the cache in later sessions.
+    """
+    LOOKUP_CACHE.clear()
+
+    with session_scope(TEST_SESSION) as session:
+        province = create_entry(Province, 'province', 'cached province', session)
+        session.add(province)
+
+        # Created in this session but not committed yet, so it should come back from the session's staged lookups.
+        assert create_entry(Province, 'province', 'cached province', session) is province
+
+    assert LOOKUP_CACHE.stats.misses == 1
+    assert LOOKUP_CACHE.stats.hits == 1
+    assert LOOKUP_CACHE.stats.size == 1
+
+    statements.clear()
+    with session_scope(TEST_SESSION) as session:
+        province = create_entry(Province, 'province', 'cached province', session)
+        assert province.province == 'cached province'
+        assert province.id is not None
+
+    assert not statements
+    assert LOOKUP_CACHE.stats.hits == 2
+
+
+def test_rolled_back_entries_are_not_cached():
+    """
+    Test that values created in a transaction that rolls back never get published.
+    """
+    LOOKUP_CACHE.clear()
+
+    with pytest.raises(RuntimeError):
+        with session_scope(TEST_SESSION) as session:
+            session.add(create_entry(Company, 'company', 'rolled back company', session))
+            session.flush()
+            raise RuntimeError('Roll this back.')
+
+    assert LOOKUP_CACHE.stats.size == 0
+
+    with session_scope(TEST_SESSION) as session:
+        assert session.query(Company).filter(Company.company == 'rolled back company').count() == 0
+
+
+def test_warm():
+    """
+    Test warming the cache from the database.
+    """
+    with session_scope(TEST_SESSION) as session:
+        session.add(Province('warm province'))
+
+    LOOKUP_CACHE.clear()
+    with session_scope(TEST_SESSION) as session:
+        loaded = LOOKUP_CACHE.warm(session)
+        assert loaded == session.query(Province).count() + session.query(Company).count()
+        assert LOOKUP_CACHE.get_id(session, Province, 'warm province') is not None
+
+    assert LOOKUP_CACHE.stats.hit_rate == 1.0
+
+
+def test_max_size():
+    """
+    Test that the least recently used entries are evicted once the cache is full.
+    """
+    cache = LookupCache(max_size=2)
+    cache.put(('url', 'province', 'a'), 1)
+    cache.put(('url', 'province', 'b'), 2)
+    cache.put(('url', 'province', 'c'), 3)
+
+    assert len(cache) == 2
+    assert cache.stats.max_size == 2
@@ -1,15 +1,15 @@
 """
 Testing insertions.
 """
-import os
 from datetime import datetime
 
 import zen_cdss.database.base as backend_base
-from zen_cdss.database.insertions import (add_address, add_contact_details, add_diagnosis, add_occupation, add_patient,
-                                          create_entry)
-from zen_cdss.database.models import Patient, Village
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.insertions import (add_address, add_contact_details, add_diagnosis, add_measurement,
+                                          add_occupation, add_patient, create_entry, get_or_create_ids)
+from zen_cdss.database.models import Company, Patient, Village
 from zen_cdss.database.utils import session_scope
-from zen_cdss.tests.database import TEST_DB_PATH, TEST_ENGINE, TEST_SESSION
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
 
 TEST_PATIENT = Patient(  # Leverage this dummy patient for the tests below.
     first_name='J',
@@ -30,7 +30,8 @@ def teardown_module():
     """
     Teardown post testing.
     """
-    os.remove(TEST_DB_PATH)
+    LOOKUP_CACHE.clear()
+    drop_test_database()
 
 
 def test_create_entry():
@@ -53,6 +54,24 @@ def test_create_entry():
         assert len(session.query(Village).all()) == village_count + 1
 
 
+def test_get_or_create_ids():
+    """
+    Test that values are only created once, even when requested repeatedly and from separate sessions.
+    """
+    values = ['get or create A', 'get or create B', 'get or create A']
+
+    with session_scope(TEST_SESSION) as session:
+        ids = get_or_create_ids(session, Company, 'company', values)
+
+    with session_scope(TEST_SESSION) as session:
+        assert get_or_create_ids(session, Company, 'company', values) == ids
+        assert get_or_create_ids(session, Company, 'company', ['get or create B']) == {
+            'get or create B': ids['get or create B']
+        }
+        assert session.query(Company).filter(Company.company.like('get or create %')).count() == 2
+        assert not get_or_create_ids(session, Company, 'company', [])
+
+
 def test_add_occupation():
     """
     Test the add occupation function.
@@ -126,6 +145,21 @@ def test_add_diagnosis():
         assert TEST_PATIENT.diagnosis[0] is diagnosis
 
 
+def test_add_measurement():
+    """
+    Test the add measurement function.
+    """
+    with session_scope(TEST_SESSION) as session:
+        measurement = add_measurement({
+            'measured_on': '2020-05-05',
+            'hba1c': 7.2,
+        }, patient=TEST_PATIENT, existing_session=session)
+
+        assert TEST_PATIENT.measurement[0] is measurement
+        assert measurement.age == 15
+        assert measurement.estimated_average_glucose == 159.94
+
+
 def test_add_address():
     """
     Test the add address function.
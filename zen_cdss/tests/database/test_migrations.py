@@ -0,0 +1,62 @@
+"""
+Testing database migrations.
+"""
+
+from sqlalchemy import inspect, text
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.migrations import add_missing_columns, create_missing_indexes, drop_obsolete_indexes, migrate
+from zen_cdss.database.models import Address, Measurement, Patient, Village
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+
+
+def setup_module():
+    """
+    Setup test module for testing with a database created before the indexes were declared.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+    with TEST_ENGINE.begin() as connection:
+        for table in backend_base.Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f'DROP INDEX {index.name}'))
+
+        connection.execute(text('ALTER TABLE measurement DROP COLUMN vitals_version'))
+        connection.execute(text('CREATE INDEX ix_measurement_patient_id ON measurement (patient_id)'))
+
+        connection.execute(text("INSERT INTO village (id, village) VALUES (1, 'dup'), (2, 'dup'), (3, 'other')"))
+        connection.execute(text("INSERT INTO patient (id, first_name, last_name, gender) VALUES (1, 'J', 'D', 'M')"))
+        connection.execute(text("INSERT INTO address (id, address, village_id, patient_id) VALUES (1, 'a', 2, 1)"))
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    drop_test_database()
+
+
+def test_migrate():
+    """
+    Test that migrating merges duplicate lookups and creates every declared index.
+    """
+    created = migrate(TEST_ENGINE)
+    assert 'ix_village_village' in created
+
+    inspector = inspect(TEST_ENGINE)
+    for table in backend_base.Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= existing
+        assert 'ix_measurement_patient_id' not in existing
+
+    with session_scope(TEST_SESSION) as session:
+        assert [village.id for village in session.query(Village).order_by(Village.id)] == [1, 3]
+        assert session.query(Address).one().village_id == 1
+        assert session.query(Patient).count() == 1
+        assert session.query(Measurement.vitals_version).count() == 0
+
+    with TEST_ENGINE.begin() as connection:
+        assert not add_missing_columns(connection)  # Running it again should be a no-op.
+        assert not create_missing_indexes(connection)
+        assert not drop_obsolete_indexes(connection)
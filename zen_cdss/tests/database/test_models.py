@@ -2,15 +2,15 @@
 File contain tests for database classes.
 """
 import datetime
-import os
 
 import pytest
 
 import zen_cdss.database.base as backend_base
-from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Municipality, Occupation,
-                                      OccupationTitle, Patient, Province, Village)
+from zen_cdss.database.models import (Address, Company, ContactDetails, Diagnosis, District, Drug, DrugReaction,
+                                      Measurement, Municipality, Occupation, OccupationTitle, Patient, Province,
+                                      Reaction, SystemOrganClass, Village)
 from zen_cdss.database.utils import get_latest_row, session_scope
-from zen_cdss.tests.database import TEST_DB_PATH, TEST_ENGINE, TEST_SESSION
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
 
 
 def setup_module():
@@ -24,7 +24,7 @@ def teardown_module():
     """
     Teardown post testing.
     """
-    os.remove(TEST_DB_PATH)
+    drop_test_database()
 
 
 def get_dummy_patient() -> Patient:
@@ -57,6 +57,13 @@ def get_dummy_patient() -> Patient:
 
         District(district="district"),
 
+        Drug(drug="paracetamol"),
+
+        DrugReaction(drug=Drug("paracetamol"), system_organ_class=SystemOrganClass("Skin disorders"),
+                     reaction=Reaction("Rash"), report_count=2),
+
+        Measurement(patient=Patient("J", "D", "M", "1/1/1994"), measured_on="2020-01-01", weight=80, height=180),
+
         Municipality(municipality="municipality"),
 
         Occupation(patient=Patient("J", "D", "M", "1/1/1994"), description="desc", company=Company(company='company'),
@@ -68,6 +75,10 @@ def get_dummy_patient() -> Patient:
 
         Province(province="province"),
 
+        Reaction(reaction="Rash"),
+
+        SystemOrganClass(system_organ_class="Skin disorders"),
+
         Village(village="village")
     ]
 )
@@ -248,3 +259,34 @@ def test_occupation():
         assert result_occupation.description == description
         assert result_occupation.company is company
         assert result_occupation.occupation_title is occupation_title
+
+
+def test_measurement():
+    """
+    Test logic for creating measurements, computing their derived vitals.
+    """
+    patient = get_dummy_patient()
+    measurement = Measurement(patient=patient, measured_on='2020-09-25', weight=95.7, height=166, waist=111, tg=142,
+                              ggt=63, systolic_bp=147, diastolic_bp=91)
+
+    with session_scope(TEST_SESSION) as session:
+        session.add(measurement)
+        session.commit()
+
+        result_measurement: Measurement = get_latest_row(session, Measurement)
+
+        assert result_measurement.patient is patient
+        assert result_measurement.age == 64
+        assert result_measurement.bmi == 34.7
+        assert result_measurement.fatty_liver_index == 93
+        assert result_measurement.blood_pressure == 'Grade 1'
+        assert result_measurement.maximum_heart_rate == 156
+        assert result_measurement.homa_ir is None
+        assert session.query(Measurement).filter(Measurement.bmi > 30).count() >= 1
+
+        result_measurement.hdl = 32
+        result_measurement.update_vitals()
+        assert result_measurement.visceral_adiposity_index is not None
+
+    with pytest.raises(TypeError):
+        Measurement(patient=patient, weigth=95.7)
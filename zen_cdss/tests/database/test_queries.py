@@ -0,0 +1,74 @@
+"""
+Testing patient read queries.
+"""
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.bulk import bulk_add_patients
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.queries import load_patient_graphs
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+    bulk_add_patients(({
+        'first_name': f'First {index}',
+        'last_name': 'Last',
+        'gender': 'F',
+        'date_of_birth': '1990-01-05',
+        'address': f'{index} Some Street',
+        'province': f'Province {index % 3}',
+        'village': f'Village {index}',
+        'occupation_description': 'Works',
+        'company': f'Company {index % 4}',
+        'occupation_title': 'Farmer',
+        'email': f'{index}@gmail.com',
+        'diagnosis': 'diabetes',
+        'diagnosis_advent': '2009-09-05',
+        'weight': 60 + index,
+        'height': 170,
+    } for index in range(100)), session_object=TEST_SESSION)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def test_load_patient_graphs(statements):
+    """
+    Test that whole patient graphs are loaded in one query per table group, however many patients there are.
+    """
+    with session_scope(TEST_SESSION) as session:
+        patients = load_patient_graphs(session)
+
+        records = [(patient.address[0].province.province, patient.address[0].village.village,
+                    patient.address[0].district, patient.occupation[0].company.company,
+                    patient.occupation[0].occupation_title.occupation_title, patient.contact_details[0].email,
+                    patient.diagnosis[0].diagnosis, patient.measurement[0].bmi, patient.address[0].patient is patient)
+                   for patient in patients]
+
+    assert len(statements) == 6  # Patients, then addresses, occupations, contact details, diagnoses and measurements.
+    assert len(records) == 100
+    assert records[7] == ('Province 1', 'Village 7', None, 'Company 3', 'Farmer', '7@gmail.com', 'diabetes', 23.2, True)
+
+
+def test_load_patient_graphs_by_id(statements):
+    """
+    Test loading a subset of patients.
+    """
+    with session_scope(TEST_SESSION) as session:
+        patients = load_patient_graphs(session, [3, 1, 2])
+        assert [patient.id for patient in patients] == [1, 2, 3]
+        emails = [patient.contact_details[0].email for patient in patients]
+
+    assert emails == ['0@gmail.com', '1@gmail.com', '2@gmail.com']
+
+    assert len(statements) == 6
@@ -0,0 +1,50 @@
+"""
+Testing database utilities.
+"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from zen_cdss.database.utils import parse_date, parse_date_series
+
+
+def test_parse_date():
+    """
+    Test parsing dates through the fast paths and the dateutil fallback.
+    """
+    assert parse_date('2020-01-05') == date(2020, 1, 5)
+    assert parse_date(' 2020-01-05 ') == date(2020, 1, 5)
+    assert parse_date('05-06-2005') == date(2005, 6, 5)  # Hyphenated dates are day first.
+    assert parse_date('Aug 5 1995') == date(1995, 8, 5)
+    assert parse_date('7 September, 2021') == date(2021, 9, 7)
+    assert parse_date(date(2001, 2, 3)) == date(2001, 2, 3)
+    assert parse_date(None, null_ok=True) == date.today()
+
+    with pytest.raises(ValueError):
+        parse_date('2020-02-30')
+    with pytest.raises(ValueError):
+        parse_date('31-04-2020')
+
+
+def test_parse_date_series():
+    """
+    Test that parsing a column matches parsing each date on its own.
+    """
+    dates = pd.Series(['2020-01-05', '05-06-2005', None, 'Aug 5 1995', '7 September, 2021', date(2001, 2, 3),
+                       '2020-01-05'], index=range(10, 17))
+    parsed = parse_date_series(dates)
+
+    assert parsed.index.equals(dates.index)
+    assert parsed.isna().tolist() == dates.isna().tolist()
+    assert [value.date() for value in parsed.dropna()] == [parse_date(value) for value in dates.dropna()]
+    assert parse_date_series(pd.Series(['2020-01-05'])).tolist() == [pd.Timestamp(2020, 1, 5)]
+
+
+def test_parse_date_series_unpadded():
+    """
+    Test that unpadded dates, which the fast paths do not match, are parsed like parse_date() parses them.
+    """
+    dates = pd.Series(['5-6-2005', '05-06-2005', '2020-1-5', '12-1-1999'])
+    assert [value.date() for value in parse_date_series(dates)] == [parse_date(value) for value in dates]
+    assert parse_date_series(dates)[0] == pd.Timestamp(2005, 5, 6)
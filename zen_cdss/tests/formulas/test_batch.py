@@ -0,0 +1,150 @@
+"""
+Test file to test the vectorized formulas in batch.py against their scalar counterparts in vitals.py.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from zen_cdss.formulas import batch, vitals
+from zen_cdss.formulas.vitals import GENDER_ERROR_MESSAGE
+
+SIZE = 2_000
+RANDOM = np.random.default_rng(seed=7)
+
+COHORT = pd.DataFrame({
+    'gender': RANDOM.choice(['M', 'F'], size=SIZE),
+    'age': RANDOM.integers(18, 95, size=SIZE),
+    'weight': RANDOM.uniform(35, 160, size=SIZE).round(1),
+    'height': RANDOM.integers(135, 205, size=SIZE),
+    'waist': RANDOM.integers(60, 150, size=SIZE),
+    'systolic_bp': RANDOM.integers(70, 220, size=SIZE),
+    'diastolic_bp': RANDOM.integers(40, 130, size=SIZE),
+    'insulin': RANDOM.uniform(2, 60, size=SIZE).round(1),
+    'glucose': RANDOM.integers(60, 300, size=SIZE),
+    'tg': RANDOM.integers(40, 600, size=SIZE),
+    'hdl': RANDOM.integers(20, 100, size=SIZE),
+    'ggt': RANDOM.integers(5, 300, size=SIZE),
+    'alt': RANDOM.integers(5, 200, size=SIZE),
+    'ast': RANDOM.integers(5, 200, size=SIZE),
+    'creatinine': RANDOM.uniform(0.3, 4, size=SIZE).round(2),
+    'hba1c': RANDOM.uniform(4, 14, size=SIZE).round(1),
+})
+COHORT['bmi'] = batch.get_bmi(COHORT.weight, COHORT.height)
+COHORT['maximum_heart_rate'] = batch.get_maximum_heart_rate(COHORT.age)
+
+
+@pytest.mark.parametrize('name', list(batch.FORMULAS))
+def test_batch_matches_scalar(name: str):
+    """
+    Test that every vectorized formula returns exactly what the scalar formula returns for each row.
+    :param name: Name of the formula to test.
+    """
+    batch_formula = batch.FORMULAS[name]
+    scalar_formula = getattr(vitals, batch_formula.__name__)
+    inputs = batch.get_formula_inputs(batch_formula)
+
+    result = batch_formula(**{argument: COHORT[argument].to_numpy() for argument in inputs})
+    expected = [scalar_formula(**{argument: row[argument] for argument in inputs})
+                for row in COHORT[list(inputs)].to_dict(orient='records')]
+
+    assert result.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    'value, round_digits',
+    [
+        (2.675, 2),
+        (0.125, 2),
+        (2.5, 0),
+        (3.5, 0),
+        (1.005, 2),
+        (-0.5, 0),
+        (float('nan'), 2),
+    ]
+)
+def test_round_like_scalar(value: float, round_digits: int):
+    """
+    Test that rounding matches the built-in round() on values that sit on or near a half.
+    :param value: Value to round.
+    :param round_digits: Amount of digits to round by.
+    """
+    result = batch.round_like_scalar([value], round_digits)[0]
+    expected = round(value, round_digits)
+
+    if np.isnan(expected):
+        assert np.isnan(result)
+    else:
+        assert result == expected
+
+
+def test_blood_pressure_codes_round_trip():
+    """
+    Test that grading every integer blood pressure, and fractional ones around each threshold, as codes round trips to
+    the grades of the scalar formula.
+    """
+    systolic_bp, diastolic_bp = np.meshgrid(np.arange(40, 260), np.arange(20, 160))
+    edges = np.concatenate([batch.SYSTOLIC_BP_EDGES, batch.DIASTOLIC_BP_EDGES, [89, 59]])
+    near_edges = (edges[:, None] + [-0.5, -0.01, 0, 0.01, 0.5]).ravel()
+    fractional_systolic_bp, fractional_diastolic_bp = np.meshgrid(near_edges, near_edges)
+
+    for systolic, diastolic in [(systolic_bp.ravel(), diastolic_bp.ravel()),
+                                (fractional_systolic_bp.ravel(), fractional_diastolic_bp.ravel())]:
+        codes = batch.get_blood_pressure_codes(systolic, diastolic)
+        expected = [vitals.get_blood_pressure(*pair) for pair in zip(systolic.tolist(), diastolic.tolist())]
+
+        assert codes.dtype == np.int8
+        assert [batch.BLOOD_PRESSURE_GRADES[code] for code in codes] == expected
+        assert batch.get_blood_pressure_categorical(systolic, diastolic).tolist() == expected
+
+
+def test_blood_pressure_missing():
+    """
+    Test that missing blood pressures get no code, while the string grades match the scalar formula.
+    """
+    systolic_bp, diastolic_bp = [120, np.nan, 185], [np.nan, 80, 85]
+
+    assert batch.get_blood_pressure_codes(systolic_bp, diastolic_bp).tolist() == [-1, -1, 5]
+    assert batch.get_blood_pressure(systolic_bp, diastolic_bp).tolist() == [
+        vitals.get_blood_pressure(systolic, diastolic) for systolic, diastolic in zip(systolic_bp, diastolic_bp)
+    ]
+
+    categorical = batch.get_blood_pressure_categorical(systolic_bp, diastolic_bp)
+    assert categorical.isna().tolist() == [True, True, False]
+    assert (categorical[2:] >= 'Grade 1').all()
+
+
+@pytest.mark.parametrize(
+    'formula, arguments',
+    [
+        (batch.get_visceral_adiposity_index, {'waist': [101, 99], 'tg': [142, 110], 'hdl': [32, 32],
+                                              'bmi': [34.7, 30.7]}),
+        (batch.get_lipid_accumulation_product, {'waist': [101, 99], 'tg': [142, 110]}),
+        (batch.get_egfr, {'creatinine': [0.8, 0.9], 'age': [65, 65]}),
+    ]
+)
+def test_invalid_gender(formula, arguments):
+    """
+    Test that gender specific formulas raise the same error as the scalar formulas if any gender is invalid.
+    :param formula: Formula to test.
+    :param arguments: Arguments other than gender to pass to the formula.
+    """
+    with pytest.raises(ValueError, match=GENDER_ERROR_MESSAGE):
+        formula(gender=['M', 'O'], **arguments)
+
+
+def test_evaluate_frame():
+    """
+    Test that evaluating a dataframe picks every formula whose inputs are present.
+    """
+    frame = pd.DataFrame({'weight': [95.7, 84.7], 'height': [166, 166], 'waist': [111, 101]}, index=[10, 20])
+    result = batch.evaluate_frame(frame)
+
+    assert list(result.columns) == ['bmi', 'body_adiposity_index', 'waist_height_ratio']
+    assert list(result.index) == [10, 20]
+    assert result.bmi.tolist() == [34.7, 30.7]
+    assert result.body_adiposity_index.tolist() == [34, 29]
+    assert result.waist_height_ratio.tolist() == [0.67, 0.61]
+
+    with pytest.raises(KeyError):
+        batch.evaluate_frame(frame, formulas=['homa_ir'])
@@ -0,0 +1,82 @@
+"""
+Testing the memoized vitals formulas.
+"""
+
+import pytest
+
+from zen_cdss.formulas import batch, cached, vitals
+from zen_cdss.tests.formulas.test_batch import COHORT
+
+
+def setup_function():
+    """
+    Start every test with empty caches.
+    """
+    cached.clear_caches()
+
+
+@pytest.mark.parametrize('name', list(batch.FORMULAS))
+def test_cached_matches_scalar(name: str):
+    """
+    Test that every formula returns exactly what the scalar formula returns, whether cached or not.
+    :param name: Name of the formula to test.
+    """
+    scalar_formula = getattr(vitals, batch.FORMULAS[name].__name__)
+    cached_formula = getattr(cached, scalar_formula.__name__)
+    inputs = batch.get_formula_inputs(batch.FORMULAS[name])
+    rows = COHORT[list(inputs)].to_dict(orient='records')
+
+    expected = [scalar_formula(**row) for row in rows]
+    assert [cached_formula(**row) for row in rows] == expected
+    assert [cached_formula(**row) for row in rows] == expected
+
+    if name in cached.CACHED_FORMULAS:
+        assert cached.get_cache_stats()[name].hits >= len(rows)
+    else:
+        assert cached_formula is scalar_formula
+
+
+def test_cache_stats():
+    """
+    Test the cache statistics.
+    """
+    assert cached.get_cache_stats()['egfr'] == cached.CacheStats(hits=0, misses=0, size=0,
+                                                                 max_size=cached.EGFR_CACHE_SIZE)
+    assert cached.get_cache_stats()['egfr'].hit_rate == 0
+
+    for _ in range(4):
+        assert cached.get_egfr(1.1, 'M', 64) == 71
+
+    stats = cached.get_cache_stats()['egfr']
+    assert (stats.hits, stats.misses, stats.size) == (3, 1, 1)
+    assert stats.hit_rate == 0.75
+    assert set(cached.get_cache_stats()) == set(cached.CACHED_FORMULAS)
+
+
+def test_errors_are_not_cached():
+    """
+    Test that invalid inputs keep raising the errors of the scalar formulas.
+    """
+    for _ in range(2):
+        with pytest.raises(ValueError, match=vitals.GENDER_ERROR_MESSAGE):
+            cached.get_egfr(1.1, 'X', 40)
+
+    assert cached.get_cache_stats()['egfr'].size == 0
+
+
+def test_warm_caches():
+    """
+    Test that warming the caches precomputes every age and HbA1c in range.
+    """
+    cached.warm_caches()
+    misses = {name: stats.misses for name, stats in cached.get_cache_stats().items()}
+    assert misses['target_heart_rate'] == len(cached.AGES)
+    assert misses['estimated_average_glucose'] == len(cached.HBA1C_PERCENTAGES)
+
+    for hba1c in COHORT.hba1c.tolist():
+        assert cached.get_estimated_average_glucose(hba1c) == vitals.get_estimated_average_glucose(hba1c)
+    for age in COHORT.age.tolist():
+        assert cached.get_target_heart_rate(cached.get_maximum_heart_rate(age)) == \
+               vitals.get_target_heart_rate(vitals.get_maximum_heart_rate(age))
+
+    assert {name: stats.misses for name, stats in cached.get_cache_stats().items()} == misses
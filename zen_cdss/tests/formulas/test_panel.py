@@ -0,0 +1,139 @@
+"""
+Test file to test the vitals panel in panel.py.
+"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from zen_cdss.formulas import vitals
+from zen_cdss.formulas.panel import (VitalsPanel, evaluate_panel_frame, evaluate_partial_panel_frame, get_panel_version,
+                                     get_vitals_panel)
+from zen_cdss.tests.formulas.test_batch import COHORT
+
+PATIENT = {
+    'gender': 'M',
+    'age': 65,
+    'weight': 95.7,
+    'height': 166,
+    'waist': 111,
+    'systolic_bp': 147,
+    'diastolic_bp': 91,
+    'insulin': 41.9,
+    'glucose': 126,
+    'tg': 142,
+    'hdl': 32,
+    'ggt': 63,
+    'alt': 142,
+    'ast': 77,
+    'creatinine': 0.8,
+    'hba1c': 7.2,
+}
+
+
+def get_scalar_panel(patient: Dict[str, Any]) -> VitalsPanel:
+    """
+    Returns the vitals panel of a patient by calling every scalar formula one by one.
+    :param patient: Patient inputs.
+    :return: Vitals panel of the patient.
+    """
+    bmi = vitals.get_bmi(patient['weight'], patient['height'])
+    maximum_heart_rate = vitals.get_maximum_heart_rate(patient['age'])
+    return VitalsPanel(
+        bmi=bmi,
+        blood_pressure=vitals.get_blood_pressure(patient['systolic_bp'], patient['diastolic_bp']),
+        maximum_heart_rate=maximum_heart_rate,
+        target_heart_rate=vitals.get_target_heart_rate(maximum_heart_rate),
+        homa_ir=vitals.get_homa_ir(patient['insulin'], patient['glucose']),
+        tg_hdl_ratio=vitals.get_tg_hdl_ratio(patient['tg'], patient['hdl']),
+        triglyceride_glucose_index=vitals.get_triglyceride_glucose_index(patient['tg'], patient['glucose']),
+        atherogenic_index_of_plasma=vitals.get_atherogenic_index_of_plasma(patient['tg'], patient['hdl']),
+        body_adiposity_index=vitals.get_body_adiposity_index(patient['waist'], patient['height']),
+        visceral_adiposity_index=vitals.get_visceral_adiposity_index(patient['gender'], patient['waist'],
+                                                                     patient['tg'], patient['hdl'], bmi),
+        lipid_accumulation_product=vitals.get_lipid_accumulation_product(patient['gender'], patient['waist'],
+                                                                         patient['tg']),
+        fatty_liver_index=vitals.get_fatty_liver_index(patient['tg'], patient['ggt'], patient['waist'], bmi),
+        waist_height_ratio=vitals.get_waist_height_ratio(patient['waist'], patient['height']),
+        alt_ast_ratio=vitals.get_alt_ast_ratio(patient['alt'], patient['ast']),
+        egfr=vitals.get_egfr(patient['creatinine'], patient['gender'], patient['age']),
+        estimated_average_glucose=vitals.get_estimated_average_glucose(patient['hba1c']),
+    )
+
+
+def test_get_vitals_panel():
+    """
+    Test that the panel of a single patient matches calling every scalar formula.
+    """
+    panel = get_vitals_panel(**PATIENT)
+
+    assert panel == get_scalar_panel(PATIENT)
+    assert panel.bmi == 34.7
+    assert panel.fatty_liver_index == 93
+    assert panel.target_heart_rate == '77.5 - 131'
+    assert isinstance(panel.maximum_heart_rate, int)
+
+
+def test_get_vitals_panel_missing_inputs():
+    """
+    Test that vitals whose inputs are missing are skipped while the rest are still computed.
+    """
+    panel = get_vitals_panel(weight=95.7, height=166, waist=111, tg=142, ggt=63, hdl=None)
+
+    assert panel.bmi == 34.7
+    assert panel.fatty_liver_index == 93
+    assert panel.waist_height_ratio == 0.67
+    assert panel.visceral_adiposity_index is None
+    assert panel.egfr is None
+    assert panel.maximum_heart_rate is None
+
+    with pytest.raises(TypeError):
+        get_vitals_panel(weight=95.7, heigth=166)
+
+
+def test_evaluate_panel_frame():
+    """
+    Test that the batch panel matches the scalar panel of every row.
+    """
+    cohort = COHORT.drop(columns=['bmi', 'maximum_heart_rate'])
+    result = evaluate_panel_frame(cohort)
+
+    assert list(result.columns) == list(VitalsPanel._fields)
+    assert result.index.equals(cohort.index)
+
+    expected = pd.DataFrame([get_scalar_panel(patient) for patient in cohort.to_dict(orient='records')],
+                            index=cohort.index)
+    assert result.astype(object).equals(expected.astype(object))
+
+
+def test_evaluate_partial_panel_frame():
+    """
+    Test that rows missing some inputs get the vitals of the inputs they have, matching the scalar panel.
+    """
+    cohort = COHORT.drop(columns=['bmi', 'maximum_heart_rate']).head(200).copy()
+    rng = np.random.default_rng(0)
+    for name in ('gender', 'age', 'weight', 'tg', 'hba1c'):
+        cohort.loc[rng.random(len(cohort)) < 0.3, name] = None
+
+    result = evaluate_partial_panel_frame(cohort)
+    assert list(result.columns) == list(VitalsPanel._fields)
+    assert result.index.equals(cohort.index)
+
+    for index, patient in cohort.iterrows():
+        expected = get_vitals_panel(**{name: None if pd.isna(value) else value for name, value in patient.items()})
+        for name, value in expected._asdict().items():
+            assert (pd.isna(result.at[index, name]) if value is None else result.at[index, name] == value), name
+
+    assert evaluate_partial_panel_frame(cohort.iloc[:0]).empty
+
+
+def test_get_panel_version():
+    """
+    Test that the panel version only changes when the version of a formula does.
+    """
+    assert get_panel_version() == get_panel_version(dict(vitals.FORMULA_VERSIONS))
+    assert len(get_panel_version()) == 16
+    assert get_panel_version() != get_panel_version({**vitals.FORMULA_VERSIONS, 'egfr': 2})
+    assert set(vitals.FORMULA_VERSIONS) == set(VitalsPanel._fields)
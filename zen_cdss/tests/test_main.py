@@ -0,0 +1,122 @@
+"""
+Testing the FastAPI app.
+"""
+from fastapi.testclient import TestClient
+
+import zen_cdss.database.base as backend_base
+import zen_cdss.main as main_module
+from zen_cdss.database.adrs import load_adrs
+from zen_cdss.database.async_base import async_session_scope
+from zen_cdss.database.utils import session_scope
+from zen_cdss.main import app, get_session
+from zen_cdss.tests.database import ASYNC_TEST_SESSION, TEST_ENGINE, TEST_SESSION, drop_test_database
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS
+
+CLIENT = TestClient(app)
+
+TEST_PATIENT = {
+    'first_name': 'Sita',
+    'last_name': 'Sharma',
+    'gender': 'female',
+    'date_of_birth': '1980-02-03',
+    'registration_date': '2021-09-07',
+    'address': [{'address': 'Some Street', 'province': 'Bagmati', 'district': 'Kathmandu'}],
+    'occupation': [{'description': 'Teaches', 'occupation_title': 'Teacher'}],
+    'contact_details': [{'email': 'sita@gmail.com', 'phone_number': '9800000000'}],
+    'diagnosis': [{'diagnosis': 'T2DM', 'advent': '2019-05-01'}],
+}
+
+
+async def get_test_session():
+    """
+    Session dependency using the test database.
+    """
+    async with async_session_scope(ASYNC_TEST_SESSION) as session:
+        yield session
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+    app.dependency_overrides[get_session] = get_test_session
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    app.dependency_overrides.clear()
+    drop_test_database()
+
+
+def test_startup_migrates(monkeypatch):
+    """
+    Test that the database is migrated when the app starts.
+    """
+    migrations = []
+    monkeypatch.setattr(main_module, 'migrate', lambda: migrations.append(True))
+    with TestClient(app):
+        assert migrations == [True]
+
+
+def test_create_and_get_patient():
+    """
+    Test creating a patient and getting it back with every related record.
+    """
+    response = CLIENT.post('/patients', json=TEST_PATIENT)
+    assert response.status_code == 201
+    patient = response.json()
+    assert patient['gender'] == 'F'
+    assert patient['address'] == [{**TEST_PATIENT['address'][0], 'municipality': None, 'village': None}]
+    assert patient['occupation'] == [{**TEST_PATIENT['occupation'][0], 'company': None}]
+    assert patient['contact_details'] == TEST_PATIENT['contact_details']
+    assert patient['diagnosis'] == TEST_PATIENT['diagnosis']
+
+    assert CLIENT.get(f'/patients/{patient["id"]}').json() == patient
+    assert CLIENT.get(f'/patients/{patient["id"] + 1000}').status_code == 404
+    assert CLIENT.post('/patients', json={**TEST_PATIENT, 'gender': 'X'}).status_code == 422
+
+    response = CLIENT.post('/patients', json={**TEST_PATIENT, 'diagnosis': [{'diagnosis': 'T2DM'}]})
+    assert response.status_code == 201
+    assert response.json()['diagnosis'] == [{'diagnosis': 'T2DM', 'advent': None}]
+
+
+def test_list_patients():
+    """
+    Test paging through patients and selecting fields.
+    """
+    created_ids = {CLIENT.post('/patients', json={**TEST_PATIENT, 'first_name': str(index)}).json()['id']
+                   for index in range(5)}
+
+    listed_ids = []
+    params = {'limit': 2, 'fields': 'first_name,address'}
+    while True:
+        page = CLIENT.get('/patients', params=params).json()
+        assert all(set(patient) == {'id', 'first_name', 'address'} for patient in page['patients'])
+        listed_ids += [patient['id'] for patient in page['patients']]
+        if page['next_after_id'] is None:
+            break
+        params['after_id'] = page['next_after_id']
+
+    assert listed_ids == sorted(listed_ids)
+    assert created_ids.issubset(listed_ids)
+    assert CLIENT.get('/patients', params={'fields': 'first_name,unknown'}).status_code == 422
+
+
+def test_list_adrs():
+    """
+    Test listing the reactions of a drug and the drugs of a reaction.
+    """
+    with session_scope(TEST_SESSION) as session:
+        load_adrs(session, EXPECTED_ADRS)
+        session.commit()
+
+    reactions = CLIENT.get('/drugs/Paracetamol/reactions').json()
+    assert len(reactions) == 5
+    assert reactions[0] == {'system_organ_class': 'Skin and subcutaneous tissue disorders', 'reaction': 'rash',
+                            'report_count': 2}
+    assert CLIENT.get('/reactions/Gastric ulcer/drugs').json() == [{'drug': 'ibuprofen', 'report_count': 1}]
+    assert CLIENT.get('/reactions/gastric ULCER/drugs').json() == [{'drug': 'ibuprofen', 'report_count': 1}]
+    assert CLIENT.get('/drugs/aspirin/reactions').json() == []
@@ -0,0 +1,126 @@
+"""
+Testing the patient exporter.
+"""
+import os
+from datetime import date
+from typing import Dict
+
+import pandas as pd
+import pytest
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Diagnosis, Patient
+from zen_cdss.database.utils import session_scope
+from zen_cdss.formulas import vitals
+from zen_cdss.tests.database import TEST_DB_PATH, TEST_ENGINE, TEST_SESSION, add_test_patients, drop_test_database
+from zen_cdss.tools.export_patients import EXPORT_TABLES, export_patients, get_export_paths
+
+EXPORT_DIRECTORY = os.path.dirname(TEST_DB_PATH)
+PATIENT_COUNT = 25
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    add_test_patients(PATIENT_COUNT, lambda index: {
+        'address': f'{index} Some Street',
+        'province': f'Province {index % 3}',
+        **({'occupation_description': 'Works', 'company': 'Company'} if index % 4 == 0 else {}),
+        'email': f'{index}@gmail.com',
+        **({'measured_on': date(2020, 6, 14), 'weight': 60 + index, 'height': 170} if index % 5 == 0 else {}),
+    })
+    with session_scope(TEST_SESSION) as session:
+        patient = session.get(Patient, 1)
+        session.add_all([Diagnosis('T2DM', '2019-05-01', patient), Diagnosis('Hypertension', None, patient)])
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def read_export(path: str) -> Dict[str, pd.DataFrame]:
+    """
+    Read and remove every file of an export.
+    :param path: Path of the patients file of the export.
+    :return: Dictionary of table names to their exported rows.
+    """
+    exported = {}
+    for table, table_path in get_export_paths(path).items():
+        exported[table] = pd.read_csv(table_path) if path.endswith('.csv') else pd.read_parquet(table_path)
+        os.remove(table_path)
+
+    return exported
+
+
+def test_get_export_paths():
+    """
+    Test that related records are exported next to the patients file.
+    """
+    paths = get_export_paths(os.path.join('exports', 'patients.csv'))
+    assert list(paths) == list(EXPORT_TABLES)
+    assert paths['patient'] == os.path.join('exports', 'patients.csv')
+    assert paths['contact_details'] == os.path.join('exports', 'patients.contact_details.csv')
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_export_patients(file_format):
+    """
+    Test exporting every patient and their records in several chunks, with vitals.
+    """
+    path = os.path.join(EXPORT_DIRECTORY, f'test_export.{file_format}')
+    report = export_patients(path, vitals=True, chunk_size=10, session_object=TEST_SESSION)
+    exported = read_export(path)
+
+    assert report.rows == {table: len(rows) for table, rows in exported.items()}
+    assert exported['patient']['id'].tolist() == list(range(1, PATIENT_COUNT + 1))
+    assert exported['address']['patient_id'].tolist() == list(range(1, PATIENT_COUNT + 1))
+    assert exported['address']['province'].tolist() == [f'Province {index % 3}' for index in range(PATIENT_COUNT)]
+    assert exported['occupation']['patient_id'].tolist() == list(range(1, PATIENT_COUNT + 1, 4))
+    assert exported['occupation']['description'][0] == 'Works'
+    assert exported['contact_details']['email'][0] == '0@gmail.com'
+
+    # Several records of a type never multiply the rows of the other tables.
+    assert exported['diagnosis']['patient_id'].tolist() == [1, 1]
+    assert exported['diagnosis']['diagnosis'].tolist() == ['T2DM', 'Hypertension']
+
+    measured = exported['measurement']
+    assert measured['patient_id'].tolist() == list(range(1, PATIENT_COUNT + 1, 5))
+    indexes = measured['patient_id'] - 1
+    assert measured['age'].tolist() == [69 - index for index in indexes]
+    assert measured['bmi'].tolist() == [vitals.get_bmi(60 + index, 170) for index in indexes]
+    assert measured['target_heart_rate'][0] == vitals.get_target_heart_rate(vitals.get_maximum_heart_rate(69))
+    assert measured['glucose'].isna().all()
+
+
+def test_export_patients_without_vitals():
+    """
+    Test that the raw measurement inputs are exported without the derived vitals by default.
+    """
+    path = os.path.join(EXPORT_DIRECTORY, 'test_export_raw.csv')
+    export_patients(path, session_object=TEST_SESSION)
+    columns = read_export(path)['measurement'].columns
+
+    assert 'weight' in columns
+    assert 'bmi' not in columns
+
+
+def test_export_patients_empty():
+    """
+    Test that exports without rows still hold every column, and that unknown formats are refused.
+    """
+    path = os.path.join(EXPORT_DIRECTORY, 'test_export_empty.csv')
+    with pytest.raises(ValueError):
+        export_patients(path, file_format='xlsx', session_object=TEST_SESSION)
+
+    drop_test_database()
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+    assert set(export_patients(path, session_object=TEST_SESSION).rows.values()) == {0}
+    exported = read_export(path)
+    assert 'date_of_birth' in exported['patient'].columns
+    assert 'patient_id' in exported['diagnosis'].columns
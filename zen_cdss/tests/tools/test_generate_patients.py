@@ -0,0 +1,76 @@
+"""
+Testing the synthetic patient generator.
+"""
+import os
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.bulk import bulk_add_patients
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Measurement, Patient
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_DB_PATH, TEST_ENGINE, TEST_SESSION, drop_test_database
+from zen_cdss.tools.generate_patients import generate_patients, load_places, write_csv
+from zen_cdss.tools.import_patients import import_patients
+
+PLACES = load_places()
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def test_generate_patients():
+    """
+    Test the generated patients are reproducible, located in Nepal, and have plausible vitals inputs.
+    """
+    patients = list(generate_patients(1_000, seed=3, places=PLACES, chunk_size=300))
+
+    assert len(patients) == 1_000
+    assert patients == list(generate_patients(1_000, seed=3, places=PLACES, chunk_size=300))
+    assert patients != list(generate_patients(1_000, seed=4, places=PLACES, chunk_size=300))
+
+    places = set(PLACES)
+    for patient in patients:
+        assert (patient['province'], patient['district'], patient['municipality']) in places
+        assert patient['gender'] in ('M', 'F')
+        assert patient['date_of_birth'] < patient['registration_date']
+        assert 'diagnosis_advent' not in patient or patient['diagnosis_advent'] <= patient['registration_date']
+        assert 135 <= patient.get('height', 135) <= 200
+        assert 45 <= patient.get('diastolic_bp', 45) < patient.get('systolic_bp', 230)
+        if any(name in patient for name in MEASUREMENT_INPUTS):
+            assert patient['registration_date'] <= patient['measured_on']
+
+    assert 0.85 < sum('measured_on' in patient for patient in patients) / len(patients) < 0.95
+
+
+def test_write_generated_patients():
+    """
+    Test the generated patients can be written through the bulk path and the importer.
+    """
+    with session_scope(TEST_SESSION) as session:
+        patient_count = session.query(Patient).count()
+
+    patients = list(generate_patients(200, seed=5, places=PLACES))
+    bulk_add_patients(patients, chunk_size=64, session_object=TEST_SESSION)
+
+    path = os.path.join(os.path.dirname(TEST_DB_PATH), 'test_generated.csv')
+    assert write_csv(iter(patients), path, chunk_size=64) == 200
+    report = import_patients(path, session_object=TEST_SESSION)
+    os.remove(path)
+    assert (report.imported, report.rejected) == (200, 0)
+
+    with session_scope(TEST_SESSION) as session:
+        assert session.query(Patient).count() == patient_count + 400
+        assert session.query(Measurement).count() == 2 * sum('measured_on' in patient for patient in patients)
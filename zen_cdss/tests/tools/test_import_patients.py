@@ -0,0 +1,134 @@
+"""
+Testing the patient importer.
+"""
+import os
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Address, Diagnosis, Patient
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_DB_PATH, TEST_ENGINE, TEST_SESSION, drop_test_database
+from zen_cdss.tools import import_patients as import_patients_module
+from zen_cdss.tools.import_patients import get_column_mapping, import_patients
+
+HEADERS = ['First Name', 'Last_Name', 'Sex', 'DOB', 'Address', 'Province', 'Phone', 'Diagnosis', 'Diagnosis Date',
+           'Notes', 'Weight (kg)', 'Height']
+ROWS = [
+    ['Sita', 'Sharma', 'F', '03-02-1980', 'Some Street', 'Bagmati', '9800000000', 'T2DM', '2019-05-01', 'ignored',
+     '60', '160'],
+    ['Ram', 'Thapa', 'male', '1975-11-30', '', '', '', '', '', '', '', ''],
+    ['', 'Nameless', 'M', '1990-01-01', '', '', '', '', '', '', '', ''],
+    ['Hari', 'Rai', 'X', '1990-01-01', '', '', '', '', '', '', '', ''],
+    ['Gita', 'Gurung', 'F', 'not a date', '', '', '', '', '', '', '', ''],
+    ['', '', '', '', '', '', '', '', '', '', '', ''],
+]
+IMPORT_DIRECTORY = os.path.dirname(TEST_DB_PATH)
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def check_import(path: str):
+    """
+    Import the file provided and check the rows were imported or rejected as expected.
+    :param path: Path of the file to import.
+    """
+    with session_scope(TEST_SESSION) as session:
+        patient_count = session.query(Patient).count()
+        address_count = session.query(Address).count()
+
+    rejected_path = os.path.join(IMPORT_DIRECTORY, 'test_rejected.csv')
+    report = import_patients(path, chunk_size=2, session_object=TEST_SESSION, rejected_path=rejected_path)
+    rejected = pd.read_csv(rejected_path, dtype=str, keep_default_na=False)
+    os.remove(path)
+    os.remove(rejected_path)
+
+    assert (report.rows, report.imported, report.rejected) == (5, 2, 3)
+    assert [row.row_number for row in report.first_rejected] == [4, 5, 6]
+    assert report.first_rejected[0].reason == 'Missing first_name'
+    assert report.first_rejected[1].reason == 'Expected gender to be "M" or "F". Got: X'
+    assert rejected.columns.tolist() == ['row_number', 'reason', *HEADERS]
+    assert rejected['row_number'].tolist() == ['4', '5', '6']
+    assert rejected['reason'].tolist() == [row.reason for row in report.first_rejected]
+    assert rejected['Last_Name'][0] == 'Nameless'
+
+    with session_scope(TEST_SESSION) as session:
+        assert session.query(Patient).count() == patient_count + 2
+        assert session.query(Address).count() == address_count + 1  # Ram has no address, so no row is created.
+
+        sita = session.query(Patient).filter(Patient.first_name == 'Sita').order_by(Patient.id.desc()).first()
+        assert sita.date_of_birth == date(1980, 2, 3)
+        assert sita.address[0].province.province == 'Bagmati'
+        assert sita.contact_details[0].phone_number == '9800000000'
+        assert session.query(Diagnosis).filter(Diagnosis.patient_id == sita.id).one().advent == date(2019, 5, 1)
+        assert sita.measurement[0].bmi == 23.4
+
+
+def test_import_csv():
+    """
+    Test importing a CSV file.
+    """
+    path = os.path.join(IMPORT_DIRECTORY, 'test_import.csv')
+    with open(path, 'w', encoding='utf-8') as open_file:
+        open_file.write('\n'.join(','.join(row) for row in [HEADERS, *ROWS]))
+
+    check_import(path)
+
+
+def test_import_excel():
+    """
+    Test importing an Excel workbook, with date cells and numeric phone numbers.
+    """
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.append(HEADERS)
+    for row in ROWS:
+        worksheet.append([None if value == '' else value for value in row])
+    worksheet['D2'] = datetime(1980, 2, 3)
+    worksheet['G2'] = 9800000000
+
+    path = os.path.join(IMPORT_DIRECTORY, 'test_import.xlsx')
+    workbook.save(path)
+
+    check_import(path)
+
+
+def test_get_column_mapping():
+    """
+    Test that files missing required columns are refused.
+    """
+    assert get_column_mapping(HEADERS)[3] == 'date_of_birth'
+    with pytest.raises(ValueError):
+        get_column_mapping(['First Name', 'Last Name', 'Gender'])
+
+
+def test_import_reports_first_rejections(monkeypatch):
+    """
+    Test that only the first rejected rows are kept in the report, while every rejected row is counted.
+    """
+    monkeypatch.setattr(import_patients_module, 'REPORTED_REJECTIONS', 2)
+    path = os.path.join(IMPORT_DIRECTORY, 'test_import_rejections.csv')
+    with open(path, 'w', encoding='utf-8') as open_file:
+        open_file.write('\n'.join(','.join(row) for row in [HEADERS, *ROWS]))
+
+    report = import_patients(path, session_object=TEST_SESSION)
+    os.remove(path)
+    assert report.rejected == 3
+    assert [row.row_number for row in report.first_rejected] == [4, 5]
@@ -0,0 +1,64 @@
+"""
+Testing the loading of scraped ADRs into the ADR knowledge base.
+"""
+import os
+import tempfile
+from datetime import timedelta
+
+import zen_cdss.database.base as backend_base
+from zen_cdss.database.adrs import get_drug_reactions_select
+from zen_cdss.database.utils import session_scope
+from zen_cdss.tests.database import TEST_ENGINE, TEST_SESSION, drop_test_database
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS
+from zen_cdss.tools.load_adrs import load_all_adrs, read_json_directory
+from zen_cdss.vigiaccess.cache import AdrCache
+from zen_cdss.vigiaccess.pool import dump_to_json
+
+TEMPORARY_DIRECTORY = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    backend_base.Base.metadata.create_all(TEST_ENGINE)
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    TEMPORARY_DIRECTORY.cleanup()
+    drop_test_database()
+
+
+def test_read_json_directory():
+    """
+    Test reading the JSON files written by the scraper, ignoring other files.
+    """
+    json_directory = os.path.join(TEMPORARY_DIRECTORY.name, 'json')
+    os.makedirs(json_directory)
+    for drug, data in EXPECTED_ADRS.items():
+        dump_to_json(data, os.path.join(json_directory, f'{drug}.json'))
+    with open(os.path.join(json_directory, 'notes.txt'), 'w', encoding='utf-8') as open_file:
+        open_file.write('Not ADRs.')
+
+    assert read_json_directory(json_directory) == EXPECTED_ADRS
+
+
+def test_load_all_adrs():
+    """
+    Test loading every cached drug, a transaction per chunk.
+    """
+    cache = AdrCache(os.path.join(TEMPORARY_DIRECTORY.name, 'adr_cache.db'), ttl=timedelta(days=1))
+    for drug, data in EXPECTED_ADRS.items():
+        cache.put(drug, data)
+    adrs = [(entry.drug, entry.data) for entry in cache.get_entries()]
+    cache.close()
+
+    assert [drug for drug, _ in adrs] == ['ibuprofen', 'paracetamol']
+    assert load_all_adrs(adrs, chunk_size=1, session_object=TEST_SESSION) == 9
+    with session_scope(TEST_SESSION) as session:
+        assert session.execute(get_drug_reactions_select('ibuprofen')).first() == (
+            'Gastrointestinal disorders', 'dyspepsia', 2
+        )
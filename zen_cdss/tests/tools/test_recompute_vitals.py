@@ -0,0 +1,119 @@
+"""
+Testing the recomputation of stale vitals.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import update
+
+from zen_cdss.database.cache import LOOKUP_CACHE
+from zen_cdss.database.models import Measurement
+from zen_cdss.database.utils import session_scope
+from zen_cdss.formulas import vitals
+from zen_cdss.formulas.panel import get_panel_version
+from zen_cdss.tests.database import TEST_SESSION, add_test_patients, drop_test_database
+from zen_cdss.tools.recompute_vitals import count_stale, recompute_vitals
+
+PATIENT_COUNT = 20
+
+
+def setup_module():
+    """
+    Setup test module for testing.
+    """
+    add_test_patients(PATIENT_COUNT, lambda index: {
+        'measured_on': date(2020, 6, 14),
+        'weight': 60 + index,
+        'height': 170,
+        **({'creatinine': 1.1} if index % 3 == 0 else {}),
+    })
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    LOOKUP_CACHE.clear()
+    drop_test_database()
+
+
+def make_stale(*measurement_ids: int):
+    """
+    Mark the measurements provided as computed with other formulas, with wrong vitals.
+    :param measurement_ids: IDs of the measurements.
+    """
+    with session_scope(TEST_SESSION) as session:
+        session.execute(update(Measurement).where(Measurement.id.in_(measurement_ids))
+                        .values(bmi=0, egfr=0, vitals_version='outdated'))
+
+
+def get_vitals():
+    """
+    Returns the BMI and eGFR of every measurement by ID.
+    """
+    with session_scope(TEST_SESSION) as session:
+        return {row.id: (row.bmi, row.egfr) for row in session.query(Measurement.id, Measurement.bmi, Measurement.egfr)}
+
+
+def test_recompute_vitals():
+    """
+    Test that only stale measurements are recomputed, in batches, with progress reported.
+    """
+    expected = get_vitals()
+    assert not recompute_vitals(session_object=TEST_SESSION)  # Nothing is stale after ingestion.
+
+    stale_ids = sorted(expected)[::4]
+    make_stale(*stale_ids)
+    with session_scope(TEST_SESSION) as session:
+        session.execute(update(Measurement).where(Measurement.id == stale_ids[0]).values(vitals_version=None))
+        assert count_stale(session) == len(stale_ids)
+
+    progress = []
+    reports = recompute_vitals(batch_size=2, session_object=TEST_SESSION, on_batch=progress.append)
+
+    assert reports == progress
+    assert [report.rows for report in reports] == [2, 2, 1]
+    assert reports[-1].recomputed == reports[-1].stale == len(stale_ids)
+    assert reports[-1].progress == 1
+    assert get_vitals() == expected
+
+    with session_scope(TEST_SESSION) as session:
+        assert count_stale(session) == 0
+
+
+def test_recompute_vitals_resumes():
+    """
+    Test that an interrupted run resumes from the first batch it did not commit.
+    """
+    expected = get_vitals()
+    make_stale(*expected)
+
+    def interrupt(report):
+        if report.batch == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        recompute_vitals(batch_size=6, session_object=TEST_SESSION, on_batch=interrupt)
+
+    reports = recompute_vitals(batch_size=6, session_object=TEST_SESSION)
+    assert reports[0].stale == PATIENT_COUNT - 12
+    assert sum(report.rows for report in reports) == PATIENT_COUNT - 12
+    assert get_vitals() == expected
+
+
+def test_recompute_vitals_after_formula_change(monkeypatch):
+    """
+    Test that bumping the version of a formula makes every measurement stale.
+    """
+    version = get_panel_version()
+    monkeypatch.setitem(vitals.FORMULA_VERSIONS, 'egfr', vitals.FORMULA_VERSIONS['egfr'] + 1)
+    assert get_panel_version() != version
+
+    reports = recompute_vitals(batch_size=50, session_object=TEST_SESSION)
+    assert [report.rows for report in reports] == [PATIENT_COUNT]
+
+    with session_scope(TEST_SESSION) as session:
+        assert {row.vitals_version for row in session.query(Measurement.vitals_version)} == {get_panel_version()}
+
+    with pytest.raises(ValueError):
+        recompute_vitals(batch_size=0, session_object=TEST_SESSION)
@@ -0,0 +1,42 @@
+"""
+VigiAccess testing initialization.
+
+The scrapers are tested against a local stand-in for VigiAccess (fixtures/index.html) served on a free port, rather than
+the live site.
+"""
+
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), 'fixtures')
+EXPECTED_ADRS = {
+    'paracetamol': {
+        'Skin and subcutaneous tissue disorders (3)': ['Rash (2)', 'Pruritus (1)'],
+        'Hepatobiliary disorders (2)': ['Hepatotoxicity (1)', 'Hepatitis (1)'],
+        'Gastrointestinal disorders (1)': ['Nausea (1)'],
+    },
+    'ibuprofen': {
+        'Gastrointestinal disorders (4)': ['Dyspepsia (2)', 'Gastric ulcer (1)', 'Melaena (1)'],
+        'Renal and urinary disorders (1)': ['Acute kidney injury (1)'],
+    },
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """
+    Handler serving the fixtures without logging every request.
+    """
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def serve_fixtures() -> ThreadingHTTPServer:
+    """
+    Serve the fixtures on a free local port, in a background thread. Call shutdown() on the server once done.
+    :return: Server object. Its URL is http://localhost:{server.server_port}/.
+    """
+    server = ThreadingHTTPServer(('localhost', 0), partial(QuietHandler, directory=FIXTURES_PATH))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,105 @@
+"""
+Testing the on-disk ADR cache, refreshed with scrapers replaying the ADRs of EXPECTED_ADRS.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS
+from zen_cdss.vigiaccess.cache import AdrCache
+
+CACHE_DIRECTORY = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+CACHE_PATH = os.path.join(CACHE_DIRECTORY.name, 'adr_cache.db')
+
+
+def teardown_module():
+    """
+    Teardown post testing.
+    """
+    CACHE_DIRECTORY.cleanup()
+
+
+@contextmanager
+def open_expected_scraper():
+    """
+    Open a scraper replaying EXPECTED_ADRS.
+    """
+    yield lambda drug: EXPECTED_ADRS[drug]
+
+
+@contextmanager
+def open_empty_scraper():
+    """
+    Open a scraper finding no ADR for any drug, like a page that did not load properly.
+    """
+    yield lambda drug: {}
+
+
+@contextmanager
+def open_unreachable_scraper():
+    """
+    Open a scraper failing to reach VigiAccess.
+    """
+    def scrape(drug: str):
+        raise ConnectionError(f'{drug} could not be fetched')
+
+    yield scrape
+
+
+def test_get():
+    """
+    Test cached ADRs are only served while fresh, unless stale ADRs are allowed.
+    """
+    cache = AdrCache(CACHE_PATH, ttl=timedelta(days=1))
+    assert cache.get('paracetamol') is None
+
+    cache.put(' Paracetamol', EXPECTED_ADRS['paracetamol'])
+    cache.put('ibuprofen', EXPECTED_ADRS['ibuprofen'], fetched_at=datetime.now(timezone.utc) - timedelta(days=2))
+    assert cache.get('paracetamol') == EXPECTED_ADRS['paracetamol']
+    assert cache.get('ibuprofen') is None
+    assert cache.get('ibuprofen', allow_stale=True) == EXPECTED_ADRS['ibuprofen']
+    assert cache.get_stale(['ibuprofen', 'PARACETAMOL', 'aspirin', 'ibuprofen']) == ['ibuprofen', 'aspirin']
+
+    cache.close()
+    entry = AdrCache(CACHE_PATH, ttl=timedelta(days=3)).get_entry('ibuprofen')  # Reopened from disk.
+    assert entry.data == EXPECTED_ADRS['ibuprofen']
+    assert timedelta(days=2) <= datetime.now(timezone.utc) - entry.fetched_at < timedelta(days=2, minutes=1)
+
+
+def test_refresh():
+    """
+    Test only missing and stale drugs are scraped, and failed refreshes keep the previous ADRs.
+    """
+    cache = AdrCache(os.path.join(CACHE_DIRECTORY.name, 'refresh.db'), ttl=timedelta(days=1))
+    results = cache.refresh(['paracetamol', 'ibuprofen'], open_expected_scraper, workers=2)
+    assert [result.drug for result in results] == ['paracetamol', 'ibuprofen']
+    assert cache.get('ibuprofen') == EXPECTED_ADRS['ibuprofen']
+    assert not cache.refresh(['paracetamol', 'Ibuprofen'], open_expected_scraper)
+
+    cache.put('ibuprofen', {'Stale disorders (1)': ['Stale (1)']}, datetime.now(timezone.utc) - timedelta(days=2))
+    reported = []
+    [result] = cache.refresh(['paracetamol', 'ibuprofen'], open_unreachable_scraper, retries=0,
+                             retry_on=(ConnectionError,), on_result=reported.append)
+    assert reported == [result]
+    assert (result.drug, result.data) == ('ibuprofen', None)
+    assert cache.get('ibuprofen', allow_stale=True) == {'Stale disorders (1)': ['Stale (1)']}
+
+    assert len(cache.refresh(['ibuprofen'], open_expected_scraper)) == 1
+    assert cache.get('ibuprofen') == EXPECTED_ADRS['ibuprofen']
+    cache.close()
+
+
+def test_refresh_empty():
+    """
+    Test drugs scraped without any ADR are not cached, so they keep their previous ADRs and stay stale.
+    """
+    cache = AdrCache(os.path.join(CACHE_DIRECTORY.name, 'empty.db'), ttl=timedelta(days=1))
+    cache.put('ibuprofen', EXPECTED_ADRS['ibuprofen'], datetime.now(timezone.utc) - timedelta(days=2))
+
+    results = cache.refresh(['ibuprofen', 'aspirin'], open_empty_scraper)
+    assert [(result.drug, result.data) for result in results] == [('ibuprofen', {}), ('aspirin', {})]
+    assert cache.get('ibuprofen', allow_stale=True) == EXPECTED_ADRS['ibuprofen']
+    assert cache.get_entry('aspirin') is None
+    assert cache.get_stale(['ibuprofen', 'aspirin']) == ['ibuprofen', 'aspirin']
+    cache.close()
@@ -0,0 +1,103 @@
+"""
+Testing the pool of VigiAccess scraping workers, with scrapers replaying the ADRs of EXPECTED_ADRS.
+"""
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS
+from zen_cdss.vigiaccess.pool import read_drugs, scrape_drugs
+
+OPENED_SCRAPERS = Counter()
+CALLS = Counter()
+LOCK = threading.Lock()
+
+
+def scrape_expected(drug: str):
+    """
+    Returns the expected ADRs of the drug. "flaky" times out once, "slow" always times out, and "unknown" fails.
+    """
+    with LOCK:
+        CALLS[drug] += 1
+        calls = CALLS[drug]
+
+    if drug == 'slow' or (drug == 'flaky' and calls == 1):
+        raise TimeoutError(f'{drug} did not load')
+
+    if drug == 'unknown':
+        raise KeyError(drug)
+
+    return EXPECTED_ADRS.get(drug, EXPECTED_ADRS['paracetamol'])
+
+
+@contextmanager
+def open_expected_scraper():
+    """
+    Open a scraper replaying EXPECTED_ADRS.
+    """
+    with LOCK:
+        OPENED_SCRAPERS['open'] += 1
+    yield scrape_expected
+    with LOCK:
+        OPENED_SCRAPERS['closed'] += 1
+
+
+def test_scrape_drugs():
+    """
+    Test drugs are shared across workers, retried on timeouts, and written as they are scraped.
+    """
+    drugs = ['paracetamol', 'ibuprofen', 'flaky', 'paracetamol', 'unknown', 'slow']
+    reported = []
+    with tempfile.TemporaryDirectory() as directory:
+        results = scrape_drugs(drugs, open_expected_scraper, workers=3, retries=2, output_directory=directory,
+                               on_result=reported.append)
+
+        assert sorted(os.listdir(directory)) == ['flaky.json', 'ibuprofen.json', 'paracetamol.json']
+        with open(os.path.join(directory, 'ibuprofen.json'), encoding='utf-8') as open_file:
+            assert json.load(open_file) == EXPECTED_ADRS['ibuprofen']
+
+    assert [result.drug for result in results] == ['paracetamol', 'ibuprofen', 'flaky', 'unknown', 'slow']
+    assert sorted(reported) == sorted(results)
+    assert OPENED_SCRAPERS == {'open': 3, 'closed': 3}
+    assert CALLS['paracetamol'] == 1
+
+    paracetamol, ibuprofen, flaky, unknown, slow = results
+    assert (paracetamol.data, paracetamol.attempts, paracetamol.error) == (EXPECTED_ADRS['paracetamol'], 1, None)
+    assert ibuprofen.data == EXPECTED_ADRS['ibuprofen']
+    assert (flaky.attempts, flaky.error) == (2, None)
+    assert (unknown.data, unknown.attempts) == (None, 1)  # Only timeouts are retried.
+    assert 'KeyError' in unknown.error
+    assert (slow.data, slow.attempts) == (None, 3)
+    assert 'TimeoutError' in slow.error
+
+
+def test_scrape_drugs_without_scraper():
+    """
+    Test errors opening the scrapers of the workers are raised.
+    """
+    @contextmanager
+    def open_broken_scraper():
+        raise RuntimeError('No browser')
+        yield  # pylint: disable=unreachable
+
+    with pytest.raises(RuntimeError):
+        scrape_drugs(['paracetamol', 'ibuprofen'], open_broken_scraper, workers=2)
+
+    assert not scrape_drugs([], open_broken_scraper)
+
+
+def test_read_drugs():
+    """
+    Test reading a list of drugs from a file.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'formulary.txt')
+        with open(path, 'w', encoding='utf-8') as open_file:
+            open_file.write('paracetamol\n\n  ibuprofen \n')
+
+        assert read_drugs(path) == ['paracetamol', 'ibuprofen']
@@ -0,0 +1,67 @@
+"""
+Testing the Selenium VigiAccess scraper against the local stand-in for VigiAccess. Tests needing Chrome are skipped
+without it.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from zen_cdss import ROOT_PATH
+from zen_cdss.tests.vigiaccess import EXPECTED_ADRS, serve_fixtures
+from zen_cdss.vigiaccess.pool import scrape_drugs
+from zen_cdss.vigiaccess.scraper import create_driver, open_browser_scraper, open_driver, scrape
+
+
+@pytest.fixture(scope='module', name='url')
+def fixture_url():
+    """
+    URL of the local stand-in for VigiAccess.
+    """
+    server = serve_fixtures()
+    yield f'http://localhost:{server.server_port}/'
+    server.shutdown()
+
+
+@pytest.fixture(scope='module', name='driver')
+def fixture_driver():
+    """
+    Browser shared by the tests of this module.
+    """
+    try:
+        with open_driver() as driver:
+            yield driver
+    except WebDriverException as error:
+        pytest.skip(f'Chrome is not available: {error.msg}')
+
+
+def test_import():
+    """
+    Test importing the scraper neither imports Selenium nor launches a browser.
+    """
+    code = 'import sys, zen_cdss.vigiaccess.scraper; assert "selenium" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT_PATH, check=True)
+
+
+def test_scrape(driver, url):
+    """
+    Test scraping drugs one after the other with the same browser.
+    """
+    assert scrape('paracetamol', driver, url) == EXPECTED_ADRS['paracetamol']
+    assert scrape('ibuprofen', driver, url) == EXPECTED_ADRS['ibuprofen']
+    assert not scrape('placebo', driver, url)
+
+
+def test_scrape_drugs(driver, url):  # pylint: disable=unused-argument
+    """
+    Test scraping drugs across a pool of browsers, each launched with the factory provided.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        results = scrape_drugs(list(EXPECTED_ADRS), lambda: open_browser_scraper(url, create_driver), workers=2,
+                               output_directory=directory)
+        assert sorted(os.listdir(directory)) == sorted(f'{drug}.json' for drug in EXPECTED_ADRS)
+
+    assert {result.drug: result.data for result in results} == EXPECTED_ADRS
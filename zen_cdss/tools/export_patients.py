@@ -0,0 +1,202 @@
+"""
+Tool to export patients and their related records to Parquet or CSV for analysis.
+
+Patients are written to the path provided and each related record type (addresses, occupations, contact details,
+diagnoses and measurements) to its own file next to it, keyed by patient_id, so patients with several records of a type
+never get a row per combination of them. The derived vitals stored with each measurement can be exported with it.
+
+Rows are streamed from the database a chunk at a time (server-side cursors where the database supports them) and each
+chunk is written out before the next one is read, so memory use stays flat however many patients are exported.
+
+Run with: python -m zen_cdss.tools.export_patients patients.parquet --vitals
+"""
+
+import argparse
+import os
+import time
+from functools import partial
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Type
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Column, Date, Float, Integer, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from zen_cdss.database import base
+from zen_cdss.database.models import Measurement, Patient
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+from zen_cdss.database.queries import PATIENT_COLUMNS, RECORD_COLUMNS, get_records_select
+from zen_cdss.database.utils import session_scope
+from zen_cdss.formulas.panel import VitalsPanel
+
+DEFAULT_CHUNK_SIZE = 50_000
+FILE_FORMATS = ('parquet', 'csv')
+EXPORT_TABLES = ('patient', *RECORD_COLUMNS, 'measurement')
+
+
+class ExportReport(NamedTuple):
+    """
+    Report of an export.
+    """
+    rows: Dict[str, int]  # Rows written, by table (see EXPORT_TABLES).
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Rows written per second, across every table.
+        """
+        return sum(self.rows.values()) / self.seconds if self.seconds else float('inf')
+
+
+def get_export_paths(path: str) -> Dict[str, str]:
+    """
+    Returns the path of the file each table is exported to. Patients are exported to the path provided and every
+    other table next to it, suffixed with its name (e.g. patients.csv, patients.address.csv, etc.).
+    :param path: Path of the patients file.
+    :return: Dictionary of table names (see EXPORT_TABLES) to paths.
+    """
+    root, extension = os.path.splitext(path)
+    return {table: path if table == 'patient' else f'{root}.{table}{extension}' for table in EXPORT_TABLES}
+
+
+def get_export_selects(vitals: bool = False) -> Dict[str, Select]:
+    """
+    Returns a select of every row to export of each table. Related records are selected with the ID of their patient
+    and their lookup values.
+    :param vitals: Whether to include the age and derived vitals stored with each measurement.
+    :return: Dictionary of table names (see EXPORT_TABLES) to select statements.
+    """
+    measurement_columns = ['measured_on', *MEASUREMENT_INPUTS, *(('age', *VitalsPanel._fields) if vitals else ())]
+    return {
+        'patient': select(*PATIENT_COLUMNS.values()).order_by(Patient.id),
+        **{record: get_records_select(record) for record in RECORD_COLUMNS},
+        'measurement': (select(Measurement.patient_id,
+                               *(Measurement.__table__.columns[name] for name in measurement_columns))
+                        .order_by(Measurement.patient_id, Measurement.measured_on)),
+    }
+
+
+def get_arrow_type(column: Column) -> pa.DataType:
+    """
+    Returns the Arrow type of a database column, so every chunk is written with the same schema even when a column
+    happens to only hold nulls in the first chunk.
+    :param column: Database column.
+    :return: Arrow type.
+    """
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def read_export_chunks(session: Session, statement: Select,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream the rows of a select a chunk at a time.
+    :param session: Session to leverage.
+    :param statement: Select to read (see get_export_selects()).
+    :param chunk_size: Amount of rows per chunk.
+    :return: Iterator of dataframes.
+    """
+    # Without yield_per, the ORM buffers every row of the result before returning the first one.
+    result = session.execute(statement, execution_options={'stream_results': True, 'yield_per': chunk_size})
+    for partition in result.partitions():
+        yield pd.DataFrame(partition, columns=list(result.keys()))
+
+
+def write_export(session: Session, statement: Select, path: str, file_format: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, on_chunk: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Write every row of a select to a Parquet or CSV file, a chunk at a time.
+    :param session: Session to leverage.
+    :param statement: Select to write (see get_export_selects()).
+    :param path: Path of the file to write.
+    :param file_format: "parquet" or "csv".
+    :param chunk_size: Amount of rows to read and write at a time.
+    :param on_chunk: Optional callback called with the amount of rows written so far after each chunk.
+    :return: Amount of rows written.
+    """
+    schema = pa.schema([(column.name, get_arrow_type(column)) for column in statement.selected_columns])
+    writer = None
+    rows = 0
+
+    for chunk in read_export_chunks(session, statement, chunk_size):
+        if file_format == 'csv':
+            chunk.to_csv(path, mode='a' if rows else 'w', header=not rows, index=False)
+        else:
+            writer = writer or pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+        rows += len(chunk)
+        if on_chunk is not None:
+            on_chunk(rows)
+
+    if writer is not None:
+        writer.close()
+    elif not rows:  # Still write the columns of empty exports.
+        if file_format == 'csv':
+            pd.DataFrame(columns=schema.names).to_csv(path, index=False)
+        else:
+            pq.write_table(schema.empty_table(), path)
+
+    return rows
+
+
+def export_patients(path: str, file_format: Optional[str] = None, vitals: bool = False,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, session_object: Type[Session] = base.Session,
+                    on_chunk: Optional[Callable[[str, int], None]] = None) -> ExportReport:
+    """
+    Export every patient to a Parquet or CSV file, and each type of their related records to its own file next to it
+    (see get_export_paths()).
+    :param path: Path of the patients file to write.
+    :param file_format: "parquet" or "csv". Defaults to the extension of the path.
+    :param vitals: Whether to include the age and derived vitals stored with each measurement.
+    :param chunk_size: Amount of rows to read and write at a time.
+    :param session_object: Session object to instantiate.
+    :param on_chunk: Optional callback called with the table being written and the amount of its rows written so far
+     after each chunk.
+    :return: Export report.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f'Expected the file format to be one of {FILE_FORMATS}. Got: {file_format}')
+
+    start_time = time.perf_counter()
+    paths = get_export_paths(path)
+    rows = {}
+
+    with session_scope(session_object) as session:
+        for table, statement in get_export_selects(vitals).items():
+            rows[table] = write_export(session, statement, paths[table], file_format, chunk_size,
+                                       None if on_chunk is None else partial(on_chunk, table))
+
+    return ExportReport(rows=rows, seconds=time.perf_counter() - start_time)
+
+
+def main():
+    """
+    Export the patients of the configured database and print a report.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('path', help='Patients file to write (.parquet or .csv). Records are written next to it.')
+    arguments.add_argument('--format', choices=FILE_FORMATS, help='File format. Defaults to the extension of the path.')
+    arguments.add_argument('--vitals', action='store_true', help='Include the age and derived vitals of measurements.')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows to read at a time.')
+    arguments = arguments.parse_args()
+
+    report = export_patients(arguments.path, arguments.format, arguments.vitals, arguments.chunk_size,
+                             on_chunk=lambda table, rows: print(f'Exported {rows:,} {table} rows.'))
+    for table, table_path in get_export_paths(arguments.path).items():
+        print(f'Exported {report.rows[table]:,} {table} rows to {table_path}.')
+
+    print(f'Exported in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s).')
+
+
+if __name__ == '__main__':
+    main()
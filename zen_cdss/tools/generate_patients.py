@@ -0,0 +1,258 @@
+"""
+Tool to generate synthetic patients for load and scale testing.
+
+Patients are generated a chunk at a time with vectorized NumPy draws, in the patient dictionary shape insertions.py
+and bulk_add_patients() expect. Addresses are drawn from the map of Nepal scraped by tools/scrape_map.py, and the
+vitals inputs are drawn from realistic adult ranges, correlated the way they are in practice (weight with height and
+waist, HbA1c with glucose, diastolic with systolic pressure, etc.), so every formula gets plausible inputs. The same
+seed always generates the same patients.
+
+Run with: python -m zen_cdss.tools.generate_patients 1000000 --seed 0
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from zen_cdss import ROOT_PATH
+from zen_cdss.database.bulk import DEFAULT_CHUNK_SIZE, bulk_add_patients, chunked
+from zen_cdss.database.migrations import migrate
+from zen_cdss.tools.import_patients import COLUMN_ALIASES, print_chunk
+
+NEPAL_MAP_PATH = os.path.join(ROOT_PATH, 'src', 'components', 'Forms', 'Patient', 'address_info', 'nepal_map.json')
+
+MALE_FIRST_NAMES = ('Aarav', 'Bikash', 'Dipesh', 'Ganesh', 'Hari', 'Kiran', 'Krishna', 'Manoj', 'Nabin', 'Prakash',
+                    'Rajesh', 'Ram', 'Roshan', 'Sagar', 'Santosh', 'Shyam', 'Suman', 'Sunil', 'Suresh', 'Umesh')
+FEMALE_FIRST_NAMES = ('Anita', 'Asmita', 'Bimala', 'Gita', 'Kabita', 'Kamala', 'Laxmi', 'Maya', 'Nirmala', 'Parbati',
+                      'Pooja', 'Radha', 'Rita', 'Sabina', 'Sarita', 'Sita', 'Srijana', 'Sunita', 'Sushila', 'Usha')
+LAST_NAMES = ('Acharya', 'Adhikari', 'Basnet', 'Bhandari', 'Bhattarai', 'Chaudhary', 'Dahal', 'Gurung', 'Karki',
+              'Khadka', 'Koirala', 'Lama', 'Magar', 'Maharjan', 'Pandey', 'Poudel', 'Rai', 'Shah', 'Sharma',
+              'Shrestha', 'Tamang', 'Thapa', 'Yadav')
+STREETS = ('Marg', 'Tole', 'Chowk', 'Path', 'Galli')
+OCCUPATIONS = (('Teaches at a school', 'Teacher'), ('Farms', 'Farmer'), ('Runs a shop', 'Shopkeeper'),
+               ('Drives', 'Driver'), ('Office work', 'Officer'), ('Nursing', 'Nurse'), ('Construction', 'Laborer'),
+               ('Looks after the household', 'Homemaker'), ('Retired', 'Retired'), ('Studies', 'Student'))
+COMPANIES = ('Nepal Telecom', 'Nepal Electricity Authority', 'Himalayan Bank', 'Nabil Bank', 'Government of Nepal',
+             'Chaudhary Group', 'Nepal Airlines', 'Tribhuvan University', 'Kathmandu Metropolitan City')
+DIAGNOSES = ('Type 2 diabetes mellitus', 'Prediabetes', 'Hypertension', 'Dyslipidemia', 'Type 1 diabetes mellitus')
+RELATIVES = ('Father', 'Mother', 'Father, Mother', 'Sibling', 'Grandparent')
+REFERRALS = ('Self', 'Physician', 'Health camp', 'Relative')
+
+Place = Tuple[str, str, str]  # Province, district and municipality.
+
+
+def load_places(path: str = NEPAL_MAP_PATH) -> List[Place]:
+    """
+    Load every municipality of the map written by tools/scrape_map.py.
+    :param path: Path of the map, a JSON object of provinces to districts to lists of municipalities.
+    :return: List of provinces, districts and municipalities.
+    """
+    with open(path, encoding='utf-8') as open_file:
+        nepal_map = json.load(open_file)
+
+    return [(province, district, municipality) for province, districts in nepal_map.items()
+            for district, municipalities in districts.items() for municipality in municipalities]
+
+
+def draw_dates(rng: np.random.Generator, start: str, end: str, size: int) -> np.ndarray:
+    """
+    Draw dates uniformly between the dates provided.
+    :param rng: Random generator.
+    :param start: First date (YYYY-MM-DD).
+    :param end: Last date (YYYY-MM-DD), excluded.
+    :param size: Amount of dates.
+    :return: Array of datetime64[D] dates.
+    """
+    start_day, end_day = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    return start_day + rng.integers(0, (end_day - start_day).astype(int), size=size)
+
+
+def draw_vitals(rng: np.random.Generator, male: np.ndarray, age: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Draw the raw vitals inputs of a measurement, rounded to the precision they are recorded with.
+    :param rng: Random generator.
+    :param male: Boolean mask of male patients.
+    :param age: Ages of the patients at the measurement.
+    :return: Dictionary of measurement input names (see MEASUREMENT_INPUTS) to arrays.
+    """
+    size = len(male)
+    height = np.where(male, rng.normal(165, 7, size), rng.normal(153, 6, size)).clip(135, 200)
+    bmi = rng.normal(24.5, 4.5, size).clip(15, 50)
+    systolic_bp = (rng.normal(112, 14, size) + 0.4 * age).clip(80, 230)
+    glucose = rng.lognormal(np.log(105), 0.3, size).clip(55, 450)
+
+    return {
+        'weight': (bmi * height * height / 10_000).round(1),
+        'height': height.round(),
+        'waist': (18 + 2.1 * bmi + 0.15 * age + rng.normal(0, 5, size)).clip(55, 160).round(),
+        'systolic_bp': systolic_bp.round(),
+        'diastolic_bp': (0.5 * systolic_bp + rng.normal(16, 7, size)).clip(45, 140).round(),
+        'insulin': rng.lognormal(np.log(9), 0.5, size).clip(1, 80).round(1),
+        'glucose': glucose.round(),
+        'tg': rng.lognormal(np.log(140), 0.45, size).clip(35, 900).round(),
+        'hdl': np.where(male, rng.normal(42, 9, size), rng.normal(50, 10, size)).clip(18, 110).round(),
+        'ggt': rng.lognormal(np.log(28), 0.6, size).clip(5, 500).round(),
+        'alt': rng.lognormal(np.log(26), 0.5, size).clip(5, 400).round(),
+        'ast': rng.lognormal(np.log(24), 0.4, size).clip(5, 400).round(),
+        'creatinine': np.where(male, rng.lognormal(np.log(0.95), 0.2, size),
+                               rng.lognormal(np.log(0.75), 0.2, size)).clip(0.3, 8).round(2),
+        'hba1c': ((glucose + 46.7) / 28.7 + rng.normal(0, 0.4, size)).clip(4, 16).round(1),
+    }
+
+
+# Patient dictionary keys generated together, the share of patients that have them, and the key they require.
+OPTIONAL_KEYS = (
+    (('referred_by',), 0.6, None),
+    (('accompanied_by',), 0.3, None),
+    (('family_diabetics',), 0.4, None),
+    (('occupation_description', 'occupation_title', 'company'), 0.7, None),
+    (('email',), 0.4, None),
+    (('diagnosis', 'diagnosis_advent'), 0.35, None),
+    (('measured_on', 'weight', 'height', 'waist', 'systolic_bp', 'diastolic_bp'), 0.9, None),
+    (('glucose', 'hba1c', 'tg', 'hdl'), 0.6, 'measured_on'),
+    (('insulin',), 0.2, 'measured_on'),
+    (('ggt', 'alt', 'ast'), 0.35, 'measured_on'),
+    (('creatinine',), 0.45, 'measured_on'),
+)
+
+
+def to_patient_dicts(rng: np.random.Generator, columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Build patient dictionaries from generated columns, leaving out the optional keys (see OPTIONAL_KEYS) each patient
+    does not have, the way bulk_add_patients() and the importer expect missing records.
+    :param rng: Random generator.
+    :param columns: Dictionary of patient dictionary keys to arrays of values.
+    :return: List of patient dictionaries.
+    """
+    size = len(next(iter(columns.values())))
+    keep = {key: np.ones(size, dtype=bool) for key in columns}
+    for keys, share, required in OPTIONAL_KEYS:
+        present = rng.random(size) < share
+        if required is not None:
+            present &= keep[required]
+        for key in keys:
+            keep[key] = present
+
+    names = list(columns)
+    rows = zip(*(column.tolist() for column in columns.values()))  # Python values (str, float, date).
+    kept_rows = zip(*(present.tolist() for present in keep.values()))
+    return [{name: value for name, value, kept in zip(names, row, kept_row) if kept}
+            for row, kept_row in zip(rows, kept_rows)]
+
+
+def generate_chunk(rng: np.random.Generator, size: int, places: Sequence[Place]) -> List[Dict[str, Any]]:
+    """
+    Generate a chunk of patients.
+    :param rng: Random generator.
+    :param size: Amount of patients.
+    :param places: Places to draw addresses from (see load_places()).
+    :return: List of patient dictionaries.
+    """
+    male = rng.random(size) < 0.5
+    date_of_birth = draw_dates(rng, '1935-01-01', '2005-01-01', size)
+    registration_date = draw_dates(rng, '2015-01-01', '2022-01-01', size)
+    measured_on = registration_date + rng.integers(0, 365, size)
+    age = ((measured_on - date_of_birth).astype(int) // 365.25).astype(int)
+    place = np.asarray(places)[rng.integers(0, len(places), size)]
+    occupation = rng.integers(0, len(OCCUPATIONS), size)
+    first_name = np.where(male, np.asarray(MALE_FIRST_NAMES)[rng.integers(0, len(MALE_FIRST_NAMES), size)],
+                          np.asarray(FEMALE_FIRST_NAMES)[rng.integers(0, len(FEMALE_FIRST_NAMES), size)])
+    last_name = np.asarray(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), size)]
+    phone = rng.integers(9_800_000_000, 9_870_000_000, size).astype(str)
+
+    columns = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'gender': np.where(male, 'M', 'F'),
+        'date_of_birth': date_of_birth,
+        'registration_date': registration_date,
+        'referred_by': np.asarray(REFERRALS)[rng.integers(0, len(REFERRALS), size)],
+        'accompanied_by': np.asarray(RELATIVES)[rng.integers(0, len(RELATIVES), size)],
+        'family_diabetics': np.asarray(RELATIVES)[rng.integers(0, len(RELATIVES), size)],
+        'address': np.char.add(np.char.add(rng.integers(1, 500, size).astype(str), ' '), np.char.add(
+            last_name, np.char.add(' ', np.asarray(STREETS)[rng.integers(0, len(STREETS), size)]))),
+        'municipality': place[:, 2],
+        'district': place[:, 1],
+        'province': place[:, 0],
+        'occupation_description': np.asarray(OCCUPATIONS)[occupation, 0],
+        'occupation_title': np.asarray(OCCUPATIONS)[occupation, 1],
+        'company': np.asarray(COMPANIES)[rng.integers(0, len(COMPANIES), size)],
+        'email': np.char.add(np.char.add(np.char.lower(first_name), '.'), np.char.add(phone, '@example.com')),
+        'phone': phone,
+        'diagnosis': np.asarray(DIAGNOSES)[rng.integers(0, len(DIAGNOSES), size)],
+        'diagnosis_advent': date_of_birth + ((registration_date - date_of_birth).astype(int) *
+                                             rng.uniform(0.6, 1, size)).astype(int),
+        'measured_on': measured_on,
+        **draw_vitals(rng, male, age),
+    }
+
+    return to_patient_dicts(rng, columns)
+
+
+def generate_patients(count: int, seed: int = 0, places: Optional[Sequence[Place]] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily generate synthetic patients, a chunk at a time.
+    :param count: Amount of patients.
+    :param seed: Random seed. The same seed and chunk size always generate the same patients.
+    :param places: Places to draw addresses from. Defaults to every municipality of NEPAL_MAP_PATH.
+    :param chunk_size: Amount of patients generated at a time.
+    :return: Iterator of patient dictionaries.
+    """
+    rng = np.random.default_rng(seed)
+    places = load_places() if places is None else places
+    for start in range(0, count, chunk_size):
+        yield from generate_chunk(rng, min(chunk_size, count - start), places)
+
+
+def write_csv(patient_dicts: Iterator[Dict[str, Any]], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Write patients to a CSV file the importer (see tools/import_patients.py) can read.
+    :param patient_dicts: Patient dictionaries.
+    :param path: Path of the CSV file.
+    :param chunk_size: Amount of patients written at a time.
+    :return: Amount of patients written.
+    """
+    written = 0
+    for chunk in chunked(patient_dicts, chunk_size):
+        frame = pd.DataFrame(chunk, columns=list(COLUMN_ALIASES))
+        frame.to_csv(path, mode='a' if written else 'w', header=not written, index=False)
+        written += len(chunk)
+
+    return written
+
+
+def main():
+    """
+    Generate patients and write them to the configured database, or to a CSV file.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('count', type=int, help='Amount of patients to generate.')
+    arguments.add_argument('--seed', type=int, default=0, help='Random seed.')
+    arguments.add_argument('--map', default=NEPAL_MAP_PATH, help='Map of Nepal written by tools/scrape_map.py.')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Patients per transaction.')
+    arguments.add_argument('--csv', help='Write the patients to this CSV file instead of the database.')
+    arguments = arguments.parse_args()
+
+    start_time = time.perf_counter()
+    patient_dicts = generate_patients(arguments.count, arguments.seed, load_places(arguments.map), arguments.chunk_size)
+    if arguments.csv:
+        write_csv(patient_dicts, arguments.csv, arguments.chunk_size)
+        destination = arguments.csv
+    else:
+        migrate()
+        bulk_add_patients(patient_dicts, arguments.chunk_size, on_chunk=print_chunk)
+        destination = 'the database'
+
+    seconds = time.perf_counter() - start_time
+    print(f'Generated {arguments.count:,} patients into {destination} in {seconds:.1f}s '
+          f'({arguments.count / seconds:,.0f} patients/s).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Tool to import patients from the clinic's Excel (.xlsx) or CSV exports.
+
+Files are streamed a chunk of rows at a time (read-only openpyxl worksheets or chunked read_csv), each row is mapped to
+the patient dictionary shape insertions.py expects, and valid rows are written through bulk_add_patients(). Rows that
+are missing required values or hold invalid ones are rejected without failing the rest of the import, and streamed to
+an optional CSV file as they are rejected, so bad rows are never held in memory either.
+
+Run with: python -m zen_cdss.tools.import_patients patients.xlsx --rejected rejected.csv
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from contextlib import nullcontext
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+import pandas as pd
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+
+from zen_cdss.database import base
+from zen_cdss.database.bulk import DEFAULT_CHUNK_SIZE, ChunkReport, bulk_add_patients, normalize_patient
+from zen_cdss.database.migrations import migrate
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+from zen_cdss.database.utils import parse_date
+
+# Patient dictionary keys and the (normalized) column headers that map to them.
+COLUMN_ALIASES = {
+    'first_name': ('first name', 'firstname', 'given name'),
+    'last_name': ('last name', 'lastname', 'surname', 'family name'),
+    'gender': ('gender', 'sex'),
+    'date_of_birth': ('date of birth', 'dob', 'birth date', 'birthdate'),
+    'registration_date': ('registration date', 'registered', 'date of registration'),
+    'referred_by': ('referred by', 'referral'),
+    'accompanied_by': ('accompanied by',),
+    'family_diabetics': ('family diabetics', 'family history'),
+    'address': ('address', 'street', 'tole'),
+    'village': ('village', 'ward'),
+    'municipality': ('municipality',),
+    'district': ('district',),
+    'province': ('province',),
+    'occupation_description': ('occupation', 'occupation description'),
+    'occupation_title': ('occupation title', 'job title'),
+    'company': ('company', 'employer'),
+    'email': ('email', 'e-mail', 'email address'),
+    'phone': ('phone', 'phone number', 'mobile', 'contact number'),
+    'diagnosis': ('diagnosis',),
+    'diagnosis_advent': ('diagnosis advent', 'diagnosis date', 'date of diagnosis', 'advent'),
+    'measured_on': ('measured on', 'measurement date', 'visit date'),
+    'weight': ('weight', 'weight (kg)'),
+    'height': ('height', 'height (cm)'),
+    'waist': ('waist', 'waist (cm)', 'waist circumference'),
+    'systolic_bp': ('systolic bp', 'systolic', 'sbp'),
+    'diastolic_bp': ('diastolic bp', 'diastolic', 'dbp'),
+    'insulin': ('insulin', 'fasting insulin'),
+    'glucose': ('glucose', 'fasting glucose', 'fbs'),
+    'tg': ('tg', 'triglycerides'),
+    'hdl': ('hdl', 'hdl cholesterol'),
+    'ggt': ('ggt',),
+    'alt': ('alt', 'sgpt'),
+    'ast': ('ast', 'sgot'),
+    'creatinine': ('creatinine', 'serum creatinine'),
+    'hba1c': ('hba1c',),
+}
+HEADER_LOOKUP = {alias: key for key, aliases in COLUMN_ALIASES.items() for alias in (key.replace('_', ' '), *aliases)}
+REQUIRED_KEYS = ('first_name', 'last_name', 'gender', 'date_of_birth')
+REPORTED_REJECTIONS = 10  # Rejected rows kept in import reports. Any further ones are only counted.
+
+
+class RejectedRow(NamedTuple):
+    """
+    Row of the file that could not be imported.
+    """
+    row_number: int
+    reason: str
+
+
+class ImportReport(NamedTuple):
+    """
+    Report of an import.
+    """
+    rows: int
+    imported: int
+    rejected: int
+    first_rejected: List[RejectedRow]  # The first REPORTED_REJECTIONS rejected rows.
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Rows read per second.
+        """
+        return self.rows / self.seconds if self.seconds else float('inf')
+
+
+def normalize_header(header: Any) -> str:
+    """
+    Normalize a column header for matching against COLUMN_ALIASES (lower case, single spaces, no underscores).
+    :param header: Column header.
+    :return: Normalized header.
+    """
+    return re.sub(r'[\s_]+', ' ', str(header)).strip().lower()
+
+
+def get_column_mapping(headers: Sequence[Any]) -> Dict[int, str]:
+    """
+    Map the columns of a file to patient dictionary keys. Unknown columns are ignored.
+    :param headers: Column headers of the file.
+    :return: Dictionary of column positions to patient dictionary keys.
+    """
+    mapping = {position: HEADER_LOOKUP[normalize_header(header)] for position, header in enumerate(headers)
+               if header is not None and normalize_header(header) in HEADER_LOOKUP}
+
+    missing = set(REQUIRED_KEYS).difference(mapping.values())
+    if missing:
+        raise ValueError(f'Missing required columns: {", ".join(sorted(missing))}. Got: {list(headers)}')
+
+    return mapping
+
+
+def read_excel_rows(path: str, sheet: Optional[str] = None) -> Iterator[Tuple[int, Sequence[Any]]]:
+    """
+    Stream the rows of an Excel workbook without loading the whole workbook in memory.
+    :param path: Path of the workbook.
+    :param sheet: Name of the worksheet to read. Defaults to the active worksheet.
+    :return: Iterator of row numbers and row values, starting with the header row.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.active if sheet is None else workbook[sheet]
+        yield from enumerate(worksheet.iter_rows(values_only=True), start=1)
+    finally:
+        workbook.close()
+
+
+def read_csv_rows(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, Sequence[Any]]]:
+    """
+    Stream the rows of a CSV file a chunk at a time.
+    :param path: Path of the CSV file.
+    :param chunk_size: Amount of rows to read at a time.
+    :return: Iterator of row numbers and row values, starting with the header row.
+    """
+    row_number = 1
+    yield row_number, list(pd.read_csv(path, dtype=str, nrows=0).columns)
+
+    with pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size) as chunks:
+        for chunk in chunks:
+            for values in chunk.itertuples(index=False, name=None):
+                row_number += 1
+                yield row_number, values
+
+
+def to_patient_dict(values: Sequence[Any], mapping: Dict[int, str]) -> Dict[str, Any]:
+    """
+    Map the values of a row to a patient dictionary, parsing and validating them the way the models do.
+    :param values: Row values.
+    :param mapping: Column mapping (see get_column_mapping()).
+    :return: Patient dictionary. Empty cells are left out, so they do not create empty address, occupation, etc. rows.
+    """
+    patient_dict = {}
+    for position, key in mapping.items():
+        value = values[position] if position < len(values) else None
+        if isinstance(value, datetime):  # Excel date cells.
+            value = value.date()
+        elif value is not None and not isinstance(value, date):
+            value = str(value).strip()
+
+        if value not in (None, ''):
+            patient_dict[key] = value
+
+    missing = [key for key in REQUIRED_KEYS if key not in patient_dict]
+    if missing:
+        raise ValueError(f'Missing {", ".join(missing)}')
+
+    patient_dict.update(normalize_patient(patient_dict))
+    for key in ('diagnosis_advent', 'measured_on'):
+        if key in patient_dict:
+            patient_dict[key] = parse_date(patient_dict[key])
+    for key in MEASUREMENT_INPUTS:
+        if key in patient_dict:
+            patient_dict[key] = float(patient_dict[key])
+
+    return patient_dict
+
+
+def import_patients(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, sheet: Optional[str] = None,
+                    session_object: Type[Session] = base.Session,
+                    on_chunk: Optional[Callable[[ChunkReport], None]] = None,
+                    rejected_path: Optional[str] = None) -> ImportReport:
+    """
+    Import every patient of an Excel or CSV file.
+    :param path: Path of the file. Files ending in .xlsx/.xlsm are read as workbooks, anything else as CSV.
+    :param chunk_size: Amount of rows to read and write at a time.
+    :param sheet: Worksheet to read from workbooks. Defaults to the active worksheet.
+    :param session_object: Session object to instantiate for each chunk written.
+    :param on_chunk: Optional callback called with the report of each chunk written (see bulk_add_patients()).
+    :param rejected_path: Optional CSV file to write rejected rows to as they are rejected, with the columns of the file
+     imported preceded by the row number and the reason each row was rejected.
+    :return: Import report.
+    """
+    start_time = time.perf_counter()
+    is_excel = os.path.splitext(path)[1].lower() in {'.xlsx', '.xlsm'}
+    rows = read_excel_rows(path, sheet) if is_excel else read_csv_rows(path, chunk_size)
+    first_rejected = []
+    counts = {'rows': 0, 'imported': 0, 'rejected': 0}
+
+    with open(rejected_path, 'w', encoding='utf-8', newline='') if rejected_path else nullcontext() as rejected_file:
+        rejected_writer = csv.writer(rejected_file) if rejected_file else None
+
+        def get_patient_dicts() -> Iterator[Dict[str, Any]]:
+            _, headers = next(rows, (None, []))
+            mapping = get_column_mapping(headers)
+            if rejected_writer:
+                rejected_writer.writerow(['row_number', 'reason', *headers])
+
+            for row_number, values in rows:
+                if all(value is None or value == '' for value in values):  # Trailing blank rows of spreadsheets.
+                    continue
+
+                counts['rows'] += 1
+                try:
+                    patient_dict = to_patient_dict(values, mapping)
+                except (OverflowError, TypeError, ValueError) as error:
+                    counts['rejected'] += 1
+                    if len(first_rejected) < REPORTED_REJECTIONS:
+                        first_rejected.append(RejectedRow(row_number, str(error)))
+                    if rejected_writer:
+                        rejected_writer.writerow([row_number, str(error), *values])
+                    continue
+
+                counts['imported'] += 1
+                yield patient_dict
+
+        bulk_add_patients(get_patient_dicts(), chunk_size, session_object, on_chunk)
+
+    return ImportReport(rows=counts['rows'], imported=counts['imported'], rejected=counts['rejected'],
+                        first_rejected=first_rejected, seconds=time.perf_counter() - start_time)
+
+
+def print_chunk(report: ChunkReport):
+    """
+    Print the progress of a chunk written.
+    :param report: Report of the chunk.
+    """
+    print(f'Chunk {report.chunk}: {report.patients:,} patients ({report.patients_per_second:,.0f} patients/s)')
+
+
+def main():
+    """
+    Import patients from the file provided and print a report.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('path', help='Excel (.xlsx) or CSV file to import.')
+    arguments.add_argument('--sheet', help='Worksheet to import from workbooks. Defaults to the active worksheet.')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per transaction.')
+    arguments.add_argument('--rejected', help='CSV file to write rejected rows to.')
+    arguments = arguments.parse_args()
+
+    migrate()
+    report = import_patients(arguments.path, arguments.chunk_size, arguments.sheet, on_chunk=print_chunk,
+                             rejected_path=arguments.rejected)
+    print(f'Imported {report.imported:,} of {report.rows:,} rows in {report.seconds:.1f}s '
+          f'({report.rows_per_second:,.0f} rows/s). Rejected {report.rejected:,} rows.')
+
+    for row in report.first_rejected:
+        print(f'  Row {row.row_number}: {row.reason}')
+
+    if arguments.rejected and report.rejected:
+        print(f'Wrote rejected rows to {arguments.rejected}.')
+
+
+if __name__ == '__main__':
+    main()
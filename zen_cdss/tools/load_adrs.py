@@ -0,0 +1,87 @@
+"""
+Tool to load the ADRs scraped from VigiAccess into the ADR knowledge base tables (see database/adrs.py), from the ADR
+cache (see vigiaccess/cache.py) or from a directory of {drug}.json files written by the scraper. The ADRs previously
+loaded for the same drugs are replaced.
+
+Run with: python -m zen_cdss.tools.load_adrs --cache
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterable, Tuple, Type
+
+from sqlalchemy.orm import Session
+
+from zen_cdss import ADR_CACHE_PATH
+from zen_cdss.adr_types import AdrData
+from zen_cdss.database import base
+from zen_cdss.database.adrs import load_adrs
+from zen_cdss.database.bulk import chunked
+from zen_cdss.database.migrations import migrate
+from zen_cdss.database.utils import session_scope
+from zen_cdss.vigiaccess.cache import AdrCache
+
+DEFAULT_CHUNK_SIZE = 500  # Drugs per transaction.
+
+
+def read_json_directory(path: str) -> Dict[str, AdrData]:
+    """
+    Read the {drug}.json files of a directory.
+    :param path: Path of the directory.
+    :return: Dictionary of drugs to their ADRs.
+    """
+    adrs = {}
+    for file_name in sorted(os.listdir(path)):
+        drug, extension = os.path.splitext(file_name)
+        if extension == '.json':
+            with open(os.path.join(path, file_name), encoding='utf-8') as open_file:
+                adrs[drug] = json.load(open_file)
+
+    return adrs
+
+
+def load_all_adrs(adrs: Iterable[Tuple[str, AdrData]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  session_object: Type[Session] = base.Session) -> int:
+    """
+    Load the ADRs of drugs, a transaction per chunk of drugs.
+    :param adrs: Drugs and their ADRs.
+    :param chunk_size: Amount of drugs per transaction.
+    :param session_object: Session object to instantiate.
+    :return: Amount of drug reactions loaded.
+    """
+    loaded = 0
+    for chunk in chunked(adrs, chunk_size):
+        with session_scope(session_object) as session:
+            loaded += load_adrs(session, dict(chunk))
+
+    return loaded
+
+
+def main():
+    """
+    Load ADRs from the ADR cache or a directory of JSON files.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = arguments.add_mutually_exclusive_group(required=True)
+    source.add_argument('--cache', nargs='?', const=ADR_CACHE_PATH,
+                        help=f'ADR cache to load, however old its entries. Defaults to {ADR_CACHE_PATH} without a '
+                             f'path.')
+    source.add_argument('--json-directory', help='Directory of {drug}.json files to load.')
+    arguments.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Drugs per transaction.')
+    arguments = arguments.parse_args()
+
+    start_time = time.perf_counter()
+    if arguments.cache:
+        adrs = [(entry.drug, entry.data) for entry in AdrCache(arguments.cache).get_entries()]
+    else:
+        adrs = list(read_json_directory(arguments.json_directory).items())
+
+    migrate()
+    loaded = load_all_adrs(adrs, arguments.chunk_size)
+    print(f'Loaded {loaded:,} drug reactions of {len(adrs):,} drugs in {time.perf_counter() - start_time:.1f}s.')
+
+
+if __name__ == '__main__':
+    main()
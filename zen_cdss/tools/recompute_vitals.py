@@ -0,0 +1,164 @@
+"""
+Tool to recompute the derived vitals stored with measurements after a formula changes.
+
+Every measurement records the version of the formulas its vitals were computed with (see get_panel_version()), so after
+a formula's version is bumped in vitals.py only the measurements computed with other versions are stale. Those are read
+in batches of increasing ID, evaluated at once (see bulk.evaluate_measurements()) and updated, each batch in its own
+transaction. Batches already committed carry the current version, so an interrupted run resumes where it stopped when
+run again.
+
+Run with: python -m zen_cdss.tools.recompute_vitals
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from zen_cdss.database import base
+from zen_cdss.database.bulk import evaluate_measurements
+from zen_cdss.database.models import Measurement, Patient
+from zen_cdss.database.models.measurement import MEASUREMENT_INPUTS
+from zen_cdss.database.utils import session_scope
+from zen_cdss.formulas.panel import get_panel_version
+
+DEFAULT_BATCH_SIZE = 5_000
+
+
+class BatchReport(NamedTuple):
+    """
+    Progress report of a single batch recomputed by recompute_vitals().
+    """
+    batch: int
+    rows: int
+    recomputed: int  # Rows recomputed so far, including this batch.
+    stale: int  # Stale rows when the run started.
+    seconds: float
+
+    @property
+    def progress(self) -> float:
+        """
+        Share of the stale rows recomputed so far, between 0 and 1.
+        """
+        return min(self.recomputed / self.stale, 1.0) if self.stale else 1.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Rows recomputed per second in this batch.
+        """
+        return self.rows / self.seconds if self.seconds else float('inf')
+
+
+def get_stale_filter(version: str) -> ColumnElement:
+    """
+    Returns the filter of measurements whose vitals were not computed with the version of the formulas provided.
+    :param version: Current version of the formulas (see get_panel_version()).
+    :return: Filter expression.
+    """
+    return or_(Measurement.vitals_version.is_(None), Measurement.vitals_version != version)
+
+
+def count_stale(session: Session, version: Optional[str] = None) -> int:
+    """
+    Count the measurements whose vitals are stale.
+    :param session: Session to leverage.
+    :param version: Current version of the formulas. Defaults to get_panel_version().
+    :return: Amount of stale measurements.
+    """
+    version = version or get_panel_version()
+    return session.execute(select(func.count(Measurement.id)).where(get_stale_filter(version))).scalar()
+
+
+def read_stale_batch(session: Session, version: str, after_id: int, batch_size: int) -> List[Dict[str, Any]]:
+    """
+    Read the next batch of stale measurements, with the inputs of their vitals.
+    :param session: Session to leverage.
+    :param version: Current version of the formulas.
+    :param after_id: ID of the last measurement of the previous batch.
+    :param batch_size: Maximum amount of measurements to read.
+    :return: Measurement rows ordered by ID, holding the ID, the gender of the patient, the age and the raw inputs.
+    """
+    statement = (select(Measurement.id, Patient.gender, Measurement.age,
+                        *(getattr(Measurement, name) for name in MEASUREMENT_INPUTS))
+                 .join(Patient, Measurement.patient_id == Patient.id)
+                 .where(get_stale_filter(version), Measurement.id > after_id)
+                 .order_by(Measurement.id)
+                 .limit(batch_size))
+    return [dict(row._mapping) for row in session.execute(statement)]  # pylint: disable=protected-access
+
+
+def recompute_vitals(batch_size: int = DEFAULT_BATCH_SIZE, session_object: Type[Session] = base.Session,
+                     on_batch: Optional[Callable[[BatchReport], None]] = None) -> List[BatchReport]:
+    """
+    Recompute the derived vitals of every stale measurement.
+    :param batch_size: Amount of measurements to recompute per transaction.
+    :param session_object: Session object to instantiate for each batch.
+    :param on_batch: Optional callback called with the report of each batch after it is committed.
+    :return: List of reports, one per batch.
+    """
+    if batch_size < 1:
+        raise ValueError(f'Expected batch size to be a positive integer. Got: {batch_size}')
+
+    version = get_panel_version()
+    with session_scope(session_object) as session:
+        stale = count_stale(session, version)
+
+    reports = []
+    after_id = 0
+    recomputed = 0
+    while True:
+        start_time = time.perf_counter()
+        with session_scope(session_object) as session:
+            measurements = read_stale_batch(session, version, after_id, batch_size)
+            if not measurements:
+                break
+
+            session.bulk_update_mappings(Measurement, evaluate_measurements(measurements))
+
+        after_id = measurements[-1]['id']
+        recomputed += len(measurements)
+        report = BatchReport(batch=len(reports) + 1, rows=len(measurements), recomputed=recomputed, stale=stale,
+                             seconds=time.perf_counter() - start_time)
+        reports.append(report)
+
+        if on_batch is not None:
+            on_batch(report)
+
+    return reports
+
+
+def print_batch(report: BatchReport):
+    """
+    Print the progress of a batch recomputed.
+    :param report: Report of the batch.
+    """
+    print(f'Batch {report.batch}: {report.recomputed:,} of {report.stale:,} measurements ({report.progress:.1%}, '
+          f'{report.rows_per_second:,.0f} rows/s)')
+
+
+def main():
+    """
+    Recompute the stale vitals of the configured database and print the progress.
+    """
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per transaction.')
+    arguments.add_argument('--dry-run', action='store_true', help='Only count the stale measurements.')
+    arguments = arguments.parse_args()
+
+    if arguments.dry_run:
+        with session_scope() as session:
+            print(f'{count_stale(session):,} measurements are stale.')
+        return
+
+    reports = recompute_vitals(arguments.batch_size, on_batch=print_batch)
+    recomputed = reports[-1].recomputed if reports else 0
+    seconds = sum(report.seconds for report in reports)
+    print(f'Recomputed {recomputed:,} measurements in {seconds:.1f}s.')
+
+
+if __name__ == '__main__':
+    main()
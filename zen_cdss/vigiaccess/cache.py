@@ -0,0 +1,175 @@
+"""
+On-disk cache of the ADRs scraped from VigiAccess, one row per drug along with when it was fetched.
+
+Drugs fetched within the TTL are served straight from disk, so the CDSS can look up the ADRs of a drug without ever
+waiting on a browser, and refresh() only scrapes the drugs that are missing or stale. A failed refresh keeps the
+previous entry, and so does a refresh finding no ADR at all (more likely a page that did not load properly than a drug
+that lost its reports), rather than hiding the drug from refreshes for a whole TTL. The cache is a table of its own
+SQLite file (stdlib sqlite3), so scrapers can fill it anywhere and ship it, independently of the application database.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, ContextManager, Iterable, List, NamedTuple, Optional
+
+from zen_cdss import ADR_CACHE_PATH, ADR_CACHE_TTL_DAYS
+from zen_cdss.adr_types import AdrData, normalize_drug
+from zen_cdss.vigiaccess.pool import Scraper, ScrapeResult, scrape_drugs
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS adr_cache (
+    drug TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+'''
+
+
+class CacheEntry(NamedTuple):
+    """
+    ADRs of a drug, as fetched at a point in time.
+    """
+    drug: str
+    data: AdrData
+    fetched_at: datetime
+
+
+def to_entry(drug: str, data: str, fetched_at: float) -> CacheEntry:
+    """
+    Convert a row of the cache table to a cache entry.
+    :param drug: Normalized drug name.
+    :param data: ADRs as JSON.
+    :param fetched_at: Timestamp of when the ADRs were fetched.
+    :return: Cache entry.
+    """
+    return CacheEntry(drug, json.loads(data), datetime.fromtimestamp(fetched_at, timezone.utc))
+
+
+class AdrCache:
+    """
+    Cache of the ADRs of drugs in a SQLite file, whose entries are fresh for a time to live. The file is opened on first
+    use and shared by every thread.
+    """
+
+    def __init__(self, path: str = ADR_CACHE_PATH, ttl: timedelta = timedelta(days=ADR_CACHE_TTL_DAYS)):
+        self.path = path
+        self.ttl = ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _execute(self, statement: str, parameters: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Execute a statement in its own transaction, opening the cache file if needed.
+        :param statement: SQL statement.
+        :param parameters: Parameters of the statement.
+        :return: Rows returned by the statement.
+        """
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+                self._connection.execute(SCHEMA)
+
+            with self._connection:
+                return self._connection.execute(statement, tuple(parameters)).fetchall()
+
+    def close(self):
+        """
+        Close the cache file. It is opened again on next use.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def is_fresh(self, entry: CacheEntry, now: Optional[datetime] = None) -> bool:
+        """
+        Returns whether the entry is within the TTL.
+        :param entry: Cache entry.
+        :param now: Current time. Defaults to now.
+        :return: Whether the entry is fresh.
+        """
+        return (now or datetime.now(timezone.utc)) - entry.fetched_at < self.ttl
+
+    def get_entry(self, drug: str) -> Optional[CacheEntry]:
+        """
+        Get the cached ADRs of a drug, however old they are.
+        :param drug: Drug name.
+        :return: Cache entry, or None if the drug was never fetched.
+        """
+        rows = self._execute('SELECT drug, data, fetched_at FROM adr_cache WHERE drug = ?', [normalize_drug(drug)])
+        return to_entry(*rows[0]) if rows else None
+
+    def get_entries(self) -> List[CacheEntry]:
+        """
+        Get every cached entry, however old.
+        :return: List of cache entries ordered by drug.
+        """
+        return [to_entry(*row) for row in self._execute('SELECT drug, data, fetched_at FROM adr_cache ORDER BY drug')]
+
+    def get(self, drug: str, allow_stale: bool = False) -> Optional[AdrData]:
+        """
+        Get the cached ADRs of a drug. Never scrapes, so it returns immediately.
+        :param drug: Drug name.
+        :param allow_stale: Whether to return ADRs fetched longer than the TTL ago.
+        :return: Dictionary of ADR categories to their disorders, or None if there are no (fresh) ADRs for the drug.
+        """
+        entry = self.get_entry(drug)
+        if entry is None or not (allow_stale or self.is_fresh(entry)):
+            return None
+
+        return entry.data
+
+    def put(self, drug: str, data: AdrData, fetched_at: Optional[datetime] = None):
+        """
+        Cache the ADRs of a drug, replacing the previous ones.
+        :param drug: Drug name.
+        :param data: Dictionary of ADR categories to their disorders.
+        :param fetched_at: When the ADRs were fetched. Defaults to now.
+        """
+        timestamp = fetched_at.timestamp() if fetched_at else time.time()
+        self._execute('INSERT OR REPLACE INTO adr_cache (drug, data, fetched_at) VALUES (?, ?, ?)',
+                      [normalize_drug(drug), json.dumps(data, ensure_ascii=False), timestamp])
+
+    def get_stale(self, drugs: Iterable[str]) -> List[str]:
+        """
+        Returns which of the drugs provided are not cached or were fetched longer than the TTL ago.
+        :param drugs: Drug names.
+        :return: Normalized names of the drugs to refresh, in the order provided.
+        """
+        drugs = list(dict.fromkeys(normalize_drug(drug) for drug in drugs))
+        oldest = time.time() - self.ttl.total_seconds()
+        fresh = set()
+        for start in range(0, len(drugs), 500):  # Keep below the limit of SQLite parameters.
+            chunk = drugs[start:start + 500]
+            fresh.update(drug for drug, in self._execute(
+                f'SELECT drug FROM adr_cache WHERE fetched_at > ? AND drug IN ({", ".join("?" * len(chunk))})',
+                [oldest, *chunk]
+            ))
+
+        return [drug for drug in drugs if drug not in fresh]
+
+    def refresh(self, drugs: Iterable[str], open_scraper: Callable[[], ContextManager[Scraper]],
+                on_result: Optional[Callable[[ScrapeResult], None]] = None, **kwargs) -> List[ScrapeResult]:
+        """
+        Scrape the drugs provided that are stale (see get_stale()) across a pool of workers, caching each one as soon
+        as it is scraped. Drugs scraped without any ADR are not cached, so they stay stale and are scraped again by the
+        next refresh.
+        :param drugs: Drug names.
+        :param open_scraper: Function opening the scraper of a worker (see pool.scrape_drugs()).
+        :param on_result: Optional callback called with the result of each drug as soon as it is scraped.
+        :param kwargs: Other arguments of pool.scrape_drugs(), e.g. workers or retry_on.
+        :return: Result of each drug scraped.
+        """
+        def cache_result(result: ScrapeResult):
+            if result.data:
+                self.put(result.drug, result.data)
+            if on_result is not None:
+                on_result(result)
+
+        return scrape_drugs(self.get_stale(drugs), open_scraper, on_result=cache_result, **kwargs)
+
+
+ADR_CACHE = AdrCache()
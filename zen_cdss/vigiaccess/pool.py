@@ -0,0 +1,164 @@
+"""
+Pool of workers scraping the adverse drug reactions of many drugs from VigiAccess in parallel.
+
+Every worker opens its own scraper (e.g. a headless browser, see scraper.open_browser_scraper()) and takes drugs from a
+shared queue until it is empty, so a slow drug only holds up one worker. Drugs that time out are retried, and the ADRs
+of each drug are written to their own JSON file as soon as they are scraped, so an interrupted run keeps its progress.
+"""
+
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ContextManager, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from zen_cdss.adr_types import AdrData
+
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 2
+
+Scraper = Callable[[str], AdrData]  # Scrapes the ADRs of the drug provided.
+
+
+class ScrapeResult(NamedTuple):
+    """
+    Result of scraping a drug.
+    """
+    drug: str
+    data: Optional[AdrData]
+    attempts: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def dump_to_json(data: AdrData, path: str):
+    """
+    Dump data provided in JSON format to the path provided.
+    :param data: Data to dump.
+    :param path: Where to dump data.
+    """
+    with open(path, 'w', encoding='utf-8') as open_file:
+        json.dump(data, open_file, ensure_ascii=False, indent=4)
+
+
+def read_drugs(path: str) -> List[str]:
+    """
+    Read the drugs listed in a text file, one per line. Blank lines are ignored.
+    :param path: Path of the file.
+    :return: List of drugs.
+    """
+    with open(path, encoding='utf-8') as open_file:
+        return [line.strip() for line in open_file if line.strip()]
+
+
+def scrape_with_retries(scraper: Scraper, drug: str, retries: int,
+                        retry_on: Tuple[Type[Exception], ...]) -> ScrapeResult:
+    """
+    Scrape a drug, retrying it if it fails with one of the exceptions provided.
+    :param scraper: Scraper to leverage.
+    :param drug: Drug to scrape.
+    :param retries: Amount of times to retry the drug.
+    :param retry_on: Exceptions worth retrying, like timeouts.
+    :return: Result of the last attempt.
+    """
+    start_time = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return ScrapeResult(drug, scraper(drug), attempt, time.perf_counter() - start_time)
+        except retry_on as error:
+            if attempt > retries:
+                return ScrapeResult(drug, None, attempt, time.perf_counter() - start_time, repr(error))
+        except Exception as error:  # pylint: disable=broad-except
+            return ScrapeResult(drug, None, attempt, time.perf_counter() - start_time, repr(error))
+
+
+def run_worker(open_scraper: Callable[[], ContextManager[Scraper]], drugs: 'queue.Queue[str]',
+               results: 'queue.Queue[ScrapeResult]', retries: int, retry_on: Tuple[Type[Exception], ...]):
+    """
+    Scrape drugs from the queue until it is empty.
+    :param open_scraper: Function opening the scraper of the worker.
+    :param drugs: Queue of drugs to scrape.
+    :param results: Queue to put the result of each drug in.
+    :param retries: Amount of times to retry drugs that time out.
+    :param retry_on: Exceptions worth retrying, like timeouts.
+    """
+    with open_scraper() as scraper:
+        while True:
+            try:
+                drug = drugs.get_nowait()
+            except queue.Empty:
+                return
+
+            results.put(scrape_with_retries(scraper, drug, retries, retry_on))
+
+
+def scrape_drugs(drugs: Iterable[str], open_scraper: Callable[[], ContextManager[Scraper]],
+                 workers: int = DEFAULT_WORKERS, retries: int = DEFAULT_RETRIES,
+                 retry_on: Tuple[Type[Exception], ...] = (TimeoutError,), output_directory: Optional[str] = None,
+                 on_result: Optional[Callable[[ScrapeResult], None]] = None) -> List[ScrapeResult]:
+    """
+    Scrape drugs across a pool of workers sharing a queue of drugs.
+    :param drugs: Drugs to scrape. Duplicates are scraped once.
+    :param open_scraper: Function opening the scraper of a worker, like scraper.open_browser_scraper().
+    :param workers: Amount of workers (e.g. browsers) scraping in parallel.
+    :param retries: Amount of times to retry drugs that time out.
+    :param retry_on: Exceptions worth retrying, like timeouts.
+    :param output_directory: Optional directory to write the ADRs of each drug to, as {drug}.json.
+    :param on_result: Optional callback called with the result of each drug as soon as it is scraped.
+    :return: Result of each drug, in the order provided.
+    """
+    drugs = list(dict.fromkeys(drugs))
+    drug_queue: 'queue.Queue[str]' = queue.Queue()
+    for drug in drugs:
+        drug_queue.put(drug)
+
+    result_queue: 'queue.Queue[ScrapeResult]' = queue.Queue()
+    results: Dict[str, ScrapeResult] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_worker, open_scraper, drug_queue, result_queue, retries, retry_on)
+                   for _ in range(min(workers, len(drugs)))]
+
+        # Write the results as they come in, on this thread only, until every drug is done or every worker stopped.
+        while len(results) < len(drugs):
+            try:
+                result = result_queue.get(timeout=0.1)
+            except queue.Empty:
+                if all(future.done() for future in futures) and result_queue.empty():
+                    break
+                continue
+
+            results[result.drug] = result
+            if output_directory is not None and result.data is not None:
+                dump_to_json(result.data, os.path.join(output_directory, f'{result.drug}.json'))
+            if on_result is not None:
+                on_result(result)
+
+        for future in futures:
+            future.result()  # Raise the error of workers whose scraper could not be opened.
+
+    return [results[drug] for drug in drugs]
+
+
+def print_result(result: ScrapeResult):
+    """
+    Print the result of a drug.
+    :param result: Result of a drug.
+    """
+    if result.error is None:
+        print(f'Scraped {result.drug}: {len(result.data)} ADR categories in {result.seconds:.1f}s '
+              f'({result.attempts} attempt(s)).')
+    else:
+        print(f'Failed to scrape {result.drug} after {result.attempts} attempt(s): {result.error}')
+
+
+def print_results(results: Sequence[ScrapeResult]):
+    """
+    Print a summary of the results of a run.
+    :param results: Results of every drug.
+    """
+    failed = [result.drug for result in results if result.error is not None]
+    print(f'Scraped {len(results) - len(failed)}/{len(results)} drugs.' +
+          (f' Failed: {", ".join(failed)}.' if failed else ''))
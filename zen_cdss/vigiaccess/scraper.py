@@ -2,82 +2,129 @@
 
 VigiAccess scraper using Selenium. Only tested with Chrome, so we recommend you leverage Google Chrome.
 
-Please ensure to have a folder called selenium with the the chromedriver executable inside for this to work.
+If there is a folder called selenium with the chromedriver executable inside, that executable is used, otherwise the
+one Selenium finds on your system. Several drugs are scraped in parallel across a pool of headless browsers (see
+pool.py), and the ADRs of each drug are written to {drug}.json as soon as they are scraped.
+
+Run with: python -m zen_cdss.vigiaccess.scraper paracetamol ibuprofen --workers 2
 
 """
 
-import json
+import argparse
 import os
-from typing import Dict, List
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from zen_cdss import ADR_CACHE_PATH, ADR_CACHE_TTL_DAYS
+from zen_cdss.adr_types import AdrData, normalize_drug
+from zen_cdss.vigiaccess.pool import (DEFAULT_RETRIES, DEFAULT_WORKERS, print_result, print_results, read_drugs,
+                                      scrape_drugs)
 
-from selenium import webdriver
-from selenium.webdriver.chrome.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
+# Selenium is imported by the functions leveraging it, so importing this module neither imports it nor launches Chrome.
+# pylint: disable=import-outside-toplevel
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 CHROMEDRIVER_EXECUTABLE: str = 'chromedriver.exe'  # Change this depending on what your executable is called.
 DRIVER_PATH: str = os.path.join(os.getcwd(), 'selenium', CHROMEDRIVER_EXECUTABLE)
 
 URL: str = "http://www.vigiaccess.org/"
-DRIVER: WebDriver = webdriver.Chrome(DRIVER_PATH)
 WAIT_TIME: int = 10
 
+DriverFactory = Callable[[], 'WebDriver']  # Launches a browser, like create_driver().
 
-def dump_to_json(data: Dict[str, List[str]], path: str):
+
+def create_driver(headless: bool = True) -> 'WebDriver':
     """
-    Dump data provided in JSON format to the path provided.
-    :param data: Data to dump.
-    :param path: Where to dump data.
+    Launch Chrome.
+    :param headless: Whether to run the browser without a window.
+    :return: WebDriver object.
     """
-    with open(path, 'w') as open_file:
-        json.dump(data, open_file, indent=4)
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--disable-dev-shm-usage')  # /dev/shm is too small for several browsers in containers.
 
+    service = Service(DRIVER_PATH) if os.path.isfile(DRIVER_PATH) else Service()
+    return webdriver.Chrome(service=service, options=options)
 
-def scrape_adr(drug: str):
+
+@contextmanager
+def open_driver(driver_factory: DriverFactory = create_driver) -> Iterator['WebDriver']:
+    """
+    Launch a browser, and quit it once done. Reuse it to scrape as many drugs as needed.
+    :param driver_factory: Function launching the browser, e.g. partial(create_driver, headless=False).
+    :return: WebDriver object.
+    """
+    driver = driver_factory()
+    try:
+        yield driver
+    finally:
+        driver.quit()
+
+
+def scrape_adr(driver: 'WebDriver') -> AdrData:
     """
     Scrape adverse drug reactions information.
+    :param driver: Browser showing the results of a drug.
+    :return: Dictionary of ADR categories to their disorders.
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.wait import WebDriverWait
+
     # Get the ADRs accordion element and then click it.
-    adr_category_element = DRIVER.find_element_by_xpath("//span[@class='ng-scope' and contains(text(), 'ADR')]")
+    adr_category_element = driver.find_element(By.XPATH, "//span[@class='ng-scope' and contains(text(), 'ADR')]")
     adr_category_element.click()
 
     # Wait until the ADRs section expands.
-    WebDriverWait(DRIVER, WAIT_TIME).until(
+    WebDriverWait(driver, WAIT_TIME).until(
         expected_conditions.presence_of_element_located(
             (By.XPATH, "//div[@class='panel-collapse collapse in']"))
     )
 
     data = {}
-    disorder_categories = DRIVER.find_elements_by_xpath("//li[@class='a2 ng-scope tree-collapsed']")
+    disorder_categories = driver.find_elements(By.XPATH, "//li[@class='a2 ng-scope tree-collapsed']")
     for disorder_category in disorder_categories:
-        arrow = disorder_category.find_element_by_tag_name('i')
+        arrow = disorder_category.find_element(By.TAG_NAME, 'i')
         arrow.click()
 
-        WebDriverWait(DRIVER, WAIT_TIME).until(
+        WebDriverWait(driver, WAIT_TIME).until(
             # Wait until the spinner hides. This guarantees the accordion has loaded.
             expected_conditions.presence_of_element_located(
                 (By.XPATH, "//div[@class='spinner ng-hide']"))
         )
 
-        category, *disorders = disorder_category.find_elements_by_tag_name("span")
+        category, *disorders = disorder_category.find_elements(By.TAG_NAME, "span")
         data[category.text] = [disorder.text for disorder in disorders]
         arrow.click()  # Close this accordion.
 
-    dump_to_json(data, path=f'{drug}.json')
+    return data
 
 
-def scrape(drug: str):
+def scrape(drug: str, driver: 'WebDriver', url: str = URL) -> AdrData:
     """
     Initiate scraping through VigiAccess.
     :param drug: Drug to scrape from VigiAccess.
+    :param driver: Browser to scrape with (see open_driver()).
+    :param url: URL of VigiAccess.
+    :return: Dictionary of ADR categories to their disorders.
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions
+    from selenium.webdriver.support.wait import WebDriverWait
+
     # Launch the website.
-    DRIVER.get(URL)
+    driver.get(url)
 
     # Wait until the tick box appears.
-    tick_box = WebDriverWait(DRIVER, WAIT_TIME).until(
+    tick_box = WebDriverWait(driver, WAIT_TIME).until(
         expected_conditions.presence_of_element_located((By.ID, "acceptTermsCheckBox"))
     )
 
@@ -85,10 +132,10 @@ def scrape(drug: str):
     tick_box.click()
 
     # Click the submit button and enter the query view.
-    DRIVER.find_element_by_tag_name('button').click()
+    driver.find_element(By.TAG_NAME, 'button').click()
 
     # Wait until the query view loads.
-    search_bar = WebDriverWait(DRIVER, WAIT_TIME).until(
+    search_bar = WebDriverWait(driver, WAIT_TIME).until(
         expected_conditions.presence_of_element_located((By.XPATH, "//input[@type='search']"))
     )
 
@@ -96,20 +143,66 @@ def scrape(drug: str):
     search_bar.send_keys(drug + Keys.RETURN)
 
     # Wait for the drug information to load.
-    WebDriverWait(DRIVER, WAIT_TIME).until(  # Wait until the spinner hides. This guarantees the accordion has loaded.
+    WebDriverWait(driver, WAIT_TIME).until(  # Wait until the spinner hides. This guarantees the accordion has loaded.
         expected_conditions.presence_of_element_located(
             (By.XPATH, "//div[@class='spinner ng-hide']"))
     )
 
     # Initiate scraping ADR information.
-    scrape_adr(drug)
+    return scrape_adr(driver)
+
+
+@contextmanager
+def open_browser_scraper(url: str = URL, driver_factory: DriverFactory = create_driver
+                         ) -> Iterator[Callable[[str], AdrData]]:
+    """
+    Launch a browser for a pool worker, and quit it once the worker is done.
+    :param url: URL of VigiAccess.
+    :param driver_factory: Function launching the browser.
+    :return: Function scraping the drug provided with the browser.
+    """
+    with open_driver(driver_factory) as driver:
+        yield partial(scrape, driver=driver, url=url)
 
 
 def main():
     """
     Main driver function.
     """
-    scrape("paracetamol")
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument('drugs', nargs='*', help='Drugs to scrape.')
+    arguments.add_argument('--file', help='Text file of drugs to scrape, one per line (e.g. the formulary).')
+    arguments.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Browsers scraping in parallel.')
+    arguments.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help='Retries of drugs that time out.')
+    arguments.add_argument('--output-directory', default=os.getcwd(), help='Where to write {drug}.json files.')
+    arguments.add_argument('--url', default=URL, help='URL of VigiAccess.')
+    arguments.add_argument('--show-browser', action='store_true', help='Show the browser windows.')
+    arguments.add_argument('--cache', nargs='?', const=ADR_CACHE_PATH,
+                           help=f'Only scrape the drugs missing or stale in this ADR cache, and cache them. Defaults '
+                                f'to {ADR_CACHE_PATH} without a path.')
+    arguments.add_argument('--ttl-days', type=float, default=ADR_CACHE_TTL_DAYS, help='Days cached ADRs stay fresh.')
+    arguments = arguments.parse_args()
+
+    drugs = arguments.drugs + (read_drugs(arguments.file) if arguments.file else [])
+    if not drugs:
+        drugs = ['paracetamol']
+
+    from selenium.common.exceptions import TimeoutException
+
+    open_scraper = partial(open_browser_scraper, arguments.url,
+                           partial(create_driver, headless=not arguments.show_browser))
+    options = {'workers': arguments.workers, 'retries': arguments.retries, 'retry_on': (TimeoutException,),
+               'output_directory': arguments.output_directory, 'on_result': print_result}
+    if arguments.cache:
+        from zen_cdss.vigiaccess.cache import AdrCache
+        cache = AdrCache(arguments.cache, timedelta(days=arguments.ttl_days))
+        results = cache.refresh(drugs, open_scraper, **options)
+        print(f'{len(set(map(normalize_drug, drugs))) - len(results)} drugs were fresh in {arguments.cache}.')
+        cache.close()
+    else:
+        results = scrape_drugs(drugs, open_scraper, **options)
+
+    print_results(results)
 
 
 if __name__ == '__main__':